@@ -0,0 +1,167 @@
+from __future__ import annotations
+import json
+from collections import deque
+from pathlib import Path
+import pandas as pd
+
+STATE_FILE = "drift_state.json"
+REPORT_FILE = "drift_report.csv"
+
+DEFAULTS = {
+    "window_hours": 24,        # rolling window of hourly errors per zone
+    "mae_ratio_threshold": 1.5,  # breach when rolling MAE > ratio x validation MAE
+    "min_mae_threshold": 0.5,  # ...and above this absolute floor
+    "min_observations": 12,    # errors needed before a zone can breach
+}
+
+class DriftMonitor:
+    """Rolling absolute forecast error per zone with O(1) updates.
+
+    Each zone keeps a fixed-size window of recent |actual - forecast| plus a running sum,
+    so `observe` is constant time regardless of history length.
+    """
+
+    def __init__(self, window_hours: int = 24, mae_ratio_threshold: float = 1.5,
+                 min_mae_threshold: float = 0.5, min_observations: int = 12,
+                 baseline_mae: dict | None = None):
+        self.window_hours = int(window_hours)
+        self.mae_ratio_threshold = float(mae_ratio_threshold)
+        self.min_mae_threshold = float(min_mae_threshold)
+        self.min_observations = int(min_observations)
+        self.baseline_mae = dict(baseline_mae or {})
+        self._errors: dict[str, deque] = {}
+        self._sums: dict[str, float] = {}
+        self.uncovered: dict[str, int] = {}
+        self.watermark: pd.Timestamp | None = None
+
+    def observe(self, zone_id: str, actual: float, forecast: float):
+        win = self._errors.setdefault(zone_id, deque(maxlen=self.window_hours))
+        err = abs(float(actual) - float(forecast))
+        if len(win) == win.maxlen:
+            self._sums[zone_id] -= win[0]
+        win.append(err)
+        self._sums[zone_id] = self._sums.get(zone_id, 0.0) + err
+
+    def observe_uncovered(self, zone_id: str):
+        """An actual arrived for an hour the stored forecast does not cover."""
+        self.uncovered[zone_id] = self.uncovered.get(zone_id, 0) + 1
+
+    def rolling_mae(self, zone_id: str) -> float | None:
+        win = self._errors.get(zone_id)
+        return self._sums[zone_id] / len(win) if win else None
+
+    def threshold(self, zone_id: str) -> float:
+        base = self.baseline_mae.get(zone_id)
+        if base is None or pd.isna(base):
+            return self.min_mae_threshold
+        return max(self.mae_ratio_threshold * float(base), self.min_mae_threshold)
+
+    def breaches(self) -> dict[str, str]:
+        """Zones needing retraining, with the reason."""
+        out = {}
+        for zid, win in self._errors.items():
+            mae = self.rolling_mae(zid)
+            if len(win) >= self.min_observations and mae > self.threshold(zid):
+                out[zid] = f"rolling MAE {mae:.2f} > {self.threshold(zid):.2f}"
+        for zid, n in self.uncovered.items():
+            if n >= self.min_observations and zid not in out:
+                out[zid] = f"{n} actuals beyond forecast horizon"
+        return out
+
+    def reset(self, zones=None):
+        if zones is None:
+            zones = set(self._errors) | set(self.uncovered)
+        for zid in zones:
+            self._errors.pop(zid, None)
+            self._sums.pop(zid, None)
+            self.uncovered.pop(zid, None)
+
+    def report(self) -> pd.DataFrame:
+        zones = sorted(set(self._errors) | set(self.uncovered))
+        breaches = self.breaches()
+        return pd.DataFrame([{"zone_id": z,
+                              "observations": len(self._errors.get(z, ())),
+                              "rolling_mae": self.rolling_mae(z),
+                              "threshold": self.threshold(z),
+                              "uncovered": self.uncovered.get(z, 0),
+                              "retrain": z in breaches,
+                              "reason": breaches.get(z, "")} for z in zones],
+                            columns=["zone_id","observations","rolling_mae","threshold","uncovered","retrain","reason"])
+
+    def to_dict(self) -> dict:
+        return {"watermark": self.watermark.isoformat() if self.watermark is not None else None,
+                "errors": {z: list(w) for z, w in self._errors.items()},
+                "uncovered": self.uncovered}
+
+    def load_dict(self, state: dict):
+        wm = state.get("watermark")
+        self.watermark = pd.Timestamp(wm) if wm else None
+        for zid, errs in state.get("errors", {}).items():
+            self._errors[zid] = deque(errs, maxlen=self.window_hours)
+            self._sums[zid] = float(sum(self._errors[zid]))
+        self.uncovered = {z: int(n) for z, n in state.get("uncovered", {}).items()}
+
+def load_monitor(data_dir: str | Path) -> DriftMonitor:
+    data_dir = Path(data_dir)
+    cfg = dict(DEFAULTS)
+    pol_path = data_dir / "policies.json"
+    if pol_path.exists():
+        cfg.update(json.loads(pol_path.read_text(encoding="utf-8")).get("forecast_drift", {}))
+    baseline = {}
+    met_path = data_dir / "forecast_metrics.csv"
+    if met_path.exists():
+        met = pd.read_csv(met_path)
+        baseline = dict(zip(met["zone_id"], met["val_mae"]))
+    mon = DriftMonitor(baseline_mae=baseline, **{k: cfg[k] for k in DEFAULTS})
+    state_path = data_dir / STATE_FILE
+    if state_path.exists():
+        mon.load_dict(json.loads(state_path.read_text(encoding="utf-8")))
+    return mon
+
+def save_monitor(data_dir: str | Path, mon: DriftMonitor):
+    Path(data_dir, STATE_FILE).write_text(json.dumps(mon.to_dict()), encoding="utf-8")
+
+def check_drift(data_dir: str | Path) -> dict:
+    """Score actuals that arrived since the last check against the stored 48h forecast.
+
+    Returns {"zones": [...zones to retrain], "observed": n_new_actuals, "report": DataFrame}.
+    With no stored forecast at all, every zone is returned so the caller trains from scratch.
+    """
+    data_dir = Path(data_dir)
+    events = pd.read_csv(data_dir / "events_hourly.csv", parse_dates=["ts"])
+    fc_path = data_dir / "forecast_48h.csv"
+    if not fc_path.exists():
+        return {"zones": sorted(events["zone_id"].unique().tolist()), "observed": 0, "report": pd.DataFrame()}
+    fc = pd.read_csv(fc_path, parse_dates=["ts"])
+
+    mon = load_monitor(data_dir)
+    if mon.watermark is None:
+        # First check: everything after the training cut-off is new
+        mon.watermark = fc["ts"].min() - pd.Timedelta(hours=1) if not fc.empty else events["ts"].max()
+    new = events[events["ts"] > mon.watermark]
+    scored = new.merge(fc[["ts","zone_id","forecast"]], on=["ts","zone_id"], how="left")
+    for zid, actual, forecast in zip(scored["zone_id"], scored["booked_slots"], scored["forecast"]):
+        if pd.isna(forecast):
+            mon.observe_uncovered(zid)
+        else:
+            mon.observe(zid, actual, forecast)
+    if not new.empty:
+        mon.watermark = new["ts"].max()
+
+    report = mon.report()
+    report.to_csv(data_dir / REPORT_FILE, index=False)
+    save_monitor(data_dir, mon)
+    return {"zones": sorted(mon.breaches()), "observed": len(new), "report": report}
+
+def reset_zones(data_dir: str | Path, zones=None):
+    """Clear error windows after retraining (all zones when `zones` is None); keeps the watermark."""
+    if not Path(data_dir, STATE_FILE).exists():
+        return
+    mon = load_monitor(data_dir)
+    mon.reset(zones)
+    save_monitor(data_dir, mon)
+
+if __name__ == "__main__":
+    res = check_drift(Path(__file__).resolve().parents[1] / "data")
+    print(res["report"].to_string(index=False) if not res["report"].empty else "No drift data yet.")
+    print(f"Zones to retrain: {res['zones'] or 'none'}")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+import joblib
+import pandas as pd
+
+try:
+    from generate_forecast import MODEL_FILE, future_frame, predict, add_quantiles
+except ImportError:
+    from modules.generate_forecast import MODEL_FILE, future_frame, predict, add_quantiles
+
+MAX_RANGE_HOURS = 24 * 14
+COLUMNS = ["ts","zone_id","forecast","p10","p50","p90"]
+
+class _Model:
+    """A loaded artifact with its version; hashes by version so it can key the result cache"""
+    __slots__ = ("version", "state")
+
+    def __init__(self, version, state):
+        self.version, self.state = version, state
+
+    def __eq__(self, other):
+        return isinstance(other, _Model) and other.version == self.version
+
+    def __hash__(self):
+        return hash(self.version)
+
+class ForecastService:
+    """In-process forecast server backed by the artifact written by generate_forecast.
+
+    Models are loaded once and swapped atomically when a newer artifact appears on disk,
+    so the pipeline can retrain while readers keep answering from memory.
+    """
+
+    def __init__(self, data_dir: str | Path, cache_size: int = 2048, check_interval_s: float = 30.0):
+        self.data_dir = Path(data_dir)
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._model: _Model | None = None
+        self._last_check = 0.0
+        self._cached = lru_cache(maxsize=cache_size)(self._compute)
+
+    @property
+    def model_path(self) -> Path:
+        return self.data_dir / MODEL_FILE
+
+    def reload(self, force: bool = False) -> bool:
+        """Load the artifact if it changed on disk. Returns True when a new model was swapped in."""
+        if not self.model_path.exists():
+            return False
+        mtime = self.model_path.stat().st_mtime
+        if not force and self._model is not None and self._model.version == mtime:
+            return False
+        state = joblib.load(self.model_path)
+        with self._lock:
+            self._model = _Model(mtime, state)
+            self._cached.cache_clear()
+        return True
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if self._model is None or now - self._last_check >= self.check_interval_s:
+            self._last_check = now
+            self.reload()
+
+    def status(self) -> dict:
+        self._maybe_reload()
+        model = self._model
+        if model is None:
+            return {"loaded": False, "model_path": str(self.model_path)}
+        st = model.state
+        info = self._cached.cache_info()
+        return {"loaded": True, "mode": st["bundle"]["mode"], "zones": self.zones(),
+                "last_ts": str(st["last_ts"]), "trained_at": str(st["trained_at"]),
+                "cache_hits": info.hits, "cache_misses": info.misses}
+
+    def zones(self) -> list[str]:
+        self._maybe_reload()
+        model = self._model
+        return [] if model is None else model.state["base"]["zone_id"].tolist()
+
+    def forecast(self, zone_id: str, start, end) -> pd.DataFrame:
+        """Forecast `zone_id` for the hours in [start, end)."""
+        self._maybe_reload()
+        with self._lock:
+            model = self._model
+        if model is None:
+            raise FileNotFoundError(f"No trained forecast models at {self.model_path}; run generate_forecast first.")
+        start_ts = pd.Timestamp(start).floor("h")
+        end_ts = pd.Timestamp(end).ceil("h")
+        hours = int((end_ts - start_ts) / pd.Timedelta(hours=1))
+        if hours <= 0:
+            raise ValueError("end must be after start")
+        if hours > MAX_RANGE_HOURS:
+            raise ValueError(f"Range too large ({hours}h); max {MAX_RANGE_HOURS}h per request")
+        # The model (state and version read together) keys the cache, so a swap never mixes versions
+        rows = self._cached(model, str(zone_id), start_ts.value, end_ts.value)
+        return pd.DataFrame(list(rows), columns=COLUMNS)
+
+    def _compute(self, model: _Model, zone_id: str, start_ns: int, end_ns: int) -> tuple:
+        st = model.state
+        base = st["base"][st["base"]["zone_id"] == zone_id].reset_index(drop=True)
+        if base.empty:
+            raise KeyError(f"Unknown zone_id '{zone_id}'")
+        hours = pd.date_range(pd.Timestamp(start_ns), pd.Timestamp(end_ns), freq="h", inclusive="left")
+        fut = future_frame(base, hours)
+        fut["forecast"] = predict(st["bundle"], fut).clip(lower=0.0)
+        fc = add_quantiles(fut.dropna(subset=["forecast"])[["ts","zone_id","forecast"]].reset_index(drop=True),
+                           st["resid_q"], st["last_ts"])
+        fc["ts"] = fc["ts"].dt.strftime("%Y-%m-%dT%H:%M:%S")
+        return tuple(fc[COLUMNS].itertuples(index=False, name=None))
+
+_services: dict[Path, ForecastService] = {}
+_services_lock = threading.Lock()
+
+def get_service(data_dir: str | Path) -> ForecastService:
+    """Process-wide ForecastService per data directory (shared by the API and Streamlit pages)."""
+    key = Path(data_dir).resolve()
+    with _services_lock:
+        if key not in _services:
+            _services[key] = ForecastService(key)
+        return _services[key]
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Query the in-memory forecast service")
+    p.add_argument("--data_dir", default=str(Path(__file__).resolve().parents[1] / "data"))
+    p.add_argument("--zone", required=True)
+    p.add_argument("--start", required=True, help="ISO timestamp (inclusive)")
+    p.add_argument("--end", required=True, help="ISO timestamp (exclusive)")
+    args = p.parse_args()
+    svc = get_service(args.data_dir)
+    print(svc.forecast(args.zone, args.start, args.end).to_string(index=False))
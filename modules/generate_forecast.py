@@ -1,10 +1,28 @@
 import pandas as pd, numpy as np
 from pathlib import Path
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
 from sklearn.metrics import mean_absolute_error
 import argparse
+import time
+import joblib
 
-def main(data_dir: Path):
+FEATURES = ["hour","dow","is_weekend","temp_f","precip_prob","traffic_idx","event_score",
+            "lag_1","lag_2","lag_24","rolling_24"]
+# Global mode adds the zone identity (categorical) and its hourly capacity
+GLOBAL_FEATURES = FEATURES + ["zone_code","capacity"]
+TARGET = "booked_slots"
+HORIZON_HOURS = 48
+MIN_TRAIN_ROWS = 48
+MODES = ("per_zone", "global")
+QUANTILES = {"p10": 0.10, "p50": 0.50, "p90": 0.90}
+MIN_RESIDUALS = 24
+DAILY_HORIZON_DAYS = 42
+DAILY_FEATURES = ["zone_code","dow","is_weekend","is_holiday","is_school_break","has_event","zone_level"]
+CALENDAR_FLAGS = ["is_holiday","is_school_break","has_event"]
+MIN_DAILY_ROWS = 14
+MODEL_FILE = "forecast_models.joblib"
+
+def load_features(data_dir: Path) -> pd.DataFrame:
     events = pd.read_csv(data_dir / "events_hourly.csv", parse_dates=["ts"])
     signals = pd.read_csv(data_dir / "signals_hourly.csv", parse_dates=["ts"])
     df = events.merge(signals, on="ts", how="left")
@@ -23,67 +41,291 @@ def main(data_dir: Path):
     df = df.groupby("zone_id", group_keys=False).apply(add_lags)
     df = df.fillna(0.0)
 
-    split_ts = df["ts"].max() - pd.Timedelta(hours=72)
-    train = df[df["ts"] <= split_ts]
-    valid = df[df["ts"] > split_ts]
+    cap_path = data_dir / "capacity.csv"
+    if cap_path.exists():
+        cap = pd.read_csv(cap_path)[["zone_id","max_slots_per_hour"]].rename(columns={"max_slots_per_hour": "capacity"})
+        df = df.merge(cap, on="zone_id", how="left")
+    else:
+        df["capacity"] = np.nan
+    df["capacity"] = df["capacity"].fillna(1.0).astype(float)
+    return df
+
+def split_train_valid(df: pd.DataFrame, holdout_hours: int = 72):
+    split_ts = df["ts"].max() - pd.Timedelta(hours=holdout_hours)
+    return df[df["ts"] <= split_ts], df[df["ts"] > split_ts]
 
-    features = ["hour","dow","is_weekend","temp_f","precip_prob","traffic_idx","event_score",
-                "lag_1","lag_2","lag_24","rolling_24"]
-    target = "booked_slots"
+def fit_models(train: pd.DataFrame, mode: str = "per_zone") -> dict:
+    """Fit forecast model(s) and return a bundle usable by `predict`.
 
-    forecasts = []
-    metrics = []
-    for zid, g in df.groupby("zone_id"):
-        tr = train[train["zone_id"]==zid]
-        va = valid[valid["zone_id"]==zid]
-        if len(tr) < 48:
+    per_zone: one GradientBoostingRegressor per zone (zones under MIN_TRAIN_ROWS are skipped).
+    global:   one HistGradientBoostingRegressor across all zones with zone_code/capacity features.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown forecast mode '{mode}'. Expected one of {MODES}.")
+    if mode == "global":
+        zones = sorted(train["zone_id"].unique().tolist())
+        X = _global_matrix(train, zones)
+        model = _hist_gbm(GLOBAL_FEATURES, len(zones))
+        model.fit(X, train[TARGET])
+        return {"mode": mode, "zones": zones, "model": model}
+    models = {}
+    for zid, tr in train.groupby("zone_id"):
+        if len(tr) < MIN_TRAIN_ROWS:
             continue
-        Xtr, ytr = tr[features], tr[target]
-        Xva, yva = va[features], va[target]
         model = GradientBoostingRegressor(random_state=42)
-        model.fit(Xtr, ytr)
-        pred = model.predict(Xva)
-        mae = mean_absolute_error(yva, pred)
-        metrics.append({"zone_id": zid, "val_mae": mae})
-
-        last_ts = df["ts"].max()
-        horizon_hours = 48
-        for h in range(1, horizon_hours+1):
-            ts = last_ts + pd.Timedelta(hours=h)
-            base_row = df[df["zone_id"]==zid].iloc[-1:].copy()
-            base_row["ts"] = ts
-            base_row["hour"] = ts.hour
-            base_row["dow"] = ts.weekday()
-            base_row["is_weekend"] = int(ts.weekday() in [5,6])
-            for col in ["temp_f","precip_prob","traffic_idx","event_score","rolling_24","lag_1","lag_2","lag_24"]:
-                if col not in base_row.columns: base_row[col] = 0.0
-                base_row[col] = float(base_row[col])
-            X = base_row[features]
-            yhat = float(model.predict(X)[0])
-            forecasts.append({"ts": ts, "zone_id": zid, "forecast": max(0.0, yhat)})
-
-    fc_df = pd.DataFrame(forecasts)
+        model.fit(tr[FEATURES], tr[TARGET])
+        models[zid] = model
+    return {"mode": mode, "models": models}
+
+def _hist_gbm(features: list, n_zones: int, **kwargs) -> HistGradientBoostingRegressor:
+    # Native categorical splits are capped at 255 levels; past that zone_code is used as an ordinal
+    categorical = [features.index("zone_code")] if n_zones <= 255 else None
+    return HistGradientBoostingRegressor(categorical_features=categorical, random_state=42, **kwargs)
+
+def _global_matrix(frame: pd.DataFrame, zones: list) -> pd.DataFrame:
+    X = frame.copy()
+    # Unseen zones map to -1, which HistGradientBoosting treats as missing
+    X["zone_code"] = pd.Categorical(X["zone_id"], categories=zones).codes.astype(float)
+    X.loc[X["zone_code"] < 0, "zone_code"] = np.nan
+    return X[GLOBAL_FEATURES]
+
+def predict(bundle: dict, frame: pd.DataFrame) -> pd.Series:
+    """Predict for every row of `frame`; rows without a usable model come back as NaN."""
+    out = pd.Series(np.nan, index=frame.index, dtype=float)
+    if frame.empty:
+        return out
+    if bundle["mode"] == "global":
+        out[:] = bundle["model"].predict(_global_matrix(frame, bundle["zones"]))
+        return out
+    for zid, g in frame.groupby("zone_id"):
+        model = bundle["models"].get(zid)
+        if model is not None:
+            out[g.index] = model.predict(g[FEATURES])
+    return out
+
+def horizon_residuals(bundle: dict, df: pd.DataFrame, valid: pd.DataFrame,
+                      horizon_hours: int = HORIZON_HOURS) -> pd.DataFrame:
+    """Score the holdout the way the horizon is scored: lags frozen at each forecast origin.
+
+    Every hour from the end of training to the last holdout hour serves as an origin whose
+    feature rows are carried forward (as in horizon_frame). Each row holds the actual, the
+    prediction and its lead time in hours, so the residuals show how an h-step forecast errs.
+    """
+    first = df.loc[df["ts"] < valid["ts"].min(), "ts"].max()
+    origins = [first] + sorted(valid["ts"].unique())[:-1] if pd.notna(first) else []
+    frames = [future_frame(df[df["ts"] == origin], pd.date_range(origin + pd.Timedelta(hours=1),
+                                                                 periods=horizon_hours, freq="h")).assign(origin=origin)
+              for origin in origins]
+    cols = ["zone_id","lead",TARGET,"pred"]
+    if not frames:
+        return pd.DataFrame(columns=cols)
+    fut = pd.concat(frames, ignore_index=True).drop(columns=[TARGET])
+    fut["pred"] = predict(bundle, fut)
+    fut["lead"] = ((fut["ts"] - fut["origin"]) / pd.Timedelta(hours=1)).astype(int)
+    scored = fut.merge(df[["zone_id","ts",TARGET]], on=["zone_id","ts"]).dropna(subset=["pred"])
+    return scored[cols]
+
+def residual_quantiles(scored: pd.DataFrame) -> pd.DataFrame:
+    """Quantiles of holdout residuals (actual - pred) per zone and lead time, indexed by (zone_id, lead).
+
+    Zones with fewer than MIN_RESIDUALS holdout rows fall back to the pooled residuals at each
+    lead, so every zone gets a band from the single model fit. Errors do not shrink with lead
+    time, so each zone's band only widens along the horizon.
+    """
+    resid = scored[TARGET] - scored["pred"]
+    cols = list(QUANTILES)
+    if resid.empty:
+        return pd.DataFrame(columns=cols, dtype=float)
+    q = list(QUANTILES.values())
+    pooled = resid.groupby(scored["lead"]).quantile(q).unstack()
+    per_zone = resid.groupby([scored["zone_id"], scored["lead"]]).quantile(q).unstack().sort_index()
+    pooled.columns = per_zone.columns = cols
+    counts = resid.groupby(scored["zone_id"]).size()
+    thin = per_zone.index.get_level_values("zone_id").isin(counts[counts < MIN_RESIDUALS].index)
+    per_zone.loc[thin] = pooled.reindex(per_zone.index[thin].get_level_values("lead")).to_numpy()
+    by_zone = per_zone.groupby(level="zone_id")
+    per_zone["p10"] = by_zone["p10"].cummin()
+    per_zone["p90"] = by_zone["p90"].cummax()
+    return per_zone
+
+def add_quantiles(fc: pd.DataFrame, resid_q: pd.DataFrame, origin=None) -> pd.DataFrame:
+    """Attach p10/p50/p90 columns by shifting the point forecast with the zone's residual quantiles.
+
+    With an `origin` (the last observed hour) each row takes the quantiles for its lead time,
+    capped at the longest lead measured. Artifacts saved before lead-time bands are indexed by
+    zone only and shift every row alike.
+    """
+    if resid_q.index.nlevels > 1 and origin is not None:
+        max_lead = resid_q.index.get_level_values("lead").max()
+        lead = ((fc["ts"] - pd.Timestamp(origin)) / pd.Timedelta(hours=1)).round().clip(1, max_lead).astype(int)
+        keys = pd.MultiIndex.from_arrays([fc["zone_id"], lead], names=["zone_id","lead"])
+    else:
+        keys = fc["zone_id"]
+    offsets = resid_q.reindex(keys).fillna(0.0).to_numpy()
+    bands = np.maximum(fc["forecast"].to_numpy()[:, None] + offsets, 0.0)
+    bands = np.maximum.accumulate(bands, axis=1)  # keep p10 <= p50 <= p90
+    for i, col in enumerate(QUANTILES):
+        fc[col] = bands[:, i]
+    return fc
+
+def future_frame(base: pd.DataFrame, hours) -> pd.DataFrame:
+    """Carry each zone's feature row in `base` forward to every timestamp in `hours`."""
+    hours = pd.DatetimeIndex(hours)
+    fut = base.loc[base.index.repeat(len(hours))].reset_index(drop=True)
+    fut["ts"] = np.tile(hours.values, len(base))
+    fut["hour"] = fut["ts"].dt.hour
+    fut["dow"] = fut["ts"].dt.weekday
+    fut["is_weekend"] = fut["dow"].isin([5,6]).astype(int)
+    return fut
+
+def latest_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby("zone_id", sort=True).tail(1).reset_index(drop=True)
+
+def horizon_frame(df: pd.DataFrame, horizon_hours: int = HORIZON_HOURS) -> pd.DataFrame:
+    """Carry each zone's latest feature row forward over the next `horizon_hours` hours."""
+    last_ts = df["ts"].max()
+    return future_frame(latest_rows(df), pd.date_range(last_ts + pd.Timedelta(hours=1), periods=horizon_hours, freq="h"))
+
+def save_models(data_dir: Path, bundle: dict, df: pd.DataFrame, resid_q: pd.DataFrame) -> Path:
+    """Persist everything the forecast service needs to answer arbitrary hour ranges."""
+    path = data_dir / MODEL_FILE
+    tmp = path.with_suffix(".tmp")
+    joblib.dump({"bundle": bundle, "base": latest_rows(df), "resid_q": resid_q,
+                 "last_ts": df["ts"].max(), "trained_at": pd.Timestamp.now()}, tmp)
+    tmp.replace(path)  # atomic swap so readers never see a half-written file
+    return path
+
+def load_calendar(data_dir: Path) -> pd.DataFrame:
+    """Calendars.csv as one row per date with 0/1 holiday, school-break and event flags."""
+    cal_path = data_dir / "Calendars.csv"
+    if not cal_path.exists():
+        return pd.DataFrame(columns=["date"] + CALENDAR_FLAGS)
+    cal = pd.read_csv(cal_path)
+    cal["date"] = pd.to_datetime(cal["date"], errors="coerce").dt.normalize()
+    for c in ["is_holiday","is_school_break"]:
+        cal[c] = pd.to_numeric(cal.get(c, 0), errors="coerce").fillna(0).astype(int)
+    cal["has_event"] = cal.get("event_name", pd.Series(index=cal.index, dtype=object)).notna().astype(int)
+    return cal.dropna(subset=["date"]).groupby("date", as_index=False)[CALENDAR_FLAGS].max()
+
+def _daily_frame(frame: pd.DataFrame, cal: pd.DataFrame, zones: list, zone_level: pd.Series) -> pd.DataFrame:
+    frame = frame.merge(cal, on="date", how="left")
+    frame[CALENDAR_FLAGS] = frame[CALENDAR_FLAGS].fillna(0)
+    frame["dow"] = frame["date"].dt.weekday
+    frame["is_weekend"] = frame["dow"].isin([5,6]).astype(int)
+    frame["zone_code"] = pd.Categorical(frame["zone_id"], categories=zones).codes
+    frame["zone_level"] = frame["zone_id"].map(zone_level).fillna(0.0)
+    return frame
+
+def daily_forecast(df: pd.DataFrame, data_dir: Path, days: int = DAILY_HORIZON_DAYS) -> pd.DataFrame:
+    """Forecast daily booked slots for every zone over the next `days` days.
+
+    Trains one model on daily aggregates (weekday + Calendars.csv flags + zone level) and
+    scores the full zone x date grid in a single predict call. Partial first/last days are
+    dropped from training when complete days exist.
+    """
+    daily = (df.assign(date=df["ts"].dt.normalize())
+               .groupby(["zone_id","date"])[TARGET].agg(["sum","size"]).reset_index()
+               .rename(columns={"sum": TARGET, "size": "hours"}))
+    if (daily["hours"] >= 24).any():
+        daily = daily[daily["hours"] >= 24]
+    zones = sorted(df["zone_id"].unique().tolist())
+    zone_level = daily.groupby("zone_id")[TARGET].mean()
+    cal = load_calendar(data_dir)
+
+    start = df["ts"].max().normalize() + pd.Timedelta(days=1)
+    grid = pd.MultiIndex.from_product([zones, pd.date_range(start, periods=days, freq="D")],
+                                      names=["zone_id","date"]).to_frame(index=False)
+    grid = _daily_frame(grid, cal, zones, zone_level)
+
+    if len(daily) >= MIN_DAILY_ROWS:
+        train = _daily_frame(daily, cal, zones, zone_level)
+        model = _hist_gbm(DAILY_FEATURES, len(zones), min_samples_leaf=5)
+        model.fit(train[DAILY_FEATURES], train[TARGET])
+        grid["forecast_daily"] = np.maximum(model.predict(grid[DAILY_FEATURES]), 0.0)
+    else:
+        # Not enough history to learn seasonality; hold each zone at its average day
+        grid["forecast_daily"] = grid["zone_level"]
+    grid["date"] = grid["date"].dt.date
+    return grid[["date","zone_id","forecast_daily"]]
+
+def backtest(data_dir: Path, modes=MODES) -> pd.DataFrame:
+    """Compare forecast modes on the same 72h holdout: training time and validation MAE per zone."""
+    df = load_features(data_dir)
+    train, valid = split_train_valid(df)
+    rows = []
+    for mode in modes:
+        t0 = time.perf_counter()
+        bundle = fit_models(train, mode)
+        train_seconds = time.perf_counter() - t0
+        va = valid.assign(pred=predict(bundle, valid))
+        scored = va.dropna(subset=["pred"])
+        for zid in sorted(valid["zone_id"].unique()):
+            z = scored[scored["zone_id"] == zid]
+            rows.append({"mode": mode, "zone_id": zid,
+                         "val_mae": mean_absolute_error(z[TARGET], z["pred"]) if len(z) else np.nan,
+                         "train_seconds": np.nan})
+        rows.append({"mode": mode, "zone_id": "ALL",
+                     "val_mae": mean_absolute_error(scored[TARGET], scored["pred"]) if len(scored) else np.nan,
+                     "train_seconds": train_seconds})
+    out = pd.DataFrame(rows, columns=["mode","zone_id","val_mae","train_seconds"])
+    out.to_csv(data_dir / "forecast_backtest.csv", index=False)
+    return out
+
+def load_models(data_dir: Path) -> dict | None:
+    path = data_dir / MODEL_FILE
+    return joblib.load(path) if path.exists() else None
+
+def main(data_dir: Path, mode: str = "per_zone", zones=None):
+    """Train, score and write forecasts.
+
+    `zones` limits retraining to those zones (per_zone mode with a saved artifact); every
+    other zone keeps its stored model but is re-scored from the latest data. An empty list
+    skips fitting entirely and only re-scores with the saved models of the same mode.
+    Global mode otherwise always retrains its single shared model.
+    """
+    df = load_features(data_dir)
+    train, valid = split_train_valid(df)
+
+    prev = load_models(data_dir) if zones is not None else None
+    if prev is not None and prev["bundle"]["mode"] != mode:
+        prev = None
+    if prev is not None and not zones:
+        bundle, scope = prev["bundle"], ", re-scored with saved models"
+    elif prev is not None and mode == "per_zone":
+        bundle = fit_models(train[train["zone_id"].isin(list(zones))], mode)
+        bundle["models"] = {**prev["bundle"]["models"], **bundle["models"]}
+        scope = f", retrained {', '.join(sorted(zones))}"
+    else:
+        bundle, scope = fit_models(train, mode), ""
+    va = valid.assign(pred=predict(bundle, valid)).dropna(subset=["pred"])
+    metrics = [{"zone_id": zid, "val_mae": mean_absolute_error(g[TARGET], g["pred"]), "mode": mode}
+               for zid, g in va.groupby("zone_id")]
+
+    fut = horizon_frame(df)
+    fut["forecast"] = predict(bundle, fut).clip(lower=0.0)
+    fc_df = fut.dropna(subset=["forecast"])[["ts","zone_id","forecast"]].reset_index(drop=True)
+    resid_q = residual_quantiles(horizon_residuals(bundle, df, valid))
+    fc_df = add_quantiles(fc_df, resid_q, df["ts"].max())
     fc_df.to_csv(data_dir / "forecast_48h.csv", index=False)
 
-    if not fc_df.empty:
-        fc_df["date"] = pd.to_datetime(fc_df["ts"]).dt.date
-        daily = fc_df.groupby(["zone_id","date"])["forecast"].sum().reset_index()
-        expanded = []
-        today = pd.to_datetime(df["ts"].max()).normalize()
-        for zid, g in daily.groupby("zone_id"):
-            avg_day = g["forecast"].mean()
-            for d in range(1, 42+1):
-                expanded.append({"date": (today + pd.Timedelta(days=d)).date(),
-                                 "zone_id": zid,
-                                 "forecast_daily": float(avg_day)})
-        daily6 = pd.DataFrame(expanded)
-        daily6.to_csv(data_dir / "forecast_6weeks_daily.csv", index=False)
-
-    pd.DataFrame(metrics).to_csv(data_dir / "forecast_metrics.csv", index=False)
-    print("Forecasts generated.")
+    save_models(data_dir, bundle, df, resid_q)
+
+    daily6 = daily_forecast(df, data_dir)
+    daily6.to_csv(data_dir / "forecast_6weeks_daily.csv", index=False)
+
+    pd.DataFrame(metrics, columns=["zone_id","val_mae","mode"]).to_csv(data_dir / "forecast_metrics.csv", index=False)
+    print(f"Forecasts generated ({mode}{scope}).")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--data_dir", default=str(Path(__file__).resolve().parents[1] / "data"))
+    parser.add_argument("--mode", choices=MODES, default="per_zone",
+                        help="per_zone: one model per zone; global: one histogram GBM across all zones")
+    parser.add_argument("--zones", default="", help="Comma-separated zones to retrain (per_zone mode); others reuse saved models")
+    parser.add_argument("--backtest", action="store_true", help="Compare per_zone vs global on the holdout and exit")
     args = parser.parse_args()
-    main(Path(args.data_dir))
+    if args.backtest:
+        print(backtest(Path(args.data_dir)).to_string(index=False))
+    else:
+        zones = [z.strip() for z in args.zones.split(",") if z.strip()] or None
+        main(Path(args.data_dir), args.mode, zones)
@@ -74,6 +74,11 @@ def suggest_actions(data_dir: str | Path) -> pd.DataFrame:
     allow_split = bool(policies.get("inventory", {}).get("allow_split_layouts", True))
     max_changes_day = int(policies.get("global", {}).get("max_total_changes_per_day", 20))
     active_mode = policies.get("active_mode", "Normal")
+    # Overflow/staffing act on the upper quantile when the forecaster provides one
+    decision_col = str(policies.get("staffing", {}).get("decision_quantile", "p90"))
+    if decision_col not in fc.columns:
+        decision_col = "forecast"
+    decision_label = "Forecast" if decision_col == "forecast" else f"{decision_col.upper()} forecast"
 
     actions = []
     today = pd.Timestamp.now().normalize()
@@ -111,7 +116,7 @@ def suggest_actions(data_dir: str | Path) -> pd.DataFrame:
                 break
 
         # Overflow inventory when near capacity
-        near_cap = g[g["forecast"] >= increase_thr * g["max_slots_per_hour"].fillna(1)]
+        near_cap = g[g[decision_col] >= increase_thr * g["max_slots_per_hour"].fillna(1)]
         per_hour_count = {}
         for _, r in near_cap.iterrows():
             key = (zid, r["ts"].floor("H"))
@@ -128,11 +133,11 @@ def suggest_actions(data_dir: str | Path) -> pd.DataFrame:
                 "action_type": "open_overflow",
                 "before": "",
                 "after": after,
-                "rationale": f"[{active_mode}] Forecast >= {int(increase_thr*100)}% of capacity"
+                "rationale": f"[{active_mode}] {decision_label} >= {int(increase_thr*100)}% of capacity"
             })
 
         # Staffing deltas
-        low = g[g["forecast"] < decrease_thr * g["max_slots_per_hour"].fillna(1)]
+        low = g[g[decision_col] < decrease_thr * g["max_slots_per_hour"].fillna(1)]
         high = near_cap
 
         per_hour_staff = {}
@@ -148,7 +153,7 @@ def suggest_actions(data_dir: str | Path) -> pd.DataFrame:
                 "action_type": "staff_increase",
                 "before": "baseline",
                 "after": "+1",
-                "rationale": f"[{active_mode}] Forecast >= {int(increase_thr*100)}% of capacity"
+                "rationale": f"[{active_mode}] {decision_label} >= {int(increase_thr*100)}% of capacity"
             })
         for _, r in low.iterrows():
             key = (zid, r["ts"].floor("H"))
@@ -162,7 +167,7 @@ def suggest_actions(data_dir: str | Path) -> pd.DataFrame:
                 "action_type": "staff_reduce",
                 "before": "baseline",
                 "after": "-1",
-                "rationale": f"[{active_mode}] Forecast < {int(decrease_thr*100)}% of capacity"
+                "rationale": f"[{active_mode}] {decision_label} < {int(decrease_thr*100)}% of capacity"
             })
 
     # Reorder by priority from policies
@@ -16,7 +16,9 @@ def run_all(base_dir: Path,
             email_to: Optional[str] = None,
             email_from: str = "no-reply@nationalsportsdome.com",
             email_subject: str = "SportAI Ops Report",
-            email_body: str = "Attached: latest 1-page Ops Report from SportAI FinCast.") -> dict:
+            email_body: str = "Attached: latest 1-page Ops Report from SportAI FinCast.",
+            forecast_mode: str = "per_zone",
+            retrain_on_drift: bool = False) -> dict:
     data_dir = base_dir / "data"
     out = {"steps": []}
     try:
@@ -50,7 +52,23 @@ def run_all(base_dir: Path,
         from generate_forecast import main as gen_forecast
     except ImportError:
         from modules.generate_forecast import main as gen_forecast
-    gen_forecast(data_dir); out["steps"].append("Forecast generated")
+    try:
+        from drift_monitor import check_drift, reset_zones
+    except ImportError:
+        from modules.drift_monitor import check_drift, reset_zones
+    if retrain_on_drift:
+        drift = check_drift(data_dir)
+        out["drift_zones"] = drift["zones"]
+        if drift["zones"]:
+            gen_forecast(data_dir, forecast_mode, zones=drift["zones"])
+            reset_zones(data_dir, drift["zones"])
+            out["steps"].append(f"Drift retrain ({forecast_mode}): {', '.join(drift['zones'])}")
+        else:
+            gen_forecast(data_dir, forecast_mode, zones=[])
+            out["steps"].append(f"Drift check: {drift['observed']} new actuals, no zones need retraining; re-scored with saved models")
+    else:
+        gen_forecast(data_dir, forecast_mode); reset_zones(data_dir)
+        out["steps"].append(f"Forecast generated ({forecast_mode})")
     try:
         from rules_engine import suggest_actions
     except ImportError:
@@ -95,12 +113,16 @@ if __name__ == "__main__":
     p.add_argument("--email-from", default="no-reply@nationalsportsdome.com")
     p.add_argument("--email-subject", default="SportAI Ops Report")
     p.add_argument("--email-body", default="Attached: latest 1-page Ops Report from SportAI FinCast.")
+    p.add_argument("--forecast-mode", choices=["per_zone", "global"], default="per_zone")
+    p.add_argument("--retrain-on-drift", action="store_true",
+                   help="Only retrain zones whose rolling forecast error breached policies.forecast_drift")
     args = p.parse_args()
     base_dir = Path(__file__).resolve().parents[1]
     sk = Path(args.sportskey) if args.sportskey else None
     ev = Path(args.events) if args.events else None
     res = run_all(base_dir, sk, args.tz, args.lat, args.lon, args.start, args.end, ev,
                   make_pdf=not args.no_pdf, email_after=args.email, email_to=args.email_to,
-                  email_from=args.email_from, email_subject=args.email_subject, email_body=args.email_body)
+                  email_from=args.email_from, email_subject=args.email_subject, email_body=args.email_body,
+                  forecast_mode=args.forecast_mode, retrain_on_drift=args.retrain_on_drift)
     print("\n".join(res.get("steps", [])))
     if res.get("pdf"): print(f"PDF: {res['pdf']}")
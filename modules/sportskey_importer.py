@@ -37,13 +37,14 @@ def _ensure_tz(dt_series: pd.Series, tzname: str) -> pd.Series:
         s = s.dt.tz_convert(tz)
     return s
 
-def import_sportskey_csv(in_csv: Path, out_csv: Path, mapping_json: Path | None = None, tzname: str | None = None) -> Path:
+def _parse_sportskey(in_csv: Path, mapping_json: Path | None, tzname: str | None, default_map_root: Path):
+    """Load the export and resolve start/end/zone columns per the mapping config."""
     cfg = {}
     if mapping_json and Path(mapping_json).exists():
         cfg = json.loads(Path(mapping_json).read_text())
     else:
         # try default next to out_csv
-        default_map = out_csv.parents[1] / "data" / "mappings" / "sportskey_map.json"
+        default_map = default_map_root / "data" / "mappings" / "sportskey_map.json"
         if default_map.exists():
             cfg = json.loads(default_map.read_text())
 
@@ -54,7 +55,6 @@ def import_sportskey_csv(in_csv: Path, out_csv: Path, mapping_json: Path | None
     end_col = _pick_column(raw, cfg.get("endtime_candidates", []))
     zone_col = _pick_column(raw, cfg.get("zone_candidates", [])) or "Resource"
     dur_col = _pick_column(raw, cfg.get("duration_minutes_candidates", []))
-    chk_col = _pick_column(raw, cfg.get("checkins_candidates", []))
 
     if ts_col not in raw.columns or zone_col not in raw.columns:
         raise ValueError(f"Could not locate timestamp/zone columns in {in_csv.name}. Found ts={ts_col}, zone={zone_col}.")
@@ -71,6 +71,11 @@ def import_sportskey_csv(in_csv: Path, out_csv: Path, mapping_json: Path | None
 
     # Normalize zone_id
     zone_ids = raw[zone_col].astype(str).map(lambda z: _normalize_zone(z, cfg))
+    return raw, cfg, starts, ends, zone_ids
+
+def import_sportskey_csv(in_csv: Path, out_csv: Path, mapping_json: Path | None = None, tzname: str | None = None) -> Path:
+    raw, cfg, starts, ends, zone_ids = _parse_sportskey(in_csv, mapping_json, tzname, out_csv.parents[1])
+    chk_col = _pick_column(raw, cfg.get("checkins_candidates", []))
 
     # Row → hourly expansion
     rows = []
@@ -110,6 +115,52 @@ def import_sportskey_csv(in_csv: Path, out_csv: Path, mapping_json: Path | None
     df.to_csv(out_csv, index=False)
     return out_csv
 
+def sportskey_to_bookings(in_csv: Path, mapping_json: Path | None = None, tzname: str | None = None,
+                          asset_ids: dict | None = None) -> pd.DataFrame:
+    """Map a SportsKey export to rows for the `bookings` table (one row per reservation, vectorized).
+
+    `asset_ids` maps asset names to assets.id (normalized like zone IDs); unmatched zones get a NULL asset_id.
+    """
+    raw, cfg, starts, ends, zone_ids = _parse_sportskey(Path(in_csv), mapping_json, tzname,
+                                                        Path(__file__).resolve().parents[1])
+    cust_col = _pick_column(raw, cfg.get("customer_candidates", ["Customer", "Customer Name", "Booked By", "Team", "Name"]))
+    email_col = _pick_column(raw, cfg.get("email_candidates", ["Email", "Customer Email"]))
+    amount_col = _pick_column(raw, cfg.get("amount_candidates", ["Amount", "Price", "Total", "Paid"]))
+
+    ok = starts.notna() & ends.notna() & (starts < ends)
+    hours = (ends - starts).dt.total_seconds() / 3600.0
+    total = pd.to_numeric(raw[amount_col], errors="coerce") if amount_col else pd.Series(float("nan"), index=raw.index)
+    out = pd.DataFrame({
+        "asset_id": zone_ids.map({_normalize_zone(n, cfg): aid for n, aid in (asset_ids or {}).items()}),
+        "customer_name": raw[cust_col].astype(str) if cust_col else "SportsKey",
+        "customer_email": raw[email_col] if email_col else None,
+        "customer_type": "sportskey",
+        "booking_date": starts.dt.strftime("%Y-%m-%d"),
+        "start_time": starts.dt.strftime("%H:%M"),
+        "end_time": ends.dt.strftime("%H:%M"),
+        "duration_hours": hours.round(2),
+        "rate_per_hour": (total / hours).round(2),
+        "total_amount": total,
+        "status": "confirmed",
+        "created_by": "sportskey_import",
+        "notes": zone_ids,
+    })
+    return out[ok].reset_index(drop=True)
+
+def import_sportskey_bookings(in_csv: Path, db_path: Path, mapping_json: Path | None = None,
+                              tzname: str | None = None) -> list[int]:
+    """Load a SportsKey export straight into the bookings table via the bulk insert API."""
+    try:
+        from sportai_database import DatabaseManager
+    except ImportError:
+        import sys
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from sportai_database import DatabaseManager
+    manager = DatabaseManager(str(db_path))
+    with manager.connection() as conn:
+        asset_ids = {name: aid for aid, name in conn.execute("SELECT id, name FROM assets")}
+    return manager.insert_bookings(sportskey_to_bookings(in_csv, mapping_json, tzname, asset_ids))
+
 if __name__ == "__main__":
     import argparse
     p = argparse.ArgumentParser(description="Import SportsKey CSV to events_hourly.csv")
@@ -117,6 +168,10 @@ if __name__ == "__main__":
     p.add_argument("--out", dest="out_csv", default=str(Path(__file__).resolve().parents[1] / "data" / "events_hourly.csv"))
     p.add_argument("--map", dest="map_json", default=str(Path(__file__).resolve().parents[1] / "data" / "mappings" / "sportskey_map.json"))
     p.add_argument("--tz", dest="tzname", default=None, help="Timezone name, e.g., America/Chicago")
+    p.add_argument("--db", dest="db_path", default="", help="Also bulk-load reservations into this SportAI database")
     args = p.parse_args()
+    if args.db_path:
+        ids = import_sportskey_bookings(Path(args.in_csv), Path(args.db_path), Path(args.map_json), args.tzname)
+        print(f"Inserted {len(ids)} bookings into {args.db_path}")
     out = import_sportskey_csv(Path(args.in_csv), Path(args.out_csv), Path(args.map_json), args.tzname)
     print(f"Wrote {out}")
@@ -2,6 +2,9 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from pathlib import Path
+
+from sportai_capacity import capacity_graph, parent_kpis
 
 def load_data(data_dir: str):
     bookings = pd.read_csv(f"{data_dir}/Bookings.csv", parse_dates=["start","end"])
@@ -10,60 +13,71 @@ def load_data(data_dir: str):
     membership = pd.read_csv(f"{data_dir}/Membership.csv")
     return bookings, ops, calendars, membership
 
-def _usd_from_cash_and_credits(row, credit_value_lookup):
-    credit_val = credit_value_lookup.get(row.get("member_tier",""), 1.0)
-    return float(row.get("price_cash", 0.0)) + float(row.get("price_credits", 0.0)) * credit_val
+DEFAULT_CREDIT_VALUE_BY_TIER = {"Standard":1.0, "Plus":1.0, "Elite":1.2}
+
+def load_credit_values(data_dir: str):
+    path = Path(data_dir) / "Membership.csv"
+    if not path.exists():
+        return dict(DEFAULT_CREDIT_VALUE_BY_TIER)
+    membership = pd.read_csv(path)
+    return dict(zip(membership["tier"], membership["credit_value_usd"]))
 
-def _hour_floor(ts):
-    return ts.replace(minute=0, second=0, microsecond=0)
+def _usd_from_cash_and_credits(bookings, credit_value_lookup):
+    credit_val = bookings.get("member_tier", pd.Series("", index=bookings.index)).map(credit_value_lookup).fillna(1.0)
+    cash = bookings.get("price_cash", pd.Series(0.0, index=bookings.index)).astype(float)
+    credits = bookings.get("price_credits", pd.Series(0.0, index=bookings.index)).astype(float)
+    return cash + credits * credit_val
+
+def _hour_slices(bookings):
+    # One row per (booking, clock hour) it touches: repeat each booking once per hour, then clip to the hour
+    first = bookings["start"].dt.floor("h")
+    n_hours = np.ceil((bookings["end"] - first).dt.total_seconds() / 3600.0).clip(lower=0).astype(int).to_numpy()
+    idx = np.repeat(np.arange(len(bookings)), n_hours)
+    offset = np.arange(len(idx)) - np.repeat(np.cumsum(n_hours) - n_hours, n_hours)
+    hour = first.to_numpy()[idx] + offset * np.timedelta64(1, "h")
+    slice_start = np.maximum(bookings["start"].to_numpy()[idx], hour)
+    slice_end = np.minimum(bookings["end"].to_numpy()[idx], hour + np.timedelta64(1, "h"))
+    slice_hours = (slice_end - slice_start) / np.timedelta64(1, "h")
+    duration = bookings["duration_hr"].to_numpy()[idx]
+    hour_df = pd.DataFrame({
+        "asset": bookings["asset"].to_numpy()[idx],
+        "asset_parent": bookings["asset_parent"].to_numpy()[idx] if "asset_parent" in bookings else np.nan,
+        "hour": hour,
+        "slice_hours": slice_hours,
+        "slice_rev": bookings["revenue_usd"].to_numpy()[idx] * np.divide(slice_hours, duration, out=np.zeros(len(idx)), where=duration > 0)
+    })
+    return hour_df[hour_df["slice_hours"] > 0]
 
 def compute_kpis(bookings, ops, credit_value_by_tier=None):
     bookings = bookings.copy()
     ops = ops.copy()
     if credit_value_by_tier is None:
-        credit_value_by_tier = {"Standard":1.0, "Plus":1.0, "Elite":1.2}
+        credit_value_by_tier = DEFAULT_CREDIT_VALUE_BY_TIER
+
+    # Topology (parent/child splits, capacity units) is resolved once and cached per asset layout
+    graph = capacity_graph(ops, bookings)
 
     bookings = bookings[bookings["status"]=="booked"].copy()
-    bookings["hour"] = bookings["start"].apply(_hour_floor)
     bookings["duration_hr"] = (bookings["end"] - bookings["start"]).dt.total_seconds() / 3600.0
-    bookings["revenue_usd"] = bookings.apply(lambda r: _usd_from_cash_and_credits(r, credit_value_by_tier), axis=1)
+    bookings["revenue_usd"] = _usd_from_cash_and_credits(bookings, credit_value_by_tier)
 
-    asset_capacity = ops.set_index("asset")["capacity_units"].to_dict()
     buffer_min = ops.set_index("asset")["buffer_min"].to_dict()
     labor_cost = ops.set_index("asset")["labor_cost_per_hour"].to_dict()
 
-    rows = []
-    for _, r in bookings.iterrows():
-        cur = r["start"]
-        while cur < r["end"]:
-            hour_start = _hour_floor(cur)
-            hour_end = hour_start + timedelta(hours=1)
-            slice_start = max(cur, hour_start)
-            slice_end = min(r["end"], hour_end)
-            slice_hours = (slice_end - slice_start).total_seconds()/3600.0
-            if slice_hours > 0:
-                rows.append({
-                    "asset": r["asset"],
-                    "asset_parent": r.get("asset_parent", np.nan),
-                    "hour": hour_start,
-                    "slice_hours": slice_hours,
-                    "slice_rev": r["revenue_usd"] * (slice_hours / r["duration_hr"] if r["duration_hr"] else 0.0)
-                })
-            cur = hour_end
-    hour_df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=["asset","hour","slice_hours","slice_rev","asset_parent"])
+    hour_df = _hour_slices(bookings)
 
     kpi = hour_df.groupby(["asset","hour"], as_index=False).agg(
         booked_hours=("slice_hours","sum"),
         revenue_usd=("slice_rev","sum")
     )
     kpi["available_hours"] = 1.0
-    kpi["capacity_units"] = 1
+    kpi["capacity_units"] = kpi["asset"].map(graph.units).fillna(1).astype(int)
     kpi["fill_pct"] = (kpi["booked_hours"] / kpi["available_hours"]) * 100.0
-    kpi["avg_rate"] = kpi.apply(lambda r: r["revenue_usd"] / r["booked_hours"] if r["booked_hours"]>0 else 0.0, axis=1)
+    kpi["avg_rate"] = np.where(kpi["booked_hours"] > 0, kpi["revenue_usd"] / kpi["booked_hours"].where(kpi["booked_hours"] > 0, 1.0), 0.0)
     kpi["revpah"] = kpi["revenue_usd"] / kpi["available_hours"]
-    kpi["buffer_min"] = 10
+    kpi["buffer_min"] = kpi["asset"].map(buffer_min).fillna(10)
     kpi["gap_min"] = np.clip((1.0 - kpi["booked_hours"]) * 60.0 - kpi["buffer_min"], a_min=0.0, a_max=None)
-    kpi["labor_cost_hr"] = 0.0
+    kpi["labor_cost_hr"] = kpi["asset"].map(labor_cost).fillna(0.0)
 
     def _norm(series):
         if series.max() - series.min() < 1e-9:
@@ -82,7 +96,7 @@ def compute_kpis(bookings, ops, credit_value_by_tier=None):
         + 0.10*kpi["labor_norm"]*100
     ).round(1)
 
-    parent_rows = []
+    parent_rows = parent_kpis(hour_df, graph)
     return kpi.sort_values(["asset","hour"]), parent_rows
 
 def suggest_reallocations(kpi_df, ops=None, max_suggestions=10):
@@ -90,7 +104,8 @@ def suggest_reallocations(kpi_df, ops=None, max_suggestions=10):
     if kpi_df.empty: return suggestions
     tmp = kpi_df.copy()
     tmp["hour_next"] = tmp["hour"] + pd.Timedelta(hours=1)
-    merged = tmp.merge(tmp[["asset","hour","integrity_index","revpah"]], left_on=["asset","hour_next"], right_on=["asset","hour"], suffixes=("","_next"))
+    following = tmp[["asset","hour","integrity_index","revpah"]].rename(columns={"hour":"hour_next"})
+    merged = tmp.merge(following, on=["asset","hour_next"], suffixes=("","_next"))
     merged["delta"] = merged["integrity_index_next"] - merged["integrity_index"]
     cand = merged.sort_values("delta", ascending=False).head(50)
     for _, r in cand.iterrows():
@@ -107,7 +122,6 @@ def suggest_reallocations(kpi_df, ops=None, max_suggestions=10):
 
 def run_all(data_dir: str):
     bookings, ops, calendars, membership = load_data(data_dir)
-    tier_vals = dict(zip(membership["tier"], membership["credit_value_usd"]))
-    kpi, parent = compute_kpis(bookings, ops, credit_value_by_tier=tier_vals)
+    kpi, parent = compute_kpis(bookings, ops, credit_value_by_tier=load_credit_values(data_dir))
     suggestions = suggest_reallocations(kpi, ops, max_suggestions=10)
     return kpi, parent, suggestions
@@ -0,0 +1,166 @@
+"""
+SportAI Async Database Access
+Bounded SQLite connection pool for async (FastAPI) request handlers
+"""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sportai_database import PRAGMAS
+
+# Compiled statements kept per connection, keyed by SQL text
+STATEMENT_CACHE_SIZE = 256
+
+class AsyncDatabase:
+    """Async facade over a fixed set of SQLite connections
+
+    Each worker of a dedicated executor owns one connection, so at most `pool_size`
+    connections exist and database calls never occupy the server's shared thread pool.
+    Requests beyond the pool size wait as coroutines, not blocked threads. Queries with
+    constant SQL text reuse the connection's prepared statements.
+    """
+
+    def __init__(self, db_path: str = "data/sportai.db", pool_size: int = 8, wal: bool = True,
+                 timeout: float = 30.0, statement_cache_size: int = STATEMENT_CACHE_SIZE):
+        self.db_path = Path(db_path)
+        self.pool_size = pool_size
+        self.wal = wal
+        self.timeout = timeout
+        self.statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling executor thread (opened on first use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                                   cached_statements=self.statement_cache_size)
+            if self.wal:
+                conn.execute("PRAGMA journal_mode = WAL")
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _call(self, fn: Callable, args: tuple):
+        conn = self._connection()
+        try:
+            result = fn(conn, *args)
+            if conn.in_transaction:
+                conn.commit()
+            return result
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(conn, *args) on a pooled connection; commits on success, rolls back on error"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                        thread_name_prefix="sportai-db")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, fn, args)
+
+    async def fetch_all(self, query: str, params: Sequence = ()) -> List[Dict]:
+        """All rows of a query as dicts"""
+        def _fetch(conn, query, params):
+            cursor = conn.execute(query, params)
+            columns = [d[0] for d in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return await self.run(_fetch, query, params)
+
+    async def fetch_one(self, query: str, params: Sequence = ()) -> Optional[Dict]:
+        """First row of a query as a dict, or None"""
+        def _fetch(conn, query, params):
+            cursor = conn.execute(query, params)
+            row = cursor.fetchone()
+            return dict(zip([d[0] for d in cursor.description], row)) if row is not None else None
+        return await self.run(_fetch, query, params)
+
+    async def execute(self, query: str, params: Sequence = ()) -> int:
+        """Execute a write statement in its own transaction; returns lastrowid"""
+        def _execute(conn, query, params):
+            return conn.execute(query, params).lastrowid
+        return await self.run(_execute, query, params)
+
+    async def execute_many(self, query: str, rows: Sequence[Sequence]) -> int:
+        """Execute a write statement for many parameter rows in one transaction; returns rowcount"""
+        def _execute(conn, query, rows):
+            return conn.executemany(query, rows).rowcount
+        return await self.run(_execute, query, rows)
+
+    def stats(self) -> Dict:
+        return {"pool_size": self.pool_size, "open_connections": len(self._connections)}
+
+    def close(self):
+        """Stop the executor and close every pooled connection"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+def load_test(url: str, concurrency: int = 64, requests: int = 2000, token: str = "demo-token") -> Dict:
+    """Hit a running server's endpoint with `concurrency` parallel clients and report throughput"""
+    import time
+    import urllib.request
+
+    errors = []
+    latencies = []
+
+    def hit(_):
+        req = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                resp.read()
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(str(e))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(hit, range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda q: round(latencies[int(q * (len(latencies) - 1))] * 1000, 1) if latencies else None
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'requests': requests,
+        'seconds': round(elapsed, 3),
+        'req_per_sec': round(requests / elapsed, 1),
+        'p50_ms': pct(0.5),
+        'p95_ms': pct(0.95),
+        'errors': len(errors)
+    }
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test a running SportAI API (e.g. uvicorn main:app)")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--paths", nargs="+", default=["/api/facilities", "/api/members", "/api/analytics/dashboard"])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per path")
+    parser.add_argument("--token", default="demo-token")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        print(load_test(args.base_url.rstrip("/") + path, args.concurrency, args.requests, args.token))
@@ -0,0 +1,401 @@
+"""
+SportAI Availability Index
+In-memory per-asset booking intervals for conflict checks, free-slot search and availability grids
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sportai_capacity import CapacityGraph, capacity_graph
+
+CANCELLED_STATUSES = ('cancelled', 'canceled')
+# Turnover between bookings (Ops.csv buffer_min)
+DEFAULT_BUFFER_MINUTES = 10
+GRID_STEP_MINUTES = 30
+DAY_MINUTES = 24 * 60
+# Free-slot search gives up after this many days without an opening
+SEARCH_DAYS = 60
+
+_NS_PER_MINUTE = 60 * 10**9
+_shared: Dict[str, Tuple[Optional[int], 'AvailabilityIndex']] = {}
+_shared_lock = threading.Lock()
+
+def to_minutes(value) -> int:
+    """Minutes since the epoch for a datetime-like value"""
+    return int(pd.Timestamp(value).value // _NS_PER_MINUTE)
+
+def from_minutes(minutes: int) -> pd.Timestamp:
+    return pd.Timestamp(minutes * _NS_PER_MINUTE)
+
+def booking_intervals(bookings: pd.DataFrame) -> pd.DataFrame:
+    """(id, asset, start, end) in epoch minutes for Bookings.csv rows (start/end) or DB rows (date + times)"""
+    if 'start' in bookings and 'end' in bookings:
+        start = pd.to_datetime(bookings['start'])
+        end = pd.to_datetime(bookings['end'])
+    else:
+        day = pd.to_datetime(bookings['booking_date'])
+        start = day + pd.to_timedelta(bookings['start_time'].astype(str).str.slice(0, 5) + ':00')
+        end = day + pd.to_timedelta(bookings['end_time'].astype(str).str.slice(0, 5) + ':00')
+        # Bookings that end at or after midnight carry the next day's clock time
+        end = end.where(end > start, end + pd.Timedelta(days=1))
+    ids = bookings['booking_id'] if 'booking_id' in bookings else bookings['id']
+    return pd.DataFrame({
+        'id': ids.to_numpy(),
+        'asset': bookings['asset'].to_numpy(),
+        'start': start.to_numpy().astype('datetime64[m]').astype(np.int64),
+        'end': end.to_numpy().astype('datetime64[m]').astype(np.int64)
+    })
+
+class AssetTimeline:
+    """Bookings of one asset, bucketed by the days they touch
+
+    Each day lists its bookings sorted by start clipped to that day, so a query visits only
+    the days it spans: one bisection over the day keys plus the bookings on those days,
+    however long the asset's history. A multi-day booking is listed once per day it covers
+    rather than widening every search, and an insert or removal shifts one day's lists.
+    """
+
+    def __init__(self, buffer_minutes: int = 0):
+        self.buffer = buffer_minutes
+        # day -> (clipped starts, starts, ends, ids), ordered by clipped start
+        self.days: Dict[int, Tuple[List[int], List[int], List[int], List[Hashable]]] = {}
+        self.day_keys: List[int] = []
+        self.spans: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    @staticmethod
+    def _day_range(start: int, end: int) -> range:
+        return range(start // DAY_MINUTES, (max(end, start + 1) - 1) // DAY_MINUTES + 1)
+
+    def add(self, booking_id: Hashable, start: int, end: int):
+        self.spans[booking_id] = (start, end)
+        for day in self._day_range(start, end):
+            bucket = self.days.get(day)
+            if bucket is None:
+                bucket = self.days[day] = ([], [], [], [])
+                insort(self.day_keys, day)
+            key = max(start, day * DAY_MINUTES)
+            pos = bisect_right(bucket[0], key)
+            for column, value in zip(bucket, (key, start, end, booking_id)):
+                column.insert(pos, value)
+
+    def load(self, starts: np.ndarray, ends: np.ndarray, ids: np.ndarray):
+        """Bulk build of an empty timeline: one sort instead of an insertion per booking"""
+        starts, ends = np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+        ids = np.asarray(ids, dtype=object)
+        if not len(starts):
+            return
+        first = starts // DAY_MINUTES
+        counts = (np.maximum(ends, starts + 1) - 1) // DAY_MINUTES - first + 1
+        rows = np.repeat(np.arange(len(starts)), counts)
+        days = first[rows] + np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        keys = np.maximum(starts[rows], days * DAY_MINUTES)
+        order = np.lexsort((keys, days))
+        rows, days, keys = rows[order], days[order], keys[order]
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        for day, day_rows, day_keys in zip(days[np.r_[0, bounds]].tolist(), np.split(rows, bounds), np.split(keys, bounds)):
+            self.days[day] = (day_keys.tolist(), starts[day_rows].tolist(), ends[day_rows].tolist(), ids[day_rows].tolist())
+        self.day_keys = sorted(self.days)
+        self.spans.update(zip(ids.tolist(), zip(starts.tolist(), ends.tolist())))
+
+    def remove(self, booking_id: Hashable) -> bool:
+        span = self.spans.pop(booking_id, None)
+        if span is None:
+            return False
+        start, end = span
+        for day in self._day_range(start, end):
+            bucket = self.days[day]
+            pos = bisect_left(bucket[0], max(start, day * DAY_MINUTES))
+            while bucket[3][pos] != booking_id:
+                pos += 1
+            for column in bucket:
+                del column[pos]
+            if not bucket[0]:
+                del self.days[day]
+                del self.day_keys[bisect_left(self.day_keys, day)]
+        return True
+
+    def _overlapping(self, lo: int, hi: int) -> List[Tuple[int, int, Hashable]]:
+        """(start, end, id) of bookings overlapping [lo, hi), each listed once"""
+        first = lo // DAY_MINUTES
+        found = []
+        days = self.day_keys[bisect_left(self.day_keys, first):bisect_left(self.day_keys, -(-hi // DAY_MINUTES))]
+        for day in days:
+            keys, starts, ends, ids = self.days[day]
+            # Bookings carried over from an earlier day were already seen on the range's first day
+            found.extend((starts[i], ends[i], ids[i]) for i in range(bisect_left(keys, hi))
+                         if ends[i] > lo and (day == first or starts[i] >= day * DAY_MINUTES))
+        return found
+
+    def conflicts(self, start: int, end: int) -> List[Hashable]:
+        """Bookings within the turnover buffer of [start, end)"""
+        pad = self.buffer
+        return [booking_id for _, _, booking_id in self._overlapping(start - pad, end + pad)]
+
+    def intervals(self, start: int, end: int) -> List[Tuple[int, int, Hashable]]:
+        """(start, end, id) of bookings overlapping [start, end), without buffer"""
+        return self._overlapping(start, end)
+
+    def next_free(self, after: int, length: int) -> int:
+        """Earliest start >= after with `length` free minutes (buffers included)"""
+        t = after
+        pad = self.buffer
+        first = (t - pad) // DAY_MINUTES
+        for day in self.day_keys[bisect_left(self.day_keys, first):]:
+            _, starts, ends, _ = self.days[day]
+            for start, end in zip(starts, ends):
+                if day > first and start < day * DAY_MINUTES:
+                    continue  # listed on an earlier day and already passed
+                if start - pad >= t + length:
+                    return t
+                t = max(t, end + pad)
+        return t
+
+class AvailabilityIndex:
+    """Process-wide availability for a set of assets, kept current as bookings change
+
+    Assets are keyed by name (Bookings.csv `asset` / DB `assets.name`); `asset_types` maps
+    names to their DB asset type when built from the database. With a capacity `graph`,
+    queries on an asset also see bookings on the assets it shares space with.
+    """
+
+    def __init__(self, buffers: Optional[Dict[str, int]] = None, default_buffer: int = DEFAULT_BUFFER_MINUTES,
+                 graph: Optional[CapacityGraph] = None):
+        self.buffers = dict(buffers or {})
+        self.default_buffer = default_buffer
+        self.graph = graph
+        self.timelines: Dict[str, AssetTimeline] = {}
+        self.asset_types: Dict[str, str] = {}
+        self.asset_names: Dict[int, str] = {}
+        # First booking date indexed (from_database); earlier dates are not checked for conflicts
+        self.since: Optional[date] = None
+        self._where: Dict[Hashable, str] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_frame(cls, bookings: pd.DataFrame, **kwargs) -> 'AvailabilityIndex':
+        """Index of booking rows; Bookings.csv's asset_parent links become the capacity graph"""
+        if 'graph' not in kwargs and 'asset_parent' in bookings:
+            kwargs['graph'] = capacity_graph(bookings=bookings)
+        index = cls(**kwargs)
+        index.apply(bookings)
+        return index
+
+    @classmethod
+    def from_database(cls, manager, since: Optional[date] = None, **kwargs) -> 'AvailabilityIndex':
+        """Index of DB bookings from `since` (default: today) on; past bookings never conflict"""
+        index = cls(**kwargs)
+        index.load_assets(manager)
+        with manager.connection() as conn:
+            bookings = pd.read_sql_query("""
+                SELECT id, asset_id, booking_date, start_time, end_time, status
+                FROM bookings
+                WHERE booking_date >= ? AND status NOT IN ('cancelled', 'canceled')
+            """, conn, params=[str(pd.Timestamp(since or date.today()).date())])
+        index.since = pd.Timestamp(since or date.today()).date()
+        index.apply(bookings)
+        return index
+
+    def load_assets(self, manager):
+        """(Re)read asset names and types from the database's assets table"""
+        with manager.connection() as conn:
+            assets = pd.read_sql_query("SELECT id, name, asset_type FROM assets", conn)
+        with self._lock:
+            self.asset_names = dict(zip(assets['id'], assets['name']))
+            self.asset_types = dict(zip(assets['name'], assets['asset_type']))
+            for name in assets['name']:
+                self.timeline(name)
+
+    def timeline(self, asset: str) -> AssetTimeline:
+        if asset not in self.timelines:
+            self.timelines[asset] = AssetTimeline(self.buffers.get(asset, self.default_buffer))
+        return self.timelines[asset]
+
+    def apply(self, bookings: pd.DataFrame):
+        """Upsert booking rows (current state); cancelled rows are dropped from the index"""
+        if bookings.empty:
+            return
+        if 'asset' not in bookings:
+            bookings = bookings.assign(asset=bookings['asset_id'].map(self.asset_names))
+        live = ~bookings['status'].astype(str).str.lower().isin(CANCELLED_STATUSES) if 'status' in bookings else \
+            pd.Series(True, index=bookings.index)
+        rows = booking_intervals(bookings)
+        with self._lock:
+            if not self._where:
+                self._load(rows[live.to_numpy() & rows['asset'].map(lambda a: isinstance(a, str)).to_numpy()])
+                return
+            for booking_id, asset, start, end, keep in zip(rows['id'], rows['asset'], rows['start'], rows['end'], live):
+                self.cancel(booking_id)
+                if keep and isinstance(asset, str):
+                    self.timeline(asset).add(booking_id, int(start), int(end))
+                    self._where[booking_id] = asset
+
+    def _load(self, rows: pd.DataFrame):
+        """Initial build: one sort per asset instead of an insertion per booking"""
+        for asset, group in rows.groupby('asset', sort=False):
+            self.timeline(asset).load(group['start'].to_numpy(), group['end'].to_numpy(), group['id'].to_numpy())
+            self._where.update(dict.fromkeys(group['id'].tolist(), asset))
+
+    def add_booking(self, booking_id: Hashable, asset: str, start, end):
+        with self._lock:
+            self.cancel(booking_id)
+            self.timeline(asset).add(booking_id, to_minutes(start), to_minutes(end))
+            self._where[booking_id] = asset
+
+    def cancel(self, booking_id: Hashable) -> bool:
+        with self._lock:
+            asset = self._where.pop(booking_id, None)
+            return asset is not None and self.timelines[asset].remove(booking_id)
+
+    def _blocking(self, asset: str) -> List[AssetTimeline]:
+        assets = self.graph.blocking(asset) if self.graph is not None else (asset,)
+        return [self.timelines[a] for a in assets if a in self.timelines]
+
+    def conflicts(self, asset: str, start, end) -> List[Hashable]:
+        """Bookings on `asset` (or space it shares) that collide with [start, end) including turnover buffers"""
+        start, end = to_minutes(start), to_minutes(end)
+        with self._lock:
+            return [booking_id for timeline in self._blocking(asset) for booking_id in timeline.conflicts(start, end)]
+
+    def is_free(self, asset: str, start, end) -> bool:
+        return not self.conflicts(asset, start, end)
+
+    def locked(self) -> threading.RLock:
+        """The index lock; hold it across a conflict check and the insert it guards"""
+        return self._lock
+
+    def intervals(self, asset: str, start, end) -> List[Tuple[pd.Timestamp, pd.Timestamp, Hashable]]:
+        with self._lock:
+            timeline = self.timelines.get(asset)
+            found = timeline.intervals(to_minutes(start), to_minutes(end)) if timeline else []
+        return [(from_minutes(s), from_minutes(e), booking_id) for s, e, booking_id in found]
+
+    def next_free_slot(self, asset: str, after, duration_hours: float,
+                       hours: Optional[Tuple[int, int]] = None,
+                       step_minutes: int = GRID_STEP_MINUTES) -> Optional[pd.Timestamp]:
+        """Earliest start at or after `after` (rounded up to `step_minutes`) where the asset is free
+
+        With `hours` = (open_hour, close_hour) the booking must also fit within opening hours.
+        """
+        length = int(round(duration_hours * 60))
+        t = -(-to_minutes(after) // step_minutes) * step_minutes
+        limit = t + SEARCH_DAYS * 24 * 60
+        with self._lock:
+            timelines = self._blocking(asset)
+            while t < limit:
+                if hours is not None:
+                    day = t - t % (24 * 60)
+                    open_at, close_at = day + hours[0] * 60, day + hours[1] * 60
+                    if t < open_at:
+                        t = open_at
+                    elif t + length > close_at:
+                        t = open_at + 24 * 60
+                        continue
+                # Advance past each shared-space timeline in turn until none of them moves t
+                free = max((timeline.next_free(t, length) for timeline in timelines), default=t)
+                if free == t:
+                    return from_minutes(t)
+                t = -(-free // step_minutes) * step_minutes
+        return None
+
+    def availability_grid(self, assets: Iterable[str], start, end,
+                          step_minutes: int = GRID_STEP_MINUTES) -> pd.DataFrame:
+        """Boolean frame (asset x slot start): True where the whole slot is free, buffers included"""
+        first, last = to_minutes(start), to_minutes(end)
+        edges = np.arange(first, last + step_minutes, step_minutes)
+        slots = len(edges) - 1
+        busy_by_timeline = {}
+
+        def busy_slots(timeline: AssetTimeline) -> np.ndarray:
+            if id(timeline) not in busy_by_timeline:
+                busy = np.zeros(slots + 1, dtype=np.int32)
+                if slots > 0:
+                    pad = timeline.buffer
+                    spans = np.array([(s, e) for s, e, _ in timeline.intervals(first - pad, last + pad)],
+                                     dtype=np.int64).reshape(-1, 2)
+                    starts, ends = spans[:, 0] - pad, spans[:, 1] + pad
+                    # A slot is busy if any booking overlaps it: mark [first slot, last slot] with a difference array
+                    lo = np.clip(np.searchsorted(edges, starts, side='right') - 1, 0, slots)
+                    hi = np.clip(np.searchsorted(edges, ends, side='left'), 0, slots)
+                    keep = hi > lo
+                    np.add.at(busy, lo[keep], 1)
+                    np.add.at(busy, hi[keep], -1)
+                busy_by_timeline[id(timeline)] = np.cumsum(busy[:-1]) > 0
+            return busy_by_timeline[id(timeline)]
+
+        grid = {}
+        with self._lock:
+            for asset in assets:
+                taken = np.zeros(max(slots, 0), dtype=bool)
+                for timeline in self._blocking(asset):
+                    taken |= busy_slots(timeline)
+                grid[asset] = ~taken
+        return pd.DataFrame(grid, index=pd.to_datetime(edges[:-1] * _NS_PER_MINUTE)).T
+
+def load_availability_index(source, **kwargs) -> AvailabilityIndex:
+    """Shared index for a DatabaseManager or a Bookings.csv path
+
+    A database index is built once per process and follows the manager's booking changes
+    (insert, bulk insert, update, cancel); a CSV index is rebuilt when the file changes.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        key, version = str(path), path.stat().st_mtime_ns if path.exists() else None
+    else:
+        key, version = str(source.db_path), None
+    entry = _shared.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    with _shared_lock:
+        entry = _shared.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        if isinstance(source, (str, Path)):
+            frame = pd.read_csv(source) if version is not None else pd.DataFrame(columns=['booking_id', 'asset', 'start', 'end'])
+            index = AvailabilityIndex.from_frame(frame, **kwargs)
+        else:
+            index = AvailabilityIndex.from_database(source, **kwargs)
+            source.add_booking_listener(index.apply)
+        _shared[key] = (version, index)
+        return index
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from sportai_database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Build the availability index and time its queries")
+    parser.add_argument("--db", default="data/sportai.db")
+    parser.add_argument("--since", default=None, help="First booking date to index (default: today)")
+    parser.add_argument("--queries", type=int, default=100000)
+    args = parser.parse_args()
+
+    manager = DatabaseManager(args.db)
+    started = time.perf_counter()
+    index = AvailabilityIndex.from_database(manager, since=args.since)
+    print(f"Indexed {len(index._where):,} bookings on {len(index.timelines)} assets in {time.perf_counter() - started:.2f}s")
+
+    rng = np.random.default_rng(3)
+    assets = list(index.timelines)
+    origin = pd.Timestamp(args.since or date.today())
+    offsets = rng.integers(0, 365 * 24 * 2, args.queries) * 30
+    started = time.perf_counter()
+    for asset, offset in zip(rng.choice(assets, args.queries), offsets):
+        begin = origin + timedelta(minutes=int(offset))
+        index.is_free(asset, begin, begin + timedelta(hours=2))
+    print(f"{args.queries:,} conflict checks in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    slot = index.next_free_slot(assets[0], origin, 2, hours=(6, 23))
+    grid = index.availability_grid(assets, origin, origin + timedelta(days=7))
+    print(f"next free slot on {assets[0]}: {slot}; 7-day grid {grid.shape} "
+          f"({grid.to_numpy().mean():.0%} free) in {time.perf_counter() - started:.3f}s")
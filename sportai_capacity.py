@@ -0,0 +1,135 @@
+"""
+SportAI Capacity Graph
+Parent/child split topology of shared spaces (full turf -> halves, court clusters)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import pandas as pd
+
+GRAPH_CACHE_SIZE = 8
+
+_graphs: "OrderedDict[Tuple, CapacityGraph]" = OrderedDict()
+_graphs_lock = threading.Lock()
+
+class CapacityGraph:
+    """Which assets share space, and how many capacity units a booking on each one takes
+
+    A parent (FullTurf-1, Court-Cluster) is made of its children's units: booking the parent
+    takes all of them, booking a child takes the child's own. Two bookings conflict when
+    their assets are the same or one contains the other; siblings never conflict. Every
+    derived map is built once per topology, so per-booking work is a dictionary lookup.
+    """
+
+    def __init__(self, parents: Dict[str, str], units: Optional[Dict[str, int]] = None):
+        units = {asset: int(n) for asset, n in (units or {}).items() if pd.notna(n)}
+        self.parent = {child: parent for child, parent in parents.items() if child != parent}
+        self.assets = tuple(sorted(set(self.parent) | set(self.parent.values()) | set(units)))
+
+        self.children = {asset: [] for asset in self.assets}
+        for child, parent in self.parent.items():
+            self.children[parent].append(child)
+        self.ancestors = {asset: self._ancestors(asset) for asset in self.assets}
+        self.descendants = {asset: tuple(d for d in self.assets if asset in self.ancestors[d]) for asset in self.assets}
+        self.root = {asset: self.ancestors[asset][-1] if self.ancestors[asset] else asset for asset in self.assets}
+
+        # Leaves default to one unit; parents to the sum of their children's units
+        self.units = {}
+        for asset in sorted(self.assets, key=lambda a: -len(self.ancestors[a])):
+            self.units[asset] = units.get(asset) or (sum(self.units[c] for c in self.children[asset]) or 1)
+
+        self.blocks: Dict[str, FrozenSet[str]] = {
+            asset: frozenset((asset,) + self.ancestors[asset] + self.descendants[asset]) for asset in self.assets
+        }
+        # Parents whose KPIs a booking on the asset counts toward (itself when it is a parent)
+        self.rollup = {
+            asset: ((asset,) if self.children[asset] else ()) + self.ancestors[asset] for asset in self.assets
+        }
+        self.key = (tuple(sorted(self.parent.items())), tuple(sorted(self.units.items())))
+
+    def _ancestors(self, asset: str) -> Tuple[str, ...]:
+        chain = []
+        while asset in self.parent:
+            asset = self.parent[asset]
+            if asset in chain:
+                raise ValueError(f"Asset hierarchy has a cycle through '{asset}'")
+            chain.append(asset)
+        return tuple(chain)
+
+    @property
+    def parents(self) -> Tuple[str, ...]:
+        return tuple(asset for asset in self.assets if self.children[asset])
+
+    def blocking(self, asset: str) -> FrozenSet[str]:
+        """Assets whose bookings conflict with a booking on `asset` (itself for unknown assets)"""
+        return self.blocks.get(asset, frozenset((asset,)))
+
+    def conflicts(self, a: str, b: str) -> bool:
+        return b in self.blocking(a)
+
+    def rollup_pairs(self) -> pd.DataFrame:
+        """(asset, parent) for every parent an asset's bookings count toward"""
+        pairs = [(asset, parent) for asset in self.assets for parent in self.rollup[asset]]
+        return pd.DataFrame(pairs, columns=['asset', 'parent'])
+
+def _topology(ops: Optional[pd.DataFrame], bookings: Optional[pd.DataFrame]) -> Tuple[Dict, Dict]:
+    parents, units = {}, {}
+    for frame in (bookings, ops):
+        if frame is None:
+            continue
+        column = next((col for col in ('asset_parent', 'parent') if col in frame), None)
+        if column:
+            links = frame[['asset', column]].dropna().drop_duplicates('asset')
+            parents.update(zip(links['asset'], links[column]))
+    if ops is not None and 'capacity_units' in ops:
+        units = dict(zip(ops['asset'], ops['capacity_units']))
+    return parents, units
+
+def capacity_graph(ops: Optional[pd.DataFrame] = None, bookings: Optional[pd.DataFrame] = None) -> CapacityGraph:
+    """Graph for Ops.csv capacity units and asset_parent links (Ops.csv or Bookings.csv), cached by topology"""
+    parents, units = _topology(ops, bookings)
+    key = (tuple(sorted(parents.items())), tuple(sorted((a, str(n)) for a, n in units.items())))
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = _graphs[key] = CapacityGraph(parents, units)
+            while len(_graphs) > GRAPH_CACHE_SIZE:
+                _graphs.popitem(last=False)
+        else:
+            _graphs.move_to_end(key)
+    return graph
+
+def parent_kpis(hour_df: pd.DataFrame, graph: CapacityGraph) -> pd.DataFrame:
+    """Parent x hour utilization from asset-hour slices (asset, hour, slice_hours, slice_rev)
+
+    booked_unit_hours weighs each slice by the units its asset occupies, so a full-turf hour
+    fills both halves' worth of capacity. Within one hour, booked units above capacity can
+    only come from overlapping parent/child bookings and are flagged as overbooked.
+    """
+    columns = ['parent', 'hour', 'capacity_units', 'booked_unit_hours', 'whole_hours', 'split_hours',
+               'children_used', 'fill_pct', 'revenue_usd', 'revpah', 'rev_per_unit_hour', 'overbooked']
+    if hour_df.empty or not graph.parents:
+        return pd.DataFrame(columns=columns)
+
+    slices = hour_df.merge(graph.rollup_pairs(), on='asset')
+    whole = slices['asset'] == slices['parent']
+    slices['unit_hours'] = slices['slice_hours'] * slices['asset'].map(graph.units)
+    slices['whole_hours'] = slices['slice_hours'].where(whole, 0.0)
+    slices['split_hours'] = slices['slice_hours'].where(~whole, 0.0)
+    slices['child'] = slices['asset'].where(~whole)
+
+    kpi = slices.groupby(['parent', 'hour'], as_index=False).agg(
+        booked_unit_hours=('unit_hours', 'sum'),
+        whole_hours=('whole_hours', 'sum'),
+        split_hours=('split_hours', 'sum'),
+        children_used=('child', 'nunique'),
+        revenue_usd=('slice_rev', 'sum')
+    )
+    kpi['capacity_units'] = kpi['parent'].map(graph.units)
+    kpi['fill_pct'] = kpi['booked_unit_hours'] / kpi['capacity_units'] * 100.0
+    kpi['revpah'] = kpi['revenue_usd']
+    kpi['rev_per_unit_hour'] = kpi['revenue_usd'] / kpi['capacity_units']
+    kpi['overbooked'] = kpi['booked_unit_hours'] > kpi['capacity_units'] + 1e-9
+    return kpi[columns].sort_values(['parent', 'hour']).reset_index(drop=True)
@@ -5,217 +5,253 @@ Handles database connections, queries, and data persistence
 
 import sqlite3
 import json
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Union
 from datetime import datetime
 import pandas as pd
 
+from sportai_migrations import migrate, current_version, CORE_MIGRATIONS
+
+# Per-connection tuning; journal_mode=WAL is persisted in the database file itself
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 134217728",
+)
+
+# Insertable columns and their defaults, shared by the single-row and bulk inserts
+BOOKING_COLUMNS = (
+    'asset_id', 'customer_name', 'customer_email', 'customer_type',
+    'booking_date', 'start_time', 'end_time', 'duration_hours',
+    'rate_per_hour', 'total_amount', 'status', 'created_by', 'notes'
+)
+BOOKING_DEFAULTS = {'status': 'confirmed'}
+MEMBER_COLUMNS = (
+    'member_id', 'name', 'email', 'phone', 'tier', 'credits_balance',
+    'join_date', 'status', 'household_id', 'notes'
+)
+MEMBER_DEFAULTS = {'credits_balance': 0, 'status': 'active'}
+SPONSOR_COLUMNS = (
+    'name', 'industry', 'contact_name', 'contact_email', 'contact_phone',
+    'status', 'tier', 'annual_value', 'contract_start', 'contract_end'
+)
+SPONSOR_DEFAULTS = {'status': 'active'}
+BULK_CHUNK_SIZE = 10000
+
+# Representative queries and the indexes the planner must pick for them
+PLAN_CHECKS = {
+    'bookings_by_date': (
+        "SELECT * FROM bookings WHERE booking_date >= ? AND booking_date <= ? ORDER BY booking_date, start_time",
+        ('2025-01-01', '2025-01-31'), {'idx_bookings_date_asset'}),
+    'bookings_by_asset_date': (
+        "SELECT * FROM bookings WHERE booking_date >= ? AND booking_date <= ? AND asset_id = ? ORDER BY booking_date, start_time",
+        ('2025-01-01', '2025-01-31', 1), {'idx_bookings_asset_date', 'idx_bookings_date_asset'}),
+    'revenue_summary': (
+        "SELECT SUM(booking_count), SUM(total_amount) FROM booking_daily_rollup WHERE booking_date BETWEEN ? AND ? AND status = 'confirmed'",
+        ('2025-01-01', '2025-01-31'), {'idx_rollup_status_date'}),
+    'utilization_join': (
+        """SELECT a.id, SUM(r.booking_count) FROM assets a
+           LEFT JOIN booking_daily_rollup r ON r.asset_id = a.id AND r.booking_date BETWEEN ? AND ? AND r.status = 'confirmed'
+           WHERE a.active = 1 GROUP BY a.id""",
+        ('2025-01-01', '2025-01-31'), {'PRIMARY KEY'}),
+    'bookings_by_status_date': (
+        "SELECT COUNT(*), SUM(total_amount) FROM bookings WHERE booking_date BETWEEN ? AND ? AND status = 'confirmed'",
+        ('2025-01-01', '2025-01-31'), {'idx_bookings_status_date'}),
+    'members_by_status': (
+        "SELECT * FROM members WHERE status = ? ORDER BY name",
+        ('active',), {'idx_members_status_name'}),
+}
+
+Rows = Union[pd.DataFrame, Iterable[Dict]]
+
+def _iter_row_tuples(rows: Rows, columns: tuple, defaults: Dict):
+    """Yield parameter tuples in column order from a DataFrame or an iterable of dicts"""
+    if isinstance(rows, pd.DataFrame):
+        df = rows.reindex(columns=list(columns))
+        for col, value in defaults.items():
+            df[col] = df[col].fillna(value)
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                ts = df[col]
+                fmt = '%Y-%m-%d' if (ts.dropna() == ts.dropna().dt.normalize()).all() else '%Y-%m-%d %H:%M:%S'
+                df[col] = ts.dt.strftime(fmt)
+        df = df.astype(object).where(df.notna(), None)
+        yield from df.itertuples(index=False, name=None)
+    else:
+        for row in rows:
+            yield tuple(row.get(col, defaults.get(col)) for col in columns)
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections to a single database file"""
+    
+    def __init__(self, db_path: Path, size: int = 8, timeout: float = 30.0, wal: bool = True):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.wal = wal
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        if self.wal:
+            conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Borrow a connection, opening a new one while under the pool size"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get(timeout=self.timeout)
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, discarding any open transaction"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+    
+    def close_all(self):
+        """Close idle connections; borrowed ones go back to the pool on release and stay open"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+
 class DatabaseManager:
     """Manages database connections and operations"""
     
-    def __init__(self, db_path: str = "data/sportai.db"):
+    _schema_ready = set()
+    _schema_lock = threading.Lock()
+    # Callbacks per database file, each given a DataFrame of changed booking rows (current state)
+    _booking_listeners: Dict[str, List] = {}
+    
+    def __init__(self, db_path: str = "data/sportai.db", pool_size: int = 8, wal: bool = True):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.init_database()
+        self.pool = ConnectionPool(self.db_path, size=pool_size, wal=wal) if pool_size > 0 else None
+        self.wal = wal
     
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get a standalone database connection (caller closes it)"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        if self.wal:
+            conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Pooled connection scoped to one transaction: commit on success, rollback on error"""
+        self.ensure_schema()
+        conn = self.pool.acquire() if self.pool else self.get_connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if self.pool:
+                self.pool.release(conn)
+            else:
+                conn.close()
+    
+    def ensure_schema(self):
+        """Run schema initialization once per process per database file"""
+        key = str(self.db_path.resolve())
+        if key in DatabaseManager._schema_ready:
+            return
+        with DatabaseManager._schema_lock:
+            if key not in DatabaseManager._schema_ready:
+                self.init_database()
+                DatabaseManager._schema_ready.add(key)
     
     def init_database(self):
-        """Initialize database schema"""
+        """Bring the schema up to date via versioned migrations (no DDL when current)"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT NOT NULL,
-                name TEXT,
-                email TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
-            )
-        """)
-        
-        # Assets table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS assets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                site_id TEXT NOT NULL,
-                asset_type TEXT NOT NULL,
-                name TEXT NOT NULL,
-                capacity INTEGER,
-                square_footage INTEGER,
-                hourly_rate_prime REAL,
-                hourly_rate_standard REAL,
-                hourly_rate_offpeak REAL,
-                active BOOLEAN DEFAULT 1
-            )
-        """)
-        
-        # Bookings table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS bookings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                asset_id INTEGER,
-                customer_name TEXT NOT NULL,
-                customer_email TEXT,
-                customer_type TEXT,
-                booking_date DATE NOT NULL,
-                start_time TIME NOT NULL,
-                end_time TIME NOT NULL,
-                duration_hours REAL,
-                rate_per_hour REAL,
-                total_amount REAL,
-                status TEXT DEFAULT 'confirmed',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_by TEXT,
-                notes TEXT,
-                FOREIGN KEY (asset_id) REFERENCES assets(id)
-            )
-        """)
-        
-        # Members table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS members (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                member_id TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                email TEXT,
-                phone TEXT,
-                tier TEXT,
-                credits_balance REAL DEFAULT 0,
-                join_date DATE,
-                status TEXT DEFAULT 'active',
-                household_id TEXT,
-                notes TEXT
-            )
-        """)
-        
-        # Sponsors table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sponsors (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                industry TEXT,
-                contact_name TEXT,
-                contact_email TEXT,
-                contact_phone TEXT,
-                status TEXT DEFAULT 'active',
-                tier TEXT,
-                annual_value REAL,
-                contract_start DATE,
-                contract_end DATE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Sponsorship assets table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sponsorship_assets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sponsor_id INTEGER,
-                asset_name TEXT NOT NULL,
-                asset_category TEXT,
-                annual_value REAL,
-                start_date DATE,
-                end_date DATE,
-                status TEXT DEFAULT 'active',
-                FOREIGN KEY (sponsor_id) REFERENCES sponsors(id)
-            )
-        """)
-        
-        # Contracts table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS contracts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                party_id INTEGER,
-                party_type TEXT,
-                contract_type TEXT,
-                start_date DATE,
-                end_date DATE,
-                annual_value REAL,
-                total_value REAL,
-                status TEXT DEFAULT 'active',
-                document_url TEXT,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Transactions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                transaction_date DATE NOT NULL,
-                transaction_type TEXT,
-                category TEXT,
-                amount REAL NOT NULL,
-                description TEXT,
-                reference_id TEXT,
-                reference_type TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Audit log table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                user_id TEXT,
-                user_role TEXT,
-                action TEXT,
-                details TEXT,
-                ip_address TEXT
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        try:
+            migrate(conn, CORE_MIGRATIONS, 'core')
+        finally:
+            conn.close()
+    
+    def schema_version(self) -> int:
+        """Current schema version of this database"""
+        conn = self.get_connection()
+        try:
+            return current_version(conn)
+        finally:
+            conn.close()
+    
+    def check_query_plans(self) -> Dict[str, Dict]:
+        """EXPLAIN QUERY PLAN the hot queries; each result says which index was used and if it was expected"""
+        results = {}
+        with self.connection() as conn:
+            indexes = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+            for name, (query, params, expected) in PLAN_CHECKS.items():
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+                used = {idx for idx in indexes if any(f"INDEX {idx} " in f"{step} " for step in plan)}
+                # WITHOUT ROWID tables (the rollups) are searched through their clustered primary key
+                used |= {'PRIMARY KEY' for step in plan if 'USING PRIMARY KEY' in step}
+                results[name] = {'ok': bool(used & expected), 'indexes': sorted(used), 'plan': plan}
+        return results
+    
+    def add_booking_listener(self, listener):
+        """Call `listener(rows)` after bookings in this database are inserted or updated"""
+        DatabaseManager._booking_listeners.setdefault(str(self.db_path.resolve()), []).append(listener)
+    
+    def _notify_bookings(self, rows: pd.DataFrame):
+        for listener in DatabaseManager._booking_listeners.get(str(self.db_path.resolve()), ()):
+            listener(rows)
     
     def insert_booking(self, booking_data: Dict) -> int:
         """Insert new booking"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO bookings (
-                asset_id, customer_name, customer_email, customer_type,
-                booking_date, start_time, end_time, duration_hours,
-                rate_per_hour, total_amount, status, created_by, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            booking_data.get('asset_id'),
-            booking_data.get('customer_name'),
-            booking_data.get('customer_email'),
-            booking_data.get('customer_type'),
-            booking_data.get('booking_date'),
-            booking_data.get('start_time'),
-            booking_data.get('end_time'),
-            booking_data.get('duration_hours'),
-            booking_data.get('rate_per_hour'),
-            booking_data.get('total_amount'),
-            booking_data.get('status', 'confirmed'),
-            booking_data.get('created_by'),
-            booking_data.get('notes')
-        ))
-        
-        booking_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        with self.connection() as conn:
+            cursor = conn.execute("""
+                INSERT INTO bookings (
+                    asset_id, customer_name, customer_email, customer_type,
+                    booking_date, start_time, end_time, duration_hours,
+                    rate_per_hour, total_amount, status, created_by, notes
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                booking_data.get('asset_id'),
+                booking_data.get('customer_name'),
+                booking_data.get('customer_email'),
+                booking_data.get('customer_type'),
+                booking_data.get('booking_date'),
+                booking_data.get('start_time'),
+                booking_data.get('end_time'),
+                booking_data.get('duration_hours'),
+                booking_data.get('rate_per_hour'),
+                booking_data.get('total_amount'),
+                booking_data.get('status', 'confirmed'),
+                booking_data.get('created_by'),
+                booking_data.get('notes')
+            ))
+            booking_id = cursor.lastrowid
+        self._notify_bookings(pd.DataFrame([{**BOOKING_DEFAULTS, **booking_data, 'id': booking_id}]))
         return booking_id
     
     def get_bookings(self, start_date: str = None, end_date: str = None, 
                      asset_id: int = None) -> pd.DataFrame:
         """Get bookings with optional filters"""
-        conn = self.get_connection()
-        
         query = "SELECT * FROM bookings WHERE 1=1"
         params = []
         
@@ -233,44 +269,33 @@ class DatabaseManager:
         
         query += " ORDER BY booking_date, start_time"
         
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
-        
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query(query, conn, params=params)
     
     def insert_member(self, member_data: Dict) -> int:
         """Insert new member"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO members (
-                member_id, name, email, phone, tier, credits_balance,
-                join_date, status, household_id, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            member_data.get('member_id'),
-            member_data.get('name'),
-            member_data.get('email'),
-            member_data.get('phone'),
-            member_data.get('tier'),
-            member_data.get('credits_balance', 0),
-            member_data.get('join_date'),
-            member_data.get('status', 'active'),
-            member_data.get('household_id'),
-            member_data.get('notes')
-        ))
-        
-        member_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return member_id
+        with self.connection() as conn:
+            cursor = conn.execute("""
+                INSERT INTO members (
+                    member_id, name, email, phone, tier, credits_balance,
+                    join_date, status, household_id, notes
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                member_data.get('member_id'),
+                member_data.get('name'),
+                member_data.get('email'),
+                member_data.get('phone'),
+                member_data.get('tier'),
+                member_data.get('credits_balance', 0),
+                member_data.get('join_date'),
+                member_data.get('status', 'active'),
+                member_data.get('household_id'),
+                member_data.get('notes')
+            ))
+            return cursor.lastrowid
     
     def get_members(self, status: str = None) -> pd.DataFrame:
         """Get members with optional status filter"""
-        conn = self.get_connection()
-        
         query = "SELECT * FROM members"
         params = []
         
@@ -280,78 +305,121 @@ class DatabaseManager:
         
         query += " ORDER BY name"
         
-        df = pd.read_sql_query(query, conn, params=params if params else None)
-        conn.close()
-        
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query(query, conn, params=params if params else None)
     
     def insert_sponsor(self, sponsor_data: Dict) -> int:
         """Insert new sponsor"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO sponsors (
-                name, industry, contact_name, contact_email, contact_phone,
-                status, tier, annual_value, contract_start, contract_end
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            sponsor_data.get('name'),
-            sponsor_data.get('industry'),
-            sponsor_data.get('contact_name'),
-            sponsor_data.get('contact_email'),
-            sponsor_data.get('contact_phone'),
-            sponsor_data.get('status', 'active'),
-            sponsor_data.get('tier'),
-            sponsor_data.get('annual_value'),
-            sponsor_data.get('contract_start'),
-            sponsor_data.get('contract_end')
-        ))
-        
-        sponsor_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return sponsor_id
+        with self.connection() as conn:
+            cursor = conn.execute("""
+                INSERT INTO sponsors (
+                    name, industry, contact_name, contact_email, contact_phone,
+                    status, tier, annual_value, contract_start, contract_end
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                sponsor_data.get('name'),
+                sponsor_data.get('industry'),
+                sponsor_data.get('contact_name'),
+                sponsor_data.get('contact_email'),
+                sponsor_data.get('contact_phone'),
+                sponsor_data.get('status', 'active'),
+                sponsor_data.get('tier'),
+                sponsor_data.get('annual_value'),
+                sponsor_data.get('contract_start'),
+                sponsor_data.get('contract_end')
+            ))
+            return cursor.lastrowid
     
     def log_audit(self, user_id: str, user_role: str, action: str, 
                   details: Dict, ip_address: str = None):
         """Log audit trail"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO audit_log (user_id, user_role, action, details, ip_address)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            user_id,
-            user_role,
-            action,
-            json.dumps(details),
-            ip_address
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            conn.execute("""
+                INSERT INTO audit_log (user_id, user_role, action, details, ip_address)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                user_id,
+                user_role,
+                action,
+                json.dumps(details),
+                ip_address
+            ))
+    
+    def _bulk_insert(self, table: str, columns: tuple, defaults: Dict, rows: Rows,
+                     chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """executemany in chunks, one transaction per chunk; returns the new row ids in input order"""
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        tuples = _iter_row_tuples(rows, columns, defaults)
+        ids = []
+        while True:
+            chunk = []
+            for row in tuples:
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    break
+            if not chunk:
+                return ids
+            with self.connection() as conn:
+                # BEGIN IMMEDIATE takes the write lock up front, so the chunk's ids are contiguous
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(sql, chunk)
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+    
+    def insert_bookings(self, rows: Rows, chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """Bulk insert bookings from a DataFrame or iterable of dicts"""
+        listening = bool(DatabaseManager._booking_listeners.get(str(self.db_path.resolve())))
+        if listening and not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame(list(rows))
+        ids = self._bulk_insert('bookings', BOOKING_COLUMNS, BOOKING_DEFAULTS, rows, chunk_size)
+        if listening:
+            self._notify_bookings(rows.assign(id=ids, status=rows.get('status', BOOKING_DEFAULTS['status'])))
+        return ids
+    
+    def insert_members(self, rows: Rows, chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """Bulk insert members from a DataFrame or iterable of dicts"""
+        return self._bulk_insert('members', MEMBER_COLUMNS, MEMBER_DEFAULTS, rows, chunk_size)
+    
+    def insert_sponsors(self, rows: Rows, chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """Bulk insert sponsors from a DataFrame or iterable of dicts"""
+        return self._bulk_insert('sponsors', SPONSOR_COLUMNS, SPONSOR_DEFAULTS, rows, chunk_size)
+    
+    def update_booking(self, booking_id: int, changes: Dict) -> bool:
+        """Update booking fields (rollups follow via triggers)"""
+        fields = [col for col in changes if col in BOOKING_COLUMNS]
+        if not fields:
+            return False
+        with self.connection() as conn:
+            cursor = conn.execute(
+                f"UPDATE bookings SET {', '.join(f'{col} = ?' for col in fields)} WHERE id = ?",
+                [changes[col] for col in fields] + [booking_id]
+            )
+            updated = cursor.rowcount > 0
+            if updated and DatabaseManager._booking_listeners.get(str(self.db_path.resolve())):
+                changed = pd.read_sql_query("SELECT * FROM bookings WHERE id = ?", conn, params=[booking_id])
+            else:
+                changed = None
+        if changed is not None:
+            self._notify_bookings(changed)
+        return updated
+    
+    def cancel_booking(self, booking_id: int) -> bool:
+        """Mark a booking as cancelled"""
+        return self.update_booking(booking_id, {'status': 'cancelled'})
     
     def get_revenue_summary(self, start_date: str, end_date: str) -> Dict:
-        """Get revenue summary for date range"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as booking_count,
-                SUM(total_amount) as total_revenue,
-                AVG(total_amount) as avg_booking_value,
-                SUM(duration_hours) as total_hours
-            FROM bookings
-            WHERE booking_date BETWEEN ? AND ?
-            AND status = 'confirmed'
-        """, (start_date, end_date))
-        
-        result = cursor.fetchone()
-        conn.close()
+        """Get revenue summary for date range (from the daily rollup)"""
+        with self.connection() as conn:
+            result = conn.execute("""
+                SELECT 
+                    SUM(booking_count) as booking_count,
+                    SUM(total_amount) as total_revenue,
+                    SUM(total_amount) / NULLIF(SUM(amount_count), 0) as avg_booking_value,
+                    SUM(total_hours) as total_hours
+                FROM booking_daily_rollup
+                WHERE booking_date BETWEEN ? AND ?
+                AND status = 'confirmed'
+            """, (start_date, end_date)).fetchone()
         
         return {
             'booking_count': result[0] or 0,
@@ -361,35 +429,28 @@ class DatabaseManager:
         }
     
     def get_utilization_stats(self, start_date: str, end_date: str) -> pd.DataFrame:
-        """Get utilization statistics by asset"""
-        conn = self.get_connection()
-        
+        """Get utilization statistics by asset (from the daily rollup)"""
         query = """
             SELECT 
                 a.name as asset_name,
                 a.asset_type,
-                COUNT(b.id) as booking_count,
-                SUM(b.duration_hours) as booked_hours,
-                SUM(b.total_amount) as revenue
+                IFNULL(SUM(r.booking_count), 0) as booking_count,
+                SUM(r.total_hours) as booked_hours,
+                SUM(r.total_amount) as revenue
             FROM assets a
-            LEFT JOIN bookings b ON a.id = b.asset_id
-                AND b.booking_date BETWEEN ? AND ?
-                AND b.status = 'confirmed'
+            LEFT JOIN booking_daily_rollup r ON r.asset_id = a.id
+                AND r.booking_date BETWEEN ? AND ?
+                AND r.status = 'confirmed'
             WHERE a.active = 1
             GROUP BY a.id, a.name, a.asset_type
             ORDER BY revenue DESC
         """
         
-        df = pd.read_sql_query(query, conn, params=[start_date, end_date])
-        conn.close()
-        
-        return df
+        with self.connection() as conn:
+            return pd.read_sql_query(query, conn, params=[start_date, end_date])
     
     def seed_sample_data(self):
         """Seed database with sample data for testing"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         # Sample assets
         assets = [
             ('skill_shot_main', 'turf_full', 'Turf Field - Full', 22, 7200, 275, 200, 150),
@@ -399,15 +460,158 @@ class DatabaseManager:
             ('skill_shot_main', 'suite', 'Suite A', 20, 1200, 200, 150, 100),
         ]
         
-        cursor.executemany("""
-            INSERT OR IGNORE INTO assets (
-                site_id, asset_type, name, capacity, square_footage,
-                hourly_rate_prime, hourly_rate_standard, hourly_rate_offpeak
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, assets)
-        
+        with self.connection() as conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO assets (
+                    site_id, asset_type, name, capacity, square_footage,
+                    hourly_rate_prime, hourly_rate_standard, hourly_rate_offpeak
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, assets)
+    
+    def seed_sample_bookings(self, count: int = 1000) -> List[int]:
+        """Seed synthetic bookings across the sample assets via the bulk insert path"""
+        with self.connection() as conn:
+            asset_ids = [r[0] for r in conn.execute("SELECT id FROM assets WHERE active = 1")]
+        return self.insert_bookings(sample_bookings(count, asset_ids or [1, 2, 3, 4, 5]))
+
+def sample_bookings(count: int, asset_ids: List[int] = (1, 2, 3, 4, 5),
+                    start_date: str = "2025-01-01", days: int = 365, seed: int = 7) -> pd.DataFrame:
+    """Generate `count` synthetic bookings as a DataFrame (vectorized, for seeding and benchmarks)"""
+    import numpy as np
+    
+    rng = np.random.default_rng(seed)
+    start_hour = rng.integers(6, 22, count)
+    duration = rng.choice([1.0, 1.5, 2.0], count)
+    rate = rng.choice([35.0, 45.0, 55.0, 200.0, 275.0], count)
+    minutes = (start_hour * 60 + duration * 60).astype(int)
+    return pd.DataFrame({
+        'asset_id': rng.choice(list(asset_ids), count),
+        'customer_name': pd.Series(rng.integers(1, 5000, count)).map('Customer {}'.format),
+        'customer_type': rng.choice(['member', 'public', 'league', 'youth'], count),
+        'booking_date': (pd.Timestamp(start_date) + pd.to_timedelta(rng.integers(0, days, count), unit='D')).strftime('%Y-%m-%d'),
+        'start_time': pd.Series(start_hour).map('{:02d}:00'.format),
+        'end_time': [f"{m // 60:02d}:{m % 60:02d}" for m in minutes],
+        'duration_hours': duration,
+        'rate_per_hour': rate,
+        'total_amount': duration * rate,
+        'status': rng.choice(['confirmed', 'confirmed', 'confirmed', 'cancelled'], count),
+        'created_by': 'seed',
+    })
+
+class _ConnectPerCallAccess:
+    """Pre-pool access pattern: bare sqlite3.connect per call, default journal and pragmas"""
+    
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.pool = None
+    
+    def insert_booking(self, booking_data: Dict) -> int:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            INSERT INTO bookings ({', '.join(BOOKING_COLUMNS)})
+            VALUES ({', '.join('?' for _ in BOOKING_COLUMNS)})
+        """, next(_iter_row_tuples([booking_data], BOOKING_COLUMNS, BOOKING_DEFAULTS)))
+        booking_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        return booking_id
+    
+    def get_bookings(self, start_date: str, end_date: str) -> pd.DataFrame:
+        conn = sqlite3.connect(self.db_path)
+        df = pd.read_sql_query(
+            "SELECT * FROM bookings WHERE booking_date >= ? AND booking_date <= ? "
+            "ORDER BY booking_date, start_time", conn, params=[start_date, end_date])
+        conn.close()
+        return df
+    
+    def get_revenue_summary(self, start_date: str, end_date: str) -> tuple:
+        conn = sqlite3.connect(self.db_path)
+        result = conn.execute("""
+            SELECT COUNT(*), SUM(total_amount), AVG(total_amount), SUM(duration_hours)
+            FROM bookings WHERE booking_date BETWEEN ? AND ? AND status = 'confirmed'
+        """, (start_date, end_date)).fetchone()
+        conn.close()
+        return result
+
+def benchmark_concurrency(db_path: str, threads: int = 8, ops_per_thread: int = 250,
+                          write_ratio: float = 0.3, pool_size: int = 8, wal: bool = True,
+                          baseline: bool = False) -> Dict:
+    """Run N threads of mixed booking inserts/reads/summaries and report throughput
+    
+    baseline=True replays the pre-pool code path (a fresh default connection per call,
+    rollback journal, no pragmas) against the same schema; pool_size and wal are ignored.
+    """
+    import random
+    import time
+    
+    schema = DatabaseManager(db_path, pool_size=0, wal=not baseline and wal)
+    schema.ensure_schema()
+    manager = _ConnectPerCallAccess(db_path) if baseline else DatabaseManager(db_path, pool_size=pool_size, wal=wal)
+    errors = []
+    
+    def worker(seed: int):
+        rng = random.Random(seed)
+        for _ in range(ops_per_thread):
+            day = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            try:
+                if rng.random() < write_ratio:
+                    manager.insert_booking({
+                        'asset_id': rng.randint(1, 5), 'customer_name': f"bench-{seed}",
+                        'booking_date': day, 'start_time': '18:00', 'end_time': '19:00',
+                        'duration_hours': 1.0, 'rate_per_hour': 100.0, 'total_amount': 100.0
+                    })
+                elif rng.random() < 0.5:
+                    manager.get_bookings(start_date=day, end_date=day)
+                else:
+                    manager.get_revenue_summary(day, day)
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+    
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if manager.pool:
+        manager.pool.close_all()
+    
+    total_ops = threads * ops_per_thread
+    return {
+        'threads': threads,
+        'ops': total_ops,
+        'seconds': round(elapsed, 3),
+        'ops_per_sec': round(total_ops / elapsed, 1),
+        'errors': len(errors)
+    }
 
-# Global database instance
+# Global database instance (schema is created lazily on first use)
 db = DatabaseManager()
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+    
+    parser = argparse.ArgumentParser(description="SportAI database concurrency benchmark")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=250, help="Operations per thread")
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--check-plans", default="", metavar="DB_PATH",
+                        help="Verify EXPLAIN QUERY PLAN uses the managed indexes on DB_PATH and exit")
+    args = parser.parse_args()
+    
+    if args.check_plans:
+        plans = DatabaseManager(args.check_plans).check_query_plans()
+        for name, res in plans.items():
+            print(f"{'OK  ' if res['ok'] else 'FAIL'} {name}: {' | '.join(res['plan'])}")
+        raise SystemExit(0 if all(r['ok'] for r in plans.values()) else 1)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = benchmark_concurrency(f"{tmp}/baseline.db", args.threads, args.ops,
+                                         args.write_ratio, baseline=True)
+        pooled = benchmark_concurrency(f"{tmp}/pooled.db", args.threads, args.ops,
+                                       args.write_ratio, pool_size=args.threads)
+    print(f"pre-pool connect-per-call:          {baseline}")
+    print(f"pooled, WAL:                        {pooled}")
@@ -0,0 +1,127 @@
+"""
+SportAI Price Elasticity
+Incremental demand-vs-price fits per asset type and time category
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Fits backed by fewer daily observations than this are not trusted
+MIN_OBSERVATIONS = 14
+
+# Same dayparts as the pricing engine's time categories (prime 6-9pm, off-peak before 9am / from 9pm)
+_TIME_CATEGORY_SQL = """
+    CASE WHEN CAST(substr(b.start_time, 1, 2) AS INTEGER) BETWEEN 18 AND 20 THEN 'prime'
+         WHEN CAST(substr(b.start_time, 1, 2) AS INTEGER) BETWEEN 9 AND 17 THEN 'standard'
+         ELSE 'off_peak' END
+"""
+
+# One observation per (asset type, time category, day): hours booked at the average hourly price
+DAILY_DEMAND_SQL = f"""
+    SELECT a.asset_type, {_TIME_CATEGORY_SQL} AS time_category, b.booking_date,
+           COUNT(*) AS bookings, SUM(b.duration_hours) AS hours, SUM(b.total_amount) AS revenue
+    FROM bookings b JOIN assets a ON a.id = b.asset_id
+    WHERE b.booking_date > ? AND b.booking_date <= ?
+      AND b.status NOT IN ('cancelled', 'canceled')
+    GROUP BY a.asset_type, time_category, b.booking_date
+"""
+
+FOLD_SQL = """
+    INSERT INTO price_elasticity
+        (asset_type, time_category, observations, bookings, hours, revenue, sum_x, sum_y, sum_xx, sum_xy)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (asset_type, time_category) DO UPDATE SET
+        observations = observations + excluded.observations,
+        bookings = bookings + excluded.bookings,
+        hours = hours + excluded.hours,
+        revenue = revenue + excluded.revenue,
+        sum_x = sum_x + excluded.sum_x,
+        sum_y = sum_y + excluded.sum_y,
+        sum_xx = sum_xx + excluded.sum_xx,
+        sum_xy = sum_xy + excluded.sum_xy
+"""
+
+# Least squares for ln(hours) = intercept + elasticity * ln(price) from the running sums;
+# cells whose prices never varied have no slope
+_SXX = "(observations * sum_xx - sum_x * sum_x)"
+_SXY = "(observations * sum_xy - sum_x * sum_y)"
+REFIT_SQL = f"""
+    UPDATE price_elasticity SET
+        elasticity = CASE WHEN {_SXX} > 1e-9 * observations * observations THEN {_SXY} / {_SXX} END,
+        intercept = CASE WHEN {_SXX} > 1e-9 * observations * observations
+                         THEN (sum_y - sum_x * {_SXY} / {_SXX}) / observations END,
+        fitted_through = ?,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+def update_elasticity(manager, through: Optional[date] = None) -> Dict:
+    """Fold days after the last fit up to `through` (default: yesterday) into the fits
+
+    Only the new days are read, so nightly runs cost one day of bookings regardless of
+    history length. Days are folded once; bookings added later for already-fitted days
+    are picked up by rebuild_elasticity.
+    """
+    through = str(through or date.today() - timedelta(days=1))
+    with manager.connection() as conn:
+        since = conn.execute("SELECT MAX(fitted_through) FROM price_elasticity").fetchone()[0] or '0000-01-01'
+        if since >= through:
+            return {'since': since, 'through': since, 'observations': 0, 'cells': 0}
+
+        daily = pd.read_sql_query(DAILY_DEMAND_SQL, conn, params=[since, through])
+        daily = daily[(daily['hours'] > 0) & (daily['revenue'] > 0)]
+        daily['x'] = np.log(daily['revenue'] / daily['hours'])
+        daily['y'] = np.log(daily['hours'])
+        daily['xx'] = daily['x'] ** 2
+        daily['xy'] = daily['x'] * daily['y']
+        sums = daily.groupby(['asset_type', 'time_category']).agg(
+            observations=('y', 'size'), bookings=('bookings', 'sum'), hours=('hours', 'sum'),
+            revenue=('revenue', 'sum'), sum_x=('x', 'sum'), sum_y=('y', 'sum'),
+            sum_xx=('xx', 'sum'), sum_xy=('xy', 'sum')
+        ).reset_index()
+
+        conn.executemany(FOLD_SQL, sums.itertuples(index=False, name=None))
+        conn.execute(REFIT_SQL, (through,))
+
+    return {'since': since, 'through': through, 'observations': len(daily), 'cells': len(sums)}
+
+def rebuild_elasticity(manager, through: Optional[date] = None) -> Dict:
+    """Drop the fits and refold the whole booking history"""
+    with manager.connection() as conn:
+        conn.execute("DELETE FROM price_elasticity")
+    return update_elasticity(manager, through)
+
+def load_elasticity(manager, min_observations: int = MIN_OBSERVATIONS) -> pd.DataFrame:
+    """Fitted cells with average price; elasticity is NaN where the fit is not trusted"""
+    with manager.connection() as conn:
+        fits = pd.read_sql_query("""
+            SELECT asset_type, time_category, observations, bookings, hours, revenue,
+                   elasticity, intercept, fitted_through
+            FROM price_elasticity
+            ORDER BY asset_type, time_category
+        """, conn)
+    fits['avg_price'] = fits['revenue'] / fits['hours'].replace(0, np.nan)
+    trusted = fits['observations'] >= min_observations
+    fits['elasticity'] = fits['elasticity'].where(trusted).astype(float)
+    fits['intercept'] = fits['intercept'].where(trusted).astype(float)
+    return fits
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from sportai_database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Update price elasticity fits from new bookings")
+    parser.add_argument("--db", default="data/sportai.db")
+    parser.add_argument("--through", help="Last booking date to fold in (default: yesterday)")
+    parser.add_argument("--rebuild", action="store_true", help="Refit from the full history")
+    args = parser.parse_args()
+
+    manager = DatabaseManager(args.db)
+    start = time.perf_counter()
+    result = (rebuild_elasticity if args.rebuild else update_elasticity)(manager, args.through)
+    print(f"{result} in {time.perf_counter() - start:.2f}s")
+    print(load_elasticity(manager).round(3).to_string(index=False))
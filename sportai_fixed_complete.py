@@ -3424,9 +3424,21 @@ class SportAIDashboard:
                 color_discrete_    write_file("SportAI_Enterprise_Suite/run.py", run_py)
     write_file("SportAI_Enterprise_Suite/install.py", install_py)
     write_file("SportAI_Enterprise_Suite/main.py", main_py)
+    # main.py imports these from the suite directory
+    copy_suite_modules("modules/forecast_service.py", "modules/generate_forecast.py", "sportai_migrations.py",
+                       "sportai_database.py", "sportai_async_db.py")
     
     print("   ✅ Main application files created")
 
+def copy_suite_modules(*modules):
+    """Copy repository modules into the suite, keeping their paths relative to this file"""
+    import shutil
+    root = Path(__file__).resolve().parent
+    for module in modules:
+        target = Path("SportAI_Enterprise_Suite") / module
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(root / module, target)
+
 def create_backend_system():
     """Create complete backend system"""
     
@@ -5270,18 +5282,26 @@ Complete sports facility management platform
 
 import os
 import sys
+import asyncio
+import base64
+import csv
+import io
+import itertools
 import sqlite3
 import hashlib
 import json
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 
 # Auto-install critical dependencies
 try:
-    from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Request
-    from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+    from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Request, Query
+    from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
+    from fastapi.concurrency import run_in_threadpool
     from fastapi.staticfiles import StaticFiles
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -5293,14 +5313,37 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", 
                           "fastapi", "uvicorn[standard]", "pandas", "openpyxl", "python-multipart"])
     
-    from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Request
-    from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+    from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Request, Query
+    from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
+    from fastapi.concurrency import run_in_threadpool
     from fastapi.staticfiles import StaticFiles
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
     import uvicorn
     import pandas as pd
 
+# In-memory forecast service (modules/forecast_service.py, shipped with the suite)
+from modules.forecast_service import get_service as get_forecast_service
+
+FORECAST_DATA_DIR = os.getenv("SPORTAI_FORECAST_DIR", "data")
+
+# Versioned schema migrations (sportai_migrations.py, shipped with the suite)
+from sportai_migrations import migrate, ENTERPRISE_MIGRATIONS
+
+# Async data-access layer with a bounded connection pool (sportai_async_db.py, shipped with the suite)
+from sportai_async_db import AsyncDatabase
+
+DB_PATH = "data/sportai.db"
+DB_POOL_SIZE = int(os.getenv("SPORTAI_DB_POOL_SIZE", "8"))
+DASHBOARD_CACHE_TTL = float(os.getenv("SPORTAI_DASHBOARD_TTL", "30"))
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
+EXPORT_CHUNK_ROWS = 5000
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+UPLOAD_CHUNK_ROWS = 5000
+UPLOAD_PREVIEW_ROWS = 5
+UPLOAD_JOB_HISTORY = 100
+
 # Ensure required directories exist
 for directory in ["data", "logs", "uploads", "exports", "frontend/static", "frontend/templates"]:
     Path(directory).mkdir(parents=True, exist_ok=True)
@@ -5380,6 +5423,7 @@ def execute_db_query(query: str, params: tuple = ()) -> bool:
         conn.execute(query, params)
         conn.commit()
         conn.close()
+        invalidate_dashboard_cache()
         return True
     except Exception as e:
         print(f"Database execute error: {e}")
@@ -5387,6 +5431,250 @@ def execute_db_query(query: str, params: tuple = ()) -> bool:
             conn.close()
         return False
 
+# Async database helpers over the bounded connection pool
+adb = AsyncDatabase(DB_PATH, pool_size=DB_POOL_SIZE)
+
+async def db_fetch_all(query: str, params: tuple = ()) -> List[Dict]:
+    """All rows of a query as dicts"""
+    return await adb.fetch_all(query, params)
+
+async def db_fetch_one(query: str, params: tuple = ()) -> Optional[Dict]:
+    """First row of a query as a dict, or None"""
+    return await adb.fetch_one(query, params)
+
+async def db_execute(query: str, params: tuple = ()) -> bool:
+    """Execute a write statement"""
+    try:
+        await adb.execute(query, params)
+        invalidate_dashboard_cache()
+        return True
+    except sqlite3.Error as e:
+        print(f"Database execute error: {e}")
+        return False
+
+# Dashboard aggregation: one round trip, each table scanned once
+DASHBOARD_SUMMARY_SQL = """
+    SELECT f.*, e.*, m.*, s.*, ev.*
+    FROM (SELECT COUNT(*) AS total_facilities,
+                 IFNULL(SUM(status = 'active'), 0) AS active_facilities,
+                 IFNULL(SUM(revenue), 0) AS facility_revenue,
+                 IFNULL(AVG(IFNULL(utilization, 0)), 0) AS avg_utilization
+          FROM facilities) f,
+         (SELECT IFNULL(SUM(monthly_revenue), 0) AS equipment_revenue,
+                 IFNULL(SUM(IFNULL(available, 0) + IFNULL(rented, 0)), 0) AS total_equipment,
+                 IFNULL(SUM(rented), 0) AS rented_equipment
+          FROM equipment) e,
+         (SELECT COUNT(*) AS total_members,
+                 IFNULL(SUM(status = 'active'), 0) AS active_members
+          FROM members) m,
+         (SELECT IFNULL(SUM(annual_value), 0) AS sponsor_value,
+                 IFNULL(SUM(status = 'active'), 0) AS active_sponsors
+          FROM sponsors) s,
+         (SELECT IFNULL(SUM(status = 'active'), 0) AS upcoming_events
+          FROM events) ev
+"""
+
+# Cached summary; writes bump the generation so an in-flight refresh never stores stale totals
+_dashboard_cache = {"summary": None, "expires": 0.0, "generation": 0}
+_dashboard_lock = asyncio.Lock()
+
+def invalidate_dashboard_cache():
+    """Drop the cached dashboard summary (call after any write)"""
+    _dashboard_cache["summary"] = None
+    _dashboard_cache["generation"] += 1
+
+async def get_dashboard_summary() -> Dict:
+    """Dashboard totals from DASHBOARD_SUMMARY_SQL, cached for DASHBOARD_CACHE_TTL seconds"""
+    cached = _dashboard_cache["summary"]
+    if cached is not None and time.monotonic() < _dashboard_cache["expires"]:
+        return cached
+    async with _dashboard_lock:
+        # Concurrent misses wait here and reuse the first refresh
+        cached = _dashboard_cache["summary"]
+        if cached is not None and time.monotonic() < _dashboard_cache["expires"]:
+            return cached
+        generation = _dashboard_cache["generation"]
+        row = await db_fetch_one(DASHBOARD_SUMMARY_SQL)
+        summary = {
+            "total_revenue": round(row["facility_revenue"] + row["equipment_revenue"], 2),
+            "facility_revenue": round(row["facility_revenue"], 2),
+            "equipment_revenue": round(row["equipment_revenue"], 2),
+            "sponsor_value": round(row["sponsor_value"], 2),
+            "active_facilities": row["active_facilities"],
+            "total_facilities": row["total_facilities"],
+            "active_members": row["active_members"],
+            "total_members": row["total_members"],
+            "total_equipment": row["total_equipment"],
+            "rented_equipment": row["rented_equipment"],
+            "active_sponsors": row["active_sponsors"],
+            "upcoming_events": row["upcoming_events"],
+            "avg_utilization": round(row["avg_utilization"], 1)
+        }
+        if generation == _dashboard_cache["generation"]:
+            _dashboard_cache["summary"] = summary
+            _dashboard_cache["expires"] = time.monotonic() + DASHBOARD_CACHE_TTL
+        return summary
+
+# Paginated list endpoints. Sort columns are NOT NULL so keyset cursors stay exact;
+# default sorts and common filters are backed by the enterprise list indexes.
+LIST_RESOURCES = {
+    "facilities": {"sort": "name", "sortable": {"name", "type", "capacity", "hourly_rate"},
+                   "filters": {"type", "status", "location"}},
+    "equipment": {"sort": "category,name", "sortable": {"category", "name", "available", "daily_rate"},
+                  "filters": {"category", "status", "supplier"}},
+    "members": {"sort": "name", "sortable": {"name", "member_id", "tier", "join_date"},
+                "filters": {"status", "tier", "member_id", "email", "join_date"}},
+    "sponsors": {"sort": "-annual_value", "sortable": {"name", "tier", "annual_value"},
+                 "filters": {"status", "tier"}},
+    "events": {"sort": "start_date", "sortable": {"name", "event_type", "start_date", "end_date"},
+               "filters": {"status", "event_type", "facility_id", "start_date"}},
+    "bookings": {"sort": "-booking_date", "sortable": {"booking_date", "facility_id", "member_id", "total_cost"},
+                 "filters": {"status", "payment_status", "facility_id", "member_id", "booking_date"}},
+}
+FILTER_OPS = {"eq": "=", "ne": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "in": "IN"}
+
+class ListQuery:
+    """Common list parameters; any other query parameter is a filter (column or column__op)"""
+    
+    def __init__(self, request: Request, fields: Optional[str] = None, sort: Optional[str] = None,
+                 limit: int = Query(LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT), cursor: Optional[str] = None):
+        self.fields = fields
+        self.sort = sort
+        self.limit = limit
+        self.cursor = cursor
+        self.filters = [(k, v) for k, v in request.query_params.multi_items()
+                        if k not in ("fields", "sort", "limit", "cursor")]
+
+_table_columns: Dict[str, List[str]] = {}
+
+async def table_columns(table: str) -> List[str]:
+    """Column names of a table (cached for the process)"""
+    if table not in _table_columns:
+        _table_columns[table] = [row["name"] for row in await db_fetch_all(f"PRAGMA table_info({table})")]
+    return _table_columns[table]
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+async def list_resource(table: str, q: ListQuery) -> Dict:
+    """One page of a table with projection, filters, sort and a keyset cursor"""
+    spec = LIST_RESOURCES[table]
+    columns = await table_columns(table)
+    
+    fields = [f.strip() for f in q.fields.split(",") if f.strip()] if q.fields else list(columns)
+    unknown = [f for f in fields if f not in columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields for {table}: {unknown}")
+    
+    # Sort keys always end with id so the order (and therefore the cursor) is total
+    sort_keys, id_desc = [], None
+    for part in (q.sort or spec["sort"]).split(","):
+        part = part.strip()
+        col, desc = part.lstrip("+-"), part.startswith("-")
+        if col == "id":
+            id_desc = desc
+        elif col in spec["sortable"]:
+            sort_keys.append((col, desc))
+        else:
+            raise HTTPException(status_code=400, detail=f"Cannot sort {table} by '{col}'; use one of {sorted(spec['sortable'])}")
+    if id_desc is None:
+        id_desc = sort_keys[-1][1] if sort_keys else False
+    sort_keys.append(("id", id_desc))
+    
+    where, params = [], []
+    for key, value in q.filters:
+        col, _, op = key.partition("__")
+        op = op or "eq"
+        if col != "id" and col not in spec["filters"]:
+            raise HTTPException(status_code=400, detail=f"Cannot filter {table} by '{col}'; use one of {sorted(spec['filters'])}")
+        if op not in FILTER_OPS:
+            raise HTTPException(status_code=400, detail=f"Unknown filter operator '{op}'; use one of {list(FILTER_OPS)}")
+        if op == "in":
+            values = value.split(",")
+            where.append(f"{col} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        else:
+            where.append(f"{col} {FILTER_OPS[op]} ?")
+            params.append(value)
+    
+    if q.cursor:
+        after = decode_cursor(q.cursor, len(sort_keys))
+        if len({desc for _, desc in sort_keys}) == 1:
+            # Uniform direction: a row-value comparison the planner can seek on
+            cols = ", ".join(col for col, _ in sort_keys)
+            where.append(f"({cols}) {'<' if sort_keys[0][1] else '>'} ({', '.join('?' for _ in sort_keys)})")
+            params.extend(after)
+        else:
+            clauses = []
+            for i, (col, desc) in enumerate(sort_keys):
+                terms = [f"{c} = ?" for c, _ in sort_keys[:i]] + [f"{col} {'<' if desc else '>'} ?"]
+                clauses.append(f"({' AND '.join(terms)})")
+                params.extend(after[:i + 1])
+            where.append(f"({' OR '.join(clauses)})")
+    
+    select_cols = fields + [col for col, _ in sort_keys if col not in fields]
+    query = f"SELECT {', '.join(select_cols)} FROM {table}"
+    if where:
+        query += f" WHERE {' AND '.join(where)}"
+    query += f" ORDER BY {', '.join(f'{col} DESC' if desc else col for col, desc in sort_keys)} LIMIT ?"
+    params.append(q.limit + 1)
+    
+    try:
+        rows = await db_fetch_all(query, tuple(params))
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=400, detail=f"Query error: {str(e)}")
+    
+    next_cursor = None
+    if len(rows) > q.limit:
+        rows = rows[:q.limit]
+        next_cursor = encode_cursor([rows[-1][col] for col, _ in sort_keys])
+    for col in select_cols[len(fields):]:
+        for row in rows:
+            del row[col]
+    return {"items": rows, "next_cursor": next_cursor, "limit": q.limit}
+
+async def fetch_table(table: str, where_clause: str = "", params: tuple = (), order_by: str = "") -> List[Dict]:
+    """Async get_db_data; constant SQL per call site so pooled connections reuse the prepared statement"""
+    query = f"SELECT * FROM {table}"
+    if where_clause:
+        query += f" WHERE {where_clause}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    try:
+        return await db_fetch_all(query, params)
+    except sqlite3.Error as e:
+        print(f"Database query error: {e}")
+        return []
+
+@app.on_event("startup")
+def apply_schema_migrations():
+    """Bring the schema up to date once per process; no DDL runs when it is current"""
+    if not Path("data/sportai.db").exists():
+        return
+    conn = sqlite3.connect("data/sportai.db")
+    try:
+        applied = migrate(conn, ENTERPRISE_MIGRATIONS, 'enterprise')
+        if applied:
+            print(f"✅ Applied schema migrations: {applied}")
+    except ValueError as e:
+        print(f"⚠️ Skipped schema migrations: {e}")
+    finally:
+        conn.close()
+
+@app.on_event("shutdown")
+def close_db_pool():
+    """Close pooled database connections"""
+    adb.close()
+
 # API Routes
 @app.get("/", response_class=HTMLResponse)
 def root():
@@ -5578,39 +5866,37 @@ def root():
     return html_content
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint"""
+    try:
+        connected = await db_fetch_one("SELECT 1 AS ok") is not None
+    except sqlite3.Error:
+        connected = False
     return {
         "status": "healthy", 
         "version": "6.0.0", 
         "timestamp": datetime.now().isoformat(),
-        "database": "connected" if get_db_connection() else "disconnected"
+        "database": "connected" if connected else "disconnected"
     }
 
 # Authentication routes
 @app.post("/api/auth/login")
-def login(email: str = Form(), password: str = Form()):
+async def login(email: str = Form(), password: str = Form()):
     """User authentication"""
     try:
-        conn = get_db_connection()
-        if not conn:
-            raise HTTPException(status_code=500, detail="Database connection failed")
-        
         password_hash = hashlib.sha256(password.encode()).hexdigest()
-        cursor = conn.execute(
-            "SELECT * FROM users WHERE email=? AND password_hash=? AND is_active=1", 
+        user = await db_fetch_one(
+            "SELECT id, email, role, full_name FROM users WHERE email=? AND password_hash=? AND is_active=1", 
             (email, password_hash)
         )
-        user = cursor.fetchone()
-        conn.close()
         
         if user:
             return {
                 "user": {
-                    "id": user[0],
-                    "email": user[1],
-                    "role": user[3],
-                    "full_name": user[4]
+                    "id": user["id"],
+                    "email": user["email"],
+                    "role": user["role"],
+                    "full_name": user["full_name"]
                 },
                 "access_token": "demo-token",
                 "token_type": "bearer"
@@ -5623,67 +5909,42 @@ def login(email: str = Form(), password: str = Form()):
 
 # Data routes
 @app.get("/api/facilities")
-def get_facilities(current_user: dict = Depends(verify_token)):
-    """Get all facilities"""
-    return get_db_data("facilities", "ORDER BY name")
+async def get_facilities(q: ListQuery = Depends(), current_user: dict = Depends(verify_token)):
+    """List facilities (paginated; see ListQuery)"""
+    return await list_resource("facilities", q)
 
 @app.get("/api/equipment")
-def get_equipment(current_user: dict = Depends(verify_token)):
-    """Get all equipment"""
-    return get_db_data("equipment", "ORDER BY category, name")
+async def get_equipment(q: ListQuery = Depends(), current_user: dict = Depends(verify_token)):
+    """List equipment (paginated; see ListQuery)"""
+    return await list_resource("equipment", q)
 
 @app.get("/api/members")
-def get_members(current_user: dict = Depends(verify_token)):
-    """Get all members"""
-    return get_db_data("members", "ORDER BY name")
+async def get_members(q: ListQuery = Depends(), current_user: dict = Depends(verify_token)):
+    """List members (paginated; see ListQuery)"""
+    return await list_resource("members", q)
 
 @app.get("/api/sponsors")
-def get_sponsors(current_user: dict = Depends(verify_token)):
-    """Get all sponsors"""
-    return get_db_data("sponsors", "ORDER BY annual_value DESC")
+async def get_sponsors(q: ListQuery = Depends(), current_user: dict = Depends(verify_token)):
+    """List sponsors (paginated; see ListQuery)"""
+    return await list_resource("sponsors", q)
 
 @app.get("/api/events")
-def get_events(current_user: dict = Depends(verify_token)):
-    """Get all events"""
-    return get_db_data("events", "ORDER BY start_date")
+async def get_events(q: ListQuery = Depends(), current_user: dict = Depends(verify_token)):
+    """List events (paginated; see ListQuery)"""
+    return await list_resource("events", q)
 
 @app.get("/api/bookings")
-def get_bookings(current_user: dict = Depends(verify_token)):
-    """Get all bookings"""
-    return get_db_data("bookings", "ORDER BY booking_date DESC")
+async def get_bookings(q: ListQuery = Depends(), current_user: dict = Depends(verify_token)):
+    """List bookings (paginated; see ListQuery)"""
+    return await list_resource("bookings", q)
 
 # Analytics routes
 @app.get("/api/analytics/dashboard")
-def get_dashboard_analytics(current_user: dict = Depends(verify_token)):
+async def get_dashboard_analytics(current_user: dict = Depends(verify_token)):
     """Get comprehensive dashboard analytics"""
     try:
-        facilities = get_db_data("facilities")
-        equipment = get_db_data("equipment")
-        members = get_db_data("members")
-        sponsors = get_db_data("sponsors")
-        events = get_db_data("events")
-        
-        # Calculate metrics
-        total_revenue = sum(f.get('revenue', 0) for f in facilities)
-        total_equipment_revenue = sum(e.get('monthly_revenue', 0) for e in equipment)
-        total_sponsor_value = sum(s.get('annual_value', 0) for s in sponsors)
-        
         return {
-            "summary": {
-                "total_revenue": round(total_revenue + total_equipment_revenue, 2),
-                "facility_revenue": round(total_revenue, 2),
-                "equipment_revenue": round(total_equipment_revenue, 2),
-                "sponsor_value": round(total_sponsor_value, 2),
-                "active_facilities": len([f for f in facilities if f.get('status') == 'active']),
-                "total_facilities": len(facilities),
-                "active_members": len([m for m in members if m.get('status') == 'active']),
-                "total_members": len(members),
-                "total_equipment": sum(e.get('available', 0) + e.get('rented', 0) for e in equipment),
-                "rented_equipment": sum(e.get('rented', 0) for e in equipment),
-                "active_sponsors": len([s for s in sponsors if s.get('status') == 'active']),
-                "upcoming_events": len([e for e in events if e.get('status') == 'active']),
-                "avg_utilization": round(sum(f.get('utilization', 0) for f in facilities) / len(facilities), 1) if facilities else 0
-            },
+            "summary": await get_dashboard_summary(),
             "recent_activity": [
                 {
                     "action": "New member registration",
@@ -5727,12 +5988,12 @@ def get_dashboard_analytics(current_user: dict = Depends(verify_token)):
         raise HTTPException(status_code=500, detail=f"Analytics error: {str(e)}")
 
 @app.get("/api/analytics/insights")
-def get_ai_insights(current_user: dict = Depends(verify_token)):
+async def get_ai_insights(current_user: dict = Depends(verify_token)):
     """Get AI-generated insights and recommendations"""
     try:
-        facilities = get_db_data("facilities")
-        members = get_db_data("members")
-        equipment = get_db_data("equipment")
+        facilities, members, equipment = await asyncio.gather(
+            fetch_table("facilities"), fetch_table("members"), fetch_table("equipment")
+        )
         
         insights = []
         
@@ -5802,72 +6063,262 @@ def get_ai_insights(current_user: dict = Depends(verify_token)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Insights error: {str(e)}")
 
+# Forecast routes
+def _forecast_service():
+    return get_forecast_service(FORECAST_DATA_DIR)
+
+@app.get("/api/forecast/status")
+def get_forecast_status(current_user: dict = Depends(verify_token)):
+    """Loaded model version, zones and cache stats"""
+    return _forecast_service().status()
+
+@app.get("/api/forecast/{zone_id}")
+def get_zone_forecast(zone_id: str, start: str, end: str, current_user: dict = Depends(verify_token)):
+    """Hourly forecast (point + P10/P50/P90) for a zone over [start, end)"""
+    try:
+        df = _forecast_service().forecast(zone_id, start, end)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Forecast error: {str(e)}")
+    return {"zone_id": zone_id, "start": start, "end": end, "forecast": df.to_dict('records')}
+
+@app.post("/api/forecast/reload")
+def reload_forecast_models(current_user: dict = Depends(verify_token)):
+    """Hot-swap in the latest trained models without restarting the server"""
+    swapped = _forecast_service().reload(force=True)
+    return {"reloaded": swapped, **_forecast_service().status()}
+
 # File upload and export routes
-@app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...), current_user: dict = Depends(verify_token)):
-    """Upload and process data files"""
+# Uploads are streamed to disk in UPLOAD_CHUNK_BYTES pieces and previewed from the head of
+# the file; parsing, validation and the optional bulk load run on a background worker
+UPLOAD_TABLES = ['facilities', 'equipment', 'members', 'sponsors', 'events', 'bookings']
+upload_jobs: Dict[str, Dict] = {}
+ingest_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sportai-ingest")
+
+def read_upload_frames(file_path: str, chunk_rows: int = UPLOAD_CHUNK_ROWS):
+    """Yield (DataFrame chunk, fraction of file read) for a CSV or Excel upload"""
+    if file_path.endswith('.csv'):
+        size = max(os.path.getsize(file_path), 1)
+        with open(file_path, "rb") as f:
+            for frame in pd.read_csv(f, chunksize=chunk_rows):
+                yield frame, min(f.tell() / size, 1.0)
+    else:
+        df = pd.read_excel(file_path)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows], min((start + chunk_rows) / max(len(df), 1), 1.0)
+
+def insert_upload_rows(conn, table: str, columns: List[str], rows: List[tuple], row_numbers: List[int], job: Dict):
+    """Insert one chunk in a transaction; on a constraint error, retry row by row to reject only bad rows"""
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    try:
+        with conn:
+            conn.executemany(query, rows)
+        job["rows_loaded"] += len(rows)
+    except sqlite3.IntegrityError:
+        for row_number, row in zip(row_numbers, rows):
+            try:
+                with conn:
+                    conn.execute(query, row)
+                job["rows_loaded"] += 1
+            except sqlite3.IntegrityError as e:
+                reject_upload_row(job, row_number, str(e))
+
+def reject_upload_row(job: Dict, row_number: int, reason: str):
+    job["rows_rejected"] += 1
+    if len(job["errors"]) < 20:
+        job["errors"].append({"row": row_number, "error": reason})
+
+def ingest_upload(job_id: str, file_path: str, table: Optional[str]):
+    """Background worker: parse the whole upload, validate rows and bulk load them into `table`"""
+    job = upload_jobs[job_id]
+    job.update(status="running", started_at=datetime.now().isoformat())
+    conn = sqlite3.connect(DB_PATH, timeout=30.0) if table else None
     try:
-        # Validate file type
-        if not file.filename.endswith(('.csv', '.xlsx', '.xls')):
-            raise HTTPException(status_code=400, detail="Only CSV and Excel files are supported")
+        table_cols, required = [], set()
+        if conn:
+            info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            table_cols = [r[1] for r in info if r[1] != "id"]
+            required = {r[1] for r in info if r[3] and r[4] is None and not r[5]}
         
-        # Save file
+        row_number = 1
+        for frame, progress in read_upload_frames(file_path):
+            if conn:
+                if row_number == 1:
+                    missing = sorted(required - set(frame.columns))
+                    if missing:
+                        raise ValueError(f"Missing required columns for {table}: {missing}")
+                    job["ignored_columns"] = [c for c in frame.columns if c not in table_cols]
+                columns = [c for c in frame.columns if c in table_cols]
+                frame = frame[columns].astype(object).where(frame[columns].notna(), None)
+                blank = frame[[c for c in columns if c in required]].isna().any(axis=1).to_numpy()
+                numbers = range(row_number, row_number + len(frame))
+                for n in (n for n, b in zip(numbers, blank) if b):
+                    reject_upload_row(job, n, "missing required value")
+                insert_upload_rows(conn, table, columns, list(frame[~blank].itertuples(index=False, name=None)),
+                                   [n for n, b in zip(numbers, blank) if not b], job)
+            job["rows_processed"] += len(frame)
+            job["progress"] = round(progress, 3)
+            row_number += len(frame)
+        
+        if conn and job["rows_loaded"]:
+            invalidate_dashboard_cache()
+        job.update(status="done", progress=1.0)
+    except Exception as e:
+        job.update(status="failed", error=str(e))
+    finally:
+        job["finished_at"] = datetime.now().isoformat()
+        if conn:
+            conn.close()
+
+@app.post("/api/upload")
+async def upload_file(file: UploadFile = File(...), table: Optional[str] = Form(None),
+                      current_user: dict = Depends(verify_token)):
+    """Upload a data file; optionally bulk load it into `table` in the background"""
+    if not file.filename.endswith(('.csv', '.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="Only CSV and Excel files are supported")
+    if table is not None and table not in UPLOAD_TABLES:
+        raise HTTPException(status_code=400, detail=f"Invalid table. Must be one of: {UPLOAD_TABLES}")
+    
+    try:
         file_id = str(uuid.uuid4())
-        file_path = f"uploads/{file_id}_{file.filename}"
+        file_path = f"uploads/{file_id}_{Path(file.filename).name}"
         
-        content = await file.read()
+        size = 0
         with open(file_path, "wb") as f:
-            f.write(content)
-        
-        # Process file
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                await run_in_threadpool(f.write, chunk)
+                size += len(chunk)
+        
+        # Preview only parses the first rows; the full parse happens in the background job
         if file.filename.endswith('.csv'):
-            df = pd.read_csv(file_path)
+            preview = await run_in_threadpool(pd.read_csv, file_path, nrows=UPLOAD_PREVIEW_ROWS)
         else:
-            df = pd.read_excel(file_path)
+            preview = await run_in_threadpool(pd.read_excel, file_path, nrows=UPLOAD_PREVIEW_ROWS)
+        
+        finished = [j for j, job in upload_jobs.items() if job["status"] in ("done", "failed")]
+        for old_id in finished[:max(len(upload_jobs) - UPLOAD_JOB_HISTORY + 1, 0)]:
+            del upload_jobs[old_id]
+        upload_jobs[file_id] = {
+            "job_id": file_id, "filename": file.filename, "table": table, "status": "queued",
+            "bytes": size, "progress": 0.0, "rows_processed": 0, "rows_loaded": 0, "rows_rejected": 0,
+            "errors": [], "ignored_columns": [], "error": None, "started_at": None, "finished_at": None
+        }
+        ingest_executor.submit(ingest_upload, file_id, file_path, table)
         
         return {
             "message": "File uploaded successfully",
             "filename": file.filename,
             "file_id": file_id,
-            "rows": len(df),
-            "columns": list(df.columns),
-            "preview": df.head().to_dict('records') if len(df) > 0 else []
+            "bytes": size,
+            "columns": list(preview.columns),
+            "preview": preview.astype(object).where(preview.notna(), None).to_dict('records'),
+            "job_id": file_id,
+            "status_url": f"/api/upload/{file_id}"
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Upload error: {str(e)}")
 
+@app.get("/api/upload/{job_id}")
+def get_upload_status(job_id: str, current_user: dict = Depends(verify_token)):
+    """Progress of an upload's background parse / validation / load"""
+    if job_id not in upload_jobs:
+        raise HTTPException(status_code=404, detail="Unknown upload job")
+    return upload_jobs[job_id]
+
+# Exports stream rows from one cursor in EXPORT_CHUNK_ROWS chunks, so memory use does not
+# grow with the table; XLSX is written with openpyxl's write-only (constant memory) mode
+EXPORT_TYPES = ['facilities', 'equipment', 'members', 'sponsors', 'events', 'bookings']
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+def iter_table_chunks(table: str, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Yield (columns, rows) chunks of a table; the connection closes when the generator does"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    try:
+        cursor = conn.execute(f"SELECT * FROM {table} ORDER BY id")
+        columns = [d[0] for d in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield columns, rows
+    finally:
+        conn.close()
+
+def csv_chunks(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for i, (columns, rows) in enumerate(chunks):
+        if i == 0:
+            writer.writerow(columns)
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def ndjson_chunks(chunks):
+    for columns, rows in chunks:
+        yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\\n" for row in rows)
+
+def write_xlsx_export(chunks, export_path: str):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("export")
+    for i, (columns, rows) in enumerate(chunks):
+        if i == 0:
+            sheet.append(columns)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(export_path)
+
 @app.get("/api/export/{data_type}")
-def export_data(data_type: str, current_user: dict = Depends(verify_token)):
-    """Export data to Excel"""
+def export_data(data_type: str, fmt: str = Query("xlsx", alias="format"), current_user: dict = Depends(verify_token)):
+    """Export data as streamed CSV / NDJSON, or as an Excel file"""
+    if data_type not in EXPORT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid data type. Must be one of: {EXPORT_TYPES}")
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Must be one of: {list(EXPORT_MEDIA_TYPES)}")
+    
     try:
-        valid_types = ['facilities', 'equipment', 'members', 'sponsors', 'events', 'bookings']
-        if data_type not in valid_types:
-            raise HTTPException(status_code=400, detail=f"Invalid data type. Must be one of: {valid_types}")
-        
-        data = get_db_data(data_type)
-        if not data:
+        chunks = iter_table_chunks(data_type)
+        first = next(chunks, None)
+        if first is None:
             raise HTTPException(status_code=404, detail=f"No {data_type} data found")
+        chunks = itertools.chain([first], chunks)
         
-        df = pd.DataFrame(data)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{data_type}_export_{timestamp}.xlsx"
-        export_path = f"exports/{filename}"
-        
-        df.to_excel(export_path, index=False)
-        
-        return FileResponse(
-            export_path,
-            filename=filename,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        filename = f"{data_type}_export_{timestamp}.{fmt}"
+        
+        if fmt == "xlsx":
+            export_path = f"exports/{filename}"
+            write_xlsx_export(chunks, export_path)
+            return FileResponse(export_path, filename=filename, media_type=EXPORT_MEDIA_TYPES[fmt])
+        
+        body = csv_chunks(chunks) if fmt == "csv" else ndjson_chunks(chunks)
+        return StreamingResponse(
+            body,
+            media_type=EXPORT_MEDIA_TYPES[fmt],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
 
 # CRUD operations for each module
 @app.post("/api/facilities")
-def create_facility(facility_data: dict, current_user: dict = Depends(verify_token)):
+async def create_facility(facility_data: dict, current_user: dict = Depends(verify_token)):
     """Create new facility"""
     try:
         query = '''
@@ -5883,7 +6334,7 @@ def create_facility(facility_data: dict, current_user: dict = Depends(verify_tok
             facility_data.get('status', 'active')
         )
         
-        if execute_db_query(query, params):
+        if await db_execute(query, params):
             return {"message": "Facility created successfully"}
         else:
             raise HTTPException(status_code=500, detail="Failed to create facility")
@@ -0,0 +1,545 @@
+"""
+SportAI Schema Migrations
+Versioned, run-once schema changes for the SportAI SQLite databases
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+class Migration(NamedTuple):
+    """One schema step: SQL statements, or a callable for data-aware changes"""
+    version: int
+    description: str
+    steps: Union[Tuple[str, ...], Callable[[sqlite3.Connection], None]]
+
+def index_steps(indexes: Dict[str, Tuple[str, Tuple[str, ...]]]) -> Tuple[str, ...]:
+    """CREATE INDEX statements for a {name: (table, columns)} mapping"""
+    return tuple(
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        for name, (table, columns) in indexes.items()
+    )
+
+# Core schema used by sportai_database.DatabaseManager (assets / bookings / members / sponsors)
+CORE_INDEXES = {
+    'idx_bookings_date_asset': ('bookings', ('booking_date', 'asset_id')),      # get_bookings date range
+    'idx_bookings_asset_date': ('bookings', ('asset_id', 'booking_date')),      # utilization join, per-asset lists
+    'idx_bookings_status_date': ('bookings', ('status', 'booking_date')),       # revenue summary
+    'idx_members_status_name': ('members', ('status', 'name')),                 # get_members(status)
+    'idx_audit_log_timestamp': ('audit_log', ('timestamp',)),
+    'idx_sponsorship_assets_sponsor': ('sponsorship_assets', ('sponsor_id',)),
+}
+
+# Daily (asset, date, status) rollup of bookings, kept current by triggers so that inserts
+# (single or bulk), updates and cancellations all adjust it incrementally
+_ROLLUP_ADD = """
+    INSERT INTO booking_daily_rollup
+        (asset_id, booking_date, status, booking_count, amount_count, total_amount, total_hours)
+    VALUES (IFNULL(NEW.asset_id, 0), NEW.booking_date, IFNULL(NEW.status, ''), 1,
+            NEW.total_amount IS NOT NULL, IFNULL(NEW.total_amount, 0), IFNULL(NEW.duration_hours, 0))
+    ON CONFLICT (asset_id, booking_date, status) DO UPDATE SET
+        booking_count = booking_count + 1,
+        amount_count = amount_count + excluded.amount_count,
+        total_amount = total_amount + excluded.total_amount,
+        total_hours = total_hours + excluded.total_hours;
+"""
+_ROLLUP_REMOVE = """
+    UPDATE booking_daily_rollup SET
+        booking_count = booking_count - 1,
+        amount_count = amount_count - (OLD.total_amount IS NOT NULL),
+        total_amount = total_amount - IFNULL(OLD.total_amount, 0),
+        total_hours = total_hours - IFNULL(OLD.duration_hours, 0)
+    WHERE asset_id = IFNULL(OLD.asset_id, 0) AND booking_date = OLD.booking_date AND status = IFNULL(OLD.status, '');
+    DELETE FROM booking_daily_rollup
+    WHERE asset_id = IFNULL(OLD.asset_id, 0) AND booking_date = OLD.booking_date AND status = IFNULL(OLD.status, '')
+      AND booking_count <= 0;
+"""
+
+CORE_ROLLUPS = (
+    """
+    CREATE TABLE IF NOT EXISTS booking_daily_rollup (
+        asset_id INTEGER NOT NULL,
+        booking_date DATE NOT NULL,
+        status TEXT NOT NULL,
+        booking_count INTEGER NOT NULL DEFAULT 0,
+        amount_count INTEGER NOT NULL DEFAULT 0,
+        total_amount REAL NOT NULL DEFAULT 0,
+        total_hours REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (asset_id, booking_date, status)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_rollup_status_date ON booking_daily_rollup (status, booking_date)",
+    "DELETE FROM booking_daily_rollup",
+    """
+    INSERT INTO booking_daily_rollup
+        (asset_id, booking_date, status, booking_count, amount_count, total_amount, total_hours)
+    SELECT IFNULL(asset_id, 0), booking_date, IFNULL(status, ''), COUNT(*), COUNT(total_amount),
+           IFNULL(SUM(total_amount), 0), IFNULL(SUM(duration_hours), 0)
+    FROM bookings
+    GROUP BY IFNULL(asset_id, 0), booking_date, IFNULL(status, '')
+    """,
+    f"CREATE TRIGGER IF NOT EXISTS trg_bookings_rollup_insert AFTER INSERT ON bookings BEGIN {_ROLLUP_ADD} END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_bookings_rollup_delete AFTER DELETE ON bookings BEGIN {_ROLLUP_REMOVE} END",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_bookings_rollup_update
+        AFTER UPDATE OF asset_id, booking_date, status, total_amount, duration_hours ON bookings
+        BEGIN {_ROLLUP_REMOVE} {_ROLLUP_ADD} END""",
+)
+
+# Per (asset type, time category) running sums for a log-log demand-vs-price fit, so new
+# days of bookings fold in without rereading history (see sportai_elasticity)
+CORE_ELASTICITY = (
+    """
+    CREATE TABLE IF NOT EXISTS price_elasticity (
+        asset_type TEXT NOT NULL,
+        time_category TEXT NOT NULL,
+        observations INTEGER NOT NULL DEFAULT 0,
+        bookings INTEGER NOT NULL DEFAULT 0,
+        hours REAL NOT NULL DEFAULT 0,
+        revenue REAL NOT NULL DEFAULT 0,
+        sum_x REAL NOT NULL DEFAULT 0,
+        sum_y REAL NOT NULL DEFAULT 0,
+        sum_xx REAL NOT NULL DEFAULT 0,
+        sum_xy REAL NOT NULL DEFAULT 0,
+        elasticity REAL,
+        intercept REAL,
+        fitted_through DATE,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (asset_type, time_category)
+    ) WITHOUT ROWID
+    """,
+)
+
+CORE_MIGRATIONS = [
+    Migration(1, "baseline tables", (
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL,
+            name TEXT,
+            email TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS assets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            site_id TEXT NOT NULL,
+            asset_type TEXT NOT NULL,
+            name TEXT NOT NULL,
+            capacity INTEGER,
+            square_footage INTEGER,
+            hourly_rate_prime REAL,
+            hourly_rate_standard REAL,
+            hourly_rate_offpeak REAL,
+            active BOOLEAN DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            asset_id INTEGER,
+            customer_name TEXT NOT NULL,
+            customer_email TEXT,
+            customer_type TEXT,
+            booking_date DATE NOT NULL,
+            start_time TIME NOT NULL,
+            end_time TIME NOT NULL,
+            duration_hours REAL,
+            rate_per_hour REAL,
+            total_amount REAL,
+            status TEXT DEFAULT 'confirmed',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_by TEXT,
+            notes TEXT,
+            FOREIGN KEY (asset_id) REFERENCES assets(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS members (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            member_id TEXT UNIQUE NOT NULL,
+            name TEXT NOT NULL,
+            email TEXT,
+            phone TEXT,
+            tier TEXT,
+            credits_balance REAL DEFAULT 0,
+            join_date DATE,
+            status TEXT DEFAULT 'active',
+            household_id TEXT,
+            notes TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sponsors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            industry TEXT,
+            contact_name TEXT,
+            contact_email TEXT,
+            contact_phone TEXT,
+            status TEXT DEFAULT 'active',
+            tier TEXT,
+            annual_value REAL,
+            contract_start DATE,
+            contract_end DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sponsorship_assets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sponsor_id INTEGER,
+            asset_name TEXT NOT NULL,
+            asset_category TEXT,
+            annual_value REAL,
+            start_date DATE,
+            end_date DATE,
+            status TEXT DEFAULT 'active',
+            FOREIGN KEY (sponsor_id) REFERENCES sponsors(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS contracts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            party_id INTEGER,
+            party_type TEXT,
+            contract_type TEXT,
+            start_date DATE,
+            end_date DATE,
+            annual_value REAL,
+            total_value REAL,
+            status TEXT DEFAULT 'active',
+            document_url TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            transaction_date DATE NOT NULL,
+            transaction_type TEXT,
+            category TEXT,
+            amount REAL NOT NULL,
+            description TEXT,
+            reference_id TEXT,
+            reference_type TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            user_id TEXT,
+            user_role TEXT,
+            action TEXT,
+            details TEXT,
+            ip_address TEXT
+        )
+        """,
+    )),
+    Migration(2, "secondary indexes for report queries", index_steps(CORE_INDEXES)),
+    Migration(3, "daily booking rollup table and maintenance triggers", CORE_ROLLUPS),
+    Migration(4, "price elasticity fit statistics", CORE_ELASTICITY),
+]
+
+# Enterprise schema used by the FastAPI / Streamlit suite (facilities / equipment / events ...)
+ENTERPRISE_INDEXES = {
+    'idx_bookings_date': ('bookings', ('booking_date',)),
+    'idx_bookings_facility_date': ('bookings', ('facility_id', 'booking_date')),
+    'idx_bookings_status_date': ('bookings', ('status', 'booking_date')),
+    'idx_members_status': ('members', ('status',)),
+    'idx_events_start_date': ('events', ('start_date',)),
+    'idx_audit_logs_created_at': ('audit_logs', ('created_at',)),
+}
+
+# Keyset pagination: default sort order of each list endpoint, and its common filter + sort pairs
+ENTERPRISE_LIST_INDEXES = {
+    'idx_facilities_name': ('facilities', ('name',)),
+    'idx_equipment_category_name': ('equipment', ('category', 'name')),
+    'idx_members_name': ('members', ('name',)),
+    'idx_members_status_name': ('members', ('status', 'name')),
+    'idx_sponsors_annual_value': ('sponsors', ('annual_value',)),
+    'idx_bookings_member_date': ('bookings', ('member_id', 'booking_date')),
+}
+
+ENTERPRISE_MIGRATIONS = [
+    Migration(1, "baseline tables", (
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL DEFAULT 'user',
+            full_name TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            last_login TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS facilities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            capacity INTEGER NOT NULL,
+            hourly_rate REAL NOT NULL,
+            utilization REAL DEFAULT 0,
+            revenue REAL DEFAULT 0,
+            status TEXT DEFAULT 'active',
+            location TEXT,
+            equipment TEXT DEFAULT '[]',
+            description TEXT,
+            amenities TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS equipment (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            available INTEGER NOT NULL,
+            rented INTEGER DEFAULT 0,
+            daily_rate REAL NOT NULL,
+            monthly_revenue REAL DEFAULT 0,
+            status TEXT DEFAULT 'available',
+            condition_score REAL DEFAULT 10.0,
+            last_maintenance TIMESTAMP,
+            next_maintenance TIMESTAMP,
+            purchase_date TIMESTAMP,
+            warranty_end TIMESTAMP,
+            supplier TEXT,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS members (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            member_id TEXT UNIQUE NOT NULL,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE,
+            phone TEXT,
+            tier TEXT NOT NULL,
+            join_date TIMESTAMP NOT NULL,
+            total_spent REAL DEFAULT 0,
+            last_visit TIMESTAMP,
+            status TEXT DEFAULT 'active',
+            address TEXT,
+            emergency_contact TEXT,
+            preferences TEXT DEFAULT '{}',
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sponsors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            tier TEXT NOT NULL,
+            annual_value REAL NOT NULL,
+            engagement REAL DEFAULT 0,
+            satisfaction REAL DEFAULT 0,
+            status TEXT DEFAULT 'active',
+            contract_start TIMESTAMP,
+            contract_end TIMESTAMP,
+            contact_name TEXT,
+            contact_email TEXT,
+            contact_phone TEXT,
+            website TEXT,
+            logo_url TEXT,
+            benefits TEXT DEFAULT '[]',
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            start_date TIMESTAMP NOT NULL,
+            end_date TIMESTAMP NOT NULL,
+            facility_id INTEGER,
+            capacity INTEGER,
+            registered INTEGER DEFAULT 0,
+            price REAL DEFAULT 0,
+            status TEXT DEFAULT 'active',
+            description TEXT,
+            organizer TEXT,
+            contact_email TEXT,
+            requirements TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (facility_id) REFERENCES facilities (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            member_id INTEGER NOT NULL,
+            facility_id INTEGER NOT NULL,
+            booking_date DATE NOT NULL,
+            start_time TIME NOT NULL,
+            end_time TIME NOT NULL,
+            total_cost REAL NOT NULL,
+            status TEXT DEFAULT 'confirmed',
+            payment_status TEXT DEFAULT 'pending',
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (member_id) REFERENCES members (id),
+            FOREIGN KEY (facility_id) REFERENCES facilities (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS analytics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE NOT NULL,
+            metric_type TEXT NOT NULL,
+            metric_value REAL NOT NULL,
+            facility_id INTEGER,
+            metadata TEXT DEFAULT '{}',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (facility_id) REFERENCES facilities (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            action TEXT NOT NULL,
+            table_name TEXT,
+            record_id INTEGER,
+            old_values TEXT,
+            new_values TEXT,
+            ip_address TEXT,
+            user_agent TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+        """,
+    )),
+    Migration(2, "secondary indexes for list and report queries", index_steps(ENTERPRISE_INDEXES)),
+    Migration(3, "sort-order indexes for paginated list endpoints", index_steps(ENTERPRISE_LIST_INDEXES)),
+]
+
+SCHEMAS = {'core': CORE_MIGRATIONS, 'enterprise': ENTERPRISE_MIGRATIONS}
+
+# The two schemas define different `bookings` / `members` / `users` tables, so one file can only
+# hold one of them. Each stamps PRAGMA application_id ("SPC" / "SPE"); files migrated before the
+# stamp existed are recognised by a table only their schema creates.
+SCHEMA_IDS = {'core': 0x535043, 'enterprise': 0x535045}
+SCHEMA_MARKERS = {'core': 'assets', 'enterprise': 'facilities'}
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Schema version recorded in the database header (0 for a new database)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def schema_of(conn: sqlite3.Connection) -> Optional[str]:
+    """Schema that owns the database (None for a new one)"""
+    app_id = conn.execute("PRAGMA application_id").fetchone()[0]
+    if app_id:
+        return next((name for name, sid in SCHEMA_IDS.items() if sid == app_id), f"application_id {app_id:#x}")
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    owners = [name for name, marker in SCHEMA_MARKERS.items() if marker in tables]
+    return ' + '.join(owners) or None
+
+def _claim(conn: sqlite3.Connection, schema: str):
+    """Stamp the database as `schema`'s, refusing one that belongs to another schema"""
+    owner = schema_of(conn)
+    if owner not in (None, schema):
+        raise ValueError(f"Database belongs to the {owner} schema; refusing to apply {schema} migrations")
+    conn.execute(f"PRAGMA application_id = {SCHEMA_IDS[schema]}")
+
+def migrate(conn: sqlite3.Connection, migrations: List[Migration], schema: str) -> List[int]:
+    """Apply pending `schema` migrations in order, each in its own transaction; returns the versions applied.
+    
+    The current version lives in PRAGMA user_version, so an up-to-date database costs two
+    header reads and no DDL. Every applied step is also recorded in `schema_version`.
+    Raises ValueError if the database holds a different schema.
+    """
+    latest = migrations[-1].version if migrations else 0
+    stamped = conn.execute("PRAGMA application_id").fetchone()[0] == SCHEMA_IDS[schema]
+    if stamped and current_version(conn) >= latest:
+        return []
+    
+    if not stamped:
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _claim(conn, schema)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if conn.in_transaction:
+            conn.commit()
+        # BEGIN IMMEDIATE serializes concurrent migrators; re-check the version under the lock
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if migration.version <= current_version(conn):
+                conn.rollback()
+                continue
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    applied_at TIMESTAMP
+                )
+            """)
+            if callable(migration.steps):
+                migration.steps(conn)
+            else:
+                for sql in migration.steps:
+                    conn.execute(sql)
+            conn.execute(
+                "INSERT OR REPLACE INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, datetime.now().isoformat(timespec='seconds'))
+            )
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+    
+    if applied:
+        conn.execute("PRAGMA optimize")
+    return applied
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Apply SportAI schema migrations")
+    parser.add_argument("db_path")
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), default="core")
+    parser.add_argument("--status", action="store_true", help="Show the current version without migrating")
+    args = parser.parse_args()
+    
+    conn = sqlite3.connect(args.db_path)
+    migrations = SCHEMAS[args.schema]
+    if args.status:
+        owner = schema_of(conn)
+        if owner not in (None, args.schema):
+            print(f"Database holds the {owner} schema, not {args.schema}")
+        else:
+            print(f"{args.schema} schema at version {current_version(conn)} (latest {migrations[-1].version})")
+    else:
+        applied = migrate(conn, migrations, args.schema)
+        print(f"Applied: {applied}" if applied else f"Schema current at version {current_version(conn)}")
+    conn.close()
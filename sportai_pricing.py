@@ -4,13 +4,27 @@ Intelligent, fair pricing with explainability and guardrails
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, Any, List, Tuple
+import json
 import math
 
+from sportai_availability import load_availability_index
+from sportai_elasticity import load_elasticity, update_elasticity
+from sportai_pricing_engine import (
+    DEMAND_LEVELS, TIME_CATEGORIES, ElasticityTable, asset_key, compile_pricing, load_demand_index, rate_card,
+    price_scenarios, slot_hours
+)
+from sportai_pricing_shadow import load_csv_bookings, load_db_bookings, shadow_replay
+
+# Zone forecasts (forecast_48h.csv) and capacity.csv written by generate_forecast
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+
 def run(context: Dict[str, Any]):
     """Main dynamic pricing execution"""
     
@@ -208,8 +222,11 @@ def show_price_analysis(context: Dict[str, Any]):
     # Price distribution
     st.markdown("#### 📊 Price Distribution by Daypart")
     
-    fig_distribution = create_price_distribution_chart()
-    st.plotly_chart(fig_distribution, use_container_width=True)
+    fig_distribution = create_price_distribution_chart(load_price_fits())
+    if fig_distribution is None:
+        st.info("No booking history has been fitted yet (run `python sportai_elasticity.py`).")
+    else:
+        st.plotly_chart(fig_distribution, use_container_width=True)
     
     # Conversion analysis
     st.markdown("#### 💹 Price Elasticity & Conversion")
@@ -264,6 +281,39 @@ def show_price_analysis(context: Dict[str, Any]):
     )
     
     st.plotly_chart(fig_comp, use_container_width=True)
+    
+    # Rate card (batch priced)
+    st.divider()
+    st.markdown("#### 📅 Rate Card")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        card_days = st.slider("Days Ahead", 7, 90, 90, 7, key="rate_card_days")
+        
+    with col2:
+        card_duration = st.number_input("Duration (hours)", 0.5, 8.0, 1.0, 0.5, key="rate_card_duration")
+    
+    card = rate_card(
+        context['session'].get('config_pricing', {}),
+        context['session'].get('config_guardrails', {}),
+        days=card_days,
+        duration=card_duration,
+        demand_index=load_demand_index(DATA_DIR)
+    )
+    
+    st.dataframe(
+        card.pivot_table(index=['asset_type', 'time_slot'], columns='customer_type',
+                         values='dynamic_rate', aggfunc='mean').round(2),
+        use_container_width=True
+    )
+    
+    st.download_button(
+        "⬇️ Download Rate Card (CSV)",
+        card.to_csv(index=False),
+        file_name=f"rate_card_{datetime.now():%Y%m%d}.csv",
+        mime="text/csv"
+    )
 
 def show_guardrails_config(context: Dict[str, Any]):
     """Configure pricing guardrails and policy rules"""
@@ -469,8 +519,86 @@ def show_pricing_performance(context: Dict[str, Any]):
     st.divider()
     st.markdown("#### 📉 Price Elasticity Analysis")
     
-    fig_elasticity = create_elasticity_chart()
-    st.plotly_chart(fig_elasticity, use_container_width=True)
+    fits = load_price_fits()
+    fitted = fits.dropna(subset=['elasticity'])
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col2:
+        if st.button("🔄 Update Fits", use_container_width=True):
+            from sportai_database import db
+            result = update_elasticity(db)
+            st.success(f"Folded in {result['observations']} daily observations through {result['through']}")
+            fits = load_price_fits()
+            fitted = fits.dropna(subset=['elasticity'])
+    
+    with col1:
+        if fitted.empty:
+            st.info("Not enough booking history for elasticity fits yet.")
+        else:
+            cell = st.selectbox(
+                "Asset / Daypart",
+                list(fitted.index),
+                format_func=lambda i: f"{fitted.loc[i, 'asset_type']} · {fitted.loc[i, 'time_category'].replace('_', ' ')}",
+                key="elasticity_cell"
+            )
+            
+    if not fitted.empty:
+        st.plotly_chart(create_elasticity_chart(fitted.loc[cell]), use_container_width=True)
+        st.caption(f"Elasticity {fitted.loc[cell, 'elasticity']:.2f} from {int(fitted.loc[cell, 'observations'])} days "
+                   f"of bookings through {fitted.loc[cell, 'fitted_through']}")
+    
+    # Shadow mode: replay history through candidate rules before going live
+    st.divider()
+    st.markdown("#### 🧪 Shadow Mode: Candidate Pricing Rules")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        candidate_file = st.file_uploader("Candidate pricing_rules.json", type=['json'], key="shadow_candidate")
+        
+    with col2:
+        history_source = st.radio("Booking History", ["Bookings.csv", "Database"], key="shadow_source")
+    
+    if candidate_file is not None:
+        if history_source == "Database":
+            from sportai_database import db
+            history = load_db_bookings(db)
+        else:
+            history = load_csv_bookings(DATA_DIR / 'Bookings.csv')
+        
+        report = shadow_replay(
+            history,
+            context['session'].get('config_pricing', {}),
+            context['session'].get('config_guardrails', {}),
+            json.load(candidate_file),
+            demand_index=load_demand_index(DATA_DIR),
+            elasticity=ElasticityTable(fitted) if not fitted.empty else None
+        )
+        summary = report['summary']
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Current Rules Revenue", f"${summary['current_revenue']:,.0f}")
+            
+        with col2:
+            st.metric("Candidate Rules Revenue", f"${summary['candidate_revenue']:,.0f}",
+                      f"{summary['revenue_delta_pct']:+.1f}%")
+            
+        with col3:
+            st.metric("Bookings Repriced", f"{summary['bookings_price_up'] + summary['bookings_price_down']:,}",
+                      f"{summary['bookings_price_up']:,} up / {summary['bookings_price_down']:,} down", delta_color="off")
+        
+        if 'candidate_revenue_elastic' in summary:
+            st.caption(f"With fitted demand response: ${summary['candidate_revenue_elastic']:,.0f} "
+                       f"({summary['expected_volume_change_pct']:+.1f}% volume)")
+        
+        st.markdown("**Impact by Segment**")
+        st.dataframe(report['by_segment'], use_container_width=True)
+        
+        st.markdown("**Impact by Asset Type**")
+        st.dataframe(report['by_asset_type'], use_container_width=True)
 
 # Helper functions
 
@@ -485,14 +613,26 @@ def calculate_dynamic_price(
 ) -> Dict[str, Any]:
     """Calculate dynamic price with full explainability"""
     
-    # Get base rate
-    pricing_config = context['session'].get('config_pricing', {})
-    base_rates = pricing_config.get('base_rates', {})
+    # Compiled rule tables (shared across sessions per config version)
+    pricing = compile_pricing(
+        context['session'].get('config_pricing', {}),
+        context['session'].get('config_guardrails', {})
+    )
     
-    asset_key = asset_type.lower().replace(' - ', '_').replace(' ', '_')
-    time_category = 'prime' if 'Prime' in time_slot else 'off_peak' if ('6am' in time_slot or '9pm' in time_slot) else 'standard'
+    # Demand follows the zone forecast where the asset is forecast
+    demand_index = load_demand_index(DATA_DIR)
+    forecast_load = demand_index.slot_load(asset_type, booking_date, time_slot) if demand_index else None
+    if forecast_load is not None:
+        demand_level = DEMAND_LEVELS[pricing.demand_tier(forecast_load)]
+        demand_explanation = f'Forecast load is {forecast_load:.0%} of capacity for this date/time'
+    else:
+        demand_level = calculate_demand_level(booking_date, time_slot)
+        demand_explanation = f'Demand is {demand_level} for this date/time'
     
-    base_rate = base_rates.get(asset_key, {}).get(time_category, 100)
+    base_rate, demand_multiplier, lead_code, lead_discount, segment_multiplier = pricing.lookup(
+        asset_type, time_slot, demand_level, lead_time_days, customer_type
+    )
+    time_category = TIME_CATEGORIES[pricing.time_code(time_slot)]
     
     # Initialize factors list
     factors = [
@@ -502,22 +642,18 @@ def calculate_dynamic_price(
     current_price = base_rate
     
     # Demand adjustment
-    demand_level = calculate_demand_level(booking_date, time_slot)
-    demand_multiplier = pricing_config.get('demand_multipliers', {}).get(demand_level, 1.0)
     demand_impact = current_price * (demand_multiplier - 1)
     
     if demand_impact != 0:
         factors.append({
             'Factor': f'{demand_level.title()} Demand',
             'Impact': demand_impact,
-            'Explanation': f'Demand is {demand_level} for this date/time'
+            'Explanation': demand_explanation
         })
         current_price += demand_impact
     
     # Lead time discount
-    if lead_time_days >= 30:
-        lead_time_key = '90_days' if lead_time_days >= 90 else '60_days' if lead_time_days >= 60 else '30_days'
-        lead_discount = pricing_config.get('lead_time_discounts', {}).get(lead_time_key, 1.0)
+    if lead_code:
         lead_impact = current_price * (lead_discount - 1)
         
         factors.append({
@@ -528,8 +664,6 @@ def calculate_dynamic_price(
         current_price += lead_impact
     
     # Customer segment adjustment
-    segment_key = customer_type.lower().replace('-', '_')
-    segment_multiplier = pricing_config.get('segments', {}).get(segment_key, 1.0)
     segment_impact = base_rate * (segment_multiplier - 1)
     
     if segment_impact != 0:
@@ -541,9 +675,8 @@ def calculate_dynamic_price(
         current_price += segment_impact
     
     # Apply guardrails
-    guardrails = context['session'].get('config_guardrails', {})
     pre_guardrail_price = current_price
-    current_price = apply_guardrails(current_price, base_rate, guardrails)
+    current_price = pricing.clip(current_price, base_rate)
     
     if current_price != pre_guardrail_price:
         factors.append({
@@ -572,7 +705,7 @@ def calculate_dynamic_price(
     }
 
 def calculate_demand_level(booking_date: datetime.date, time_slot: str) -> str:
-    """Calculate demand level based on date and time"""
+    """Calculate demand level based on date and time (fallback when the slot is not forecast)"""
     # Simplified demand calculation
     day_of_week = booking_date.weekday()
     
@@ -601,36 +734,39 @@ def generate_alternative_scenarios(
 ) -> pd.DataFrame:
     """Generate alternative pricing scenarios"""
     
-    scenarios = []
-    
-    # Different time slots
-    for alt_time in ['9am-12pm', '3pm-6pm', '6pm-9pm (Prime)']:
-        if alt_time != time_slot:
-            lead_time_days = (booking_date - datetime.now().date()).days
-            result = calculate_dynamic_price(
-                asset_type, booking_date, alt_time, duration, 
-                customer_type, lead_time_days, context
-            )
-            scenarios.append({
-                'Option': f'{alt_time}',
-                'Price': f"${result['final_price']:.2f}",
-                'Savings': f"${result['final_price'] - calculate_dynamic_price(asset_type, booking_date, time_slot, duration, customer_type, lead_time_days, context)['final_price']:.2f}"
-            })
-    
-    # Different dates
-    for days_ahead in [14, 30, 60]:
-        alt_date = datetime.now().date() + timedelta(days=days_ahead)
-        result = calculate_dynamic_price(
-            asset_type, alt_date, time_slot, duration,
-            customer_type, days_ahead, context
-        )
-        scenarios.append({
-            'Option': f'{alt_date} ({days_ahead} days out)',
-            'Price': f"${result['final_price']:.2f}",
-            'Savings': f"${result['final_price'] - calculate_dynamic_price(asset_type, booking_date, time_slot, duration, customer_type, (booking_date - datetime.now().date()).days, context)['final_price']:.2f}"
-        })
+    pricing_config = context['session'].get('config_pricing', {})
+    scenarios = price_scenarios(
+        asset_type, booking_date, time_slot, duration, customer_type,
+        pricing_config, context['session'].get('config_guardrails', {}),
+        grid=pricing_config.get('scenario_grid'),
+        demand_index=load_demand_index(DATA_DIR)
+    )
+    alternatives = scenarios[scenarios['kind'] != 'baseline']
     
-    return pd.DataFrame(scenarios)
+    return pd.DataFrame({
+        'Option': alternatives['option'],
+        'Price': alternatives['final_price'].map(lambda p: f"${p:.2f}"),
+        'Savings': alternatives['savings'].map(lambda v: f"${v:.2f}"),
+        'Availability': scenario_availability(alternatives)
+    })
+
+def scenario_availability(scenarios: pd.DataFrame) -> List[str]:
+    """Free assets of the scenario's type for each option, from the shared availability index"""
+    from sportai_database import db
+    
+    index = load_availability_index(db)
+    labels = []
+    for row in scenarios.itertuples(index=False):
+        assets = [name for name, kind in index.asset_types.items() if asset_key(row.asset_type).startswith(kind)]
+        hours = slot_hours(row.time_slot)
+        if not assets or not hours:
+            labels.append("—")
+            continue
+        start = pd.Timestamp(row.booking_date).normalize() + pd.Timedelta(hours=hours[0])
+        end = start + pd.Timedelta(hours=float(row.duration))
+        free = sum(index.is_free(asset, start, end) for asset in assets)
+        labels.append(f"{free}/{len(assets)} free" if free else "Booked")
+    return labels
 
 def create_price_trend_chart(asset_filter: str, metric_type: str):
     """Create price trend chart"""
@@ -655,29 +791,36 @@ def create_price_trend_chart(asset_filter: str, metric_type: str):
     
     return fig
 
-def create_price_distribution_chart():
-    """Create price distribution by daypart"""
-    data = {
-        'Daypart': ['6am-9am', '9am-12pm', '12pm-3pm', '3pm-6pm', '6pm-9pm', '9pm-12am'],
-        'Avg Price': [85, 110, 120, 130, 145, 95],
-        'Count': [45, 78, 65, 82, 125, 38]
-    }
+def load_price_fits() -> pd.DataFrame:
+    """Elasticity fits and price/volume totals from the bookings database"""
+    from sportai_database import db
+    return load_elasticity(db)
+
+def create_price_distribution_chart(fits: pd.DataFrame):
+    """Create price distribution by daypart from fitted booking history (None without history)"""
+    df = fits.groupby('time_category').agg(
+        revenue=('revenue', 'sum'), hours=('hours', 'sum'), bookings=('bookings', 'sum')
+    ).reindex(list(TIME_CATEGORIES)).dropna()
+    
+    if df.empty:
+        return None
     
-    df = pd.DataFrame(data)
+    df['avg_price'] = df['revenue'] / df['hours']
+    dayparts = [category.replace('_', ' ').title() for category in df.index]
     
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        x=df['Daypart'],
-        y=df['Avg Price'],
-        name='Avg Price',
+        x=dayparts,
+        y=df['avg_price'],
+        name='Avg Price / Hour',
         marker_color='#3b82f6',
         yaxis='y'
     ))
     
     fig.add_trace(go.Scatter(
-        x=df['Daypart'],
-        y=df['Count'],
+        x=dayparts,
+        y=df['bookings'],
         name='Bookings',
         mode='lines+markers',
         marker=dict(size=10, color='#10b981'),
@@ -686,17 +829,17 @@ def create_price_distribution_chart():
     
     fig.update_layout(
         height=400,
-        yaxis=dict(title='Average Price ($)'),
+        yaxis=dict(title='Average Price per Hour ($)'),
         yaxis2=dict(title='Number of Bookings', overlaying='y', side='right'),
         hovermode='x unified'
     )
     
     return fig
 
-def create_elasticity_chart():
-    """Create price elasticity chart"""
-    prices = list(range(80, 181, 10))
-    demand = [120 - (p - 80) * 0.6 for p in prices]
+def create_elasticity_chart(fit: pd.Series):
+    """Create fitted demand curve for one asset type / daypart"""
+    prices = np.linspace(0.5, 1.5, 21) * fit['avg_price']
+    demand = np.exp(fit['intercept']) * prices ** fit['elasticity']
     
     fig = go.Figure()
     
@@ -709,8 +852,8 @@ def create_elasticity_chart():
         marker=dict(size=8)
     ))
     
-    # Add optimal point
-    optimal_idx = demand.index(max([p * d for p, d in zip(prices, demand)]))
+    # Revenue-maximizing point within the plotted range
+    optimal_idx = int(np.argmax(prices * demand))
     fig.add_trace(go.Scatter(
         x=[prices[optimal_idx]],
         y=[demand[optimal_idx]],
@@ -719,10 +862,12 @@ def create_elasticity_chart():
         marker=dict(size=15, color='#10b981', symbol='star')
     ))
     
+    fig.add_vline(x=fit['avg_price'], line_dash='dash', line_color='#6b7280', annotation_text='Current avg')
+    
     fig.update_layout(
         height=400,
         xaxis_title="Price per Hour ($)",
-        yaxis_title="Expected Bookings per Week",
+        yaxis_title="Expected Booked Hours per Day",
         hovermode='x unified'
     )
     
@@ -0,0 +1,476 @@
+"""
+SportAI Pricing Engine
+Vectorized batch pricing for rate cards, scenarios and simulations
+"""
+
+import bisect
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ASSET_TYPES = ["Turf - Full Field", "Turf - Half Field", "Court", "Golf Bay", "Suite"]
+TIME_SLOTS = ["6am-9am", "9am-12pm", "12pm-3pm", "3pm-6pm", "6pm-9pm (Prime)", "9pm-12am"]
+CUSTOMER_TYPES = ["Corporate", "Regular", "Non-Profit", "Youth"]
+
+REQUEST_COLUMNS = ('asset_type', 'booking_date', 'time_slot', 'duration', 'customer_type')
+TIME_CATEGORIES = ('prime', 'standard', 'off_peak')
+DEMAND_LEVELS = ('high', 'medium', 'low')
+LEAD_TIME_BUCKETS = ((30, '30_days'), (60, '60_days'), (90, '90_days'))
+DEFAULT_BASE_RATE = 100
+COMPILED_CACHE_SIZE = 16
+
+# Forecast load (forecast / capacity) at or above each threshold; override with "demand_tiers"
+DEFAULT_DEMAND_TIERS = {'high': 0.8, 'medium': 0.4}
+# capacity.csv layouts serving each asset type (suites are not forecast)
+ASSET_LAYOUTS = {
+    "Turf - Full Field": "full_turf",
+    "Turf - Half Field": "half_turf",
+    "Court": "court",
+    "Golf Bay": "sim_bay",
+}
+DEMAND_INDEX_CHECK_SECONDS = 30.0
+# A forecast whose first hour is older than this is stale (run_all rewrites it daily) and ignored
+DEMAND_FORECAST_MAX_AGE = pd.Timedelta(hours=24)
+
+# Alternatives offered next to a quote; override with pricing_rules.json "scenario_grid"
+DEFAULT_SCENARIO_GRID = {
+    'time_slots': ('9am-12pm', '3pm-6pm', '6pm-9pm (Prime)'),
+    'days_ahead': (14, 30, 60),
+    'durations': (),
+}
+SCENARIO_CACHE_SIZE = 512
+_scenario_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_scenario_lock = threading.Lock()
+_compiled_cache: "OrderedDict[str, CompiledPricing]" = OrderedDict()
+_compiled_lock = threading.Lock()
+_demand_indexes: Dict[str, tuple] = {}
+_demand_indexes_lock = threading.Lock()
+
+def config_version(pricing_config: Dict, guardrails: Dict) -> str:
+    """Short content hash identifying a pricing + guardrails configuration"""
+    payload = json.dumps([pricing_config, guardrails], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+def asset_key(asset_type: str) -> str:
+    """Config key for an asset label ("Turf - Half Field" -> "turf_half_field")"""
+    return asset_type.lower().replace(' - ', '_').replace(' ', '_')
+
+def time_category(time_slot: str) -> str:
+    """prime / off_peak / standard for a time slot label"""
+    if 'Prime' in time_slot:
+        return 'prime'
+    return 'off_peak' if ('6am' in time_slot or '9pm' in time_slot) else 'standard'
+
+def segment_key(customer_type: str) -> str:
+    """Config key for a customer type label ("Non-Profit" -> "non_profit")"""
+    return customer_type.lower().replace('-', '_')
+
+def as_datetimes(values: pd.Series) -> pd.Series:
+    """Datetime series, skipping the (slow) parse when the column is already datetime64"""
+    return values if pd.api.types.is_datetime64_any_dtype(values) else pd.to_datetime(values)
+
+def slot_hours(time_slot: str) -> Tuple[int, ...]:
+    """Hours of day covered by a slot label ("6pm-9pm (Prime)" -> (18, 19, 20))"""
+    match = re.match(r'\s*(\d{1,2})(am|pm)\s*-\s*(\d{1,2})(am|pm)', time_slot)
+    if not match:
+        return ()
+    start = int(match[1]) % 12 + (12 if match[2] == 'pm' else 0)
+    end = int(match[3]) % 12 + (12 if match[4] == 'pm' else 0)
+    if end <= start:
+        end += 24
+    return tuple(hour % 24 for hour in range(start, end))
+
+class DemandIndex:
+    """Forecast load (forecast / capacity) per zone and hour, precomputed for pricing lookups
+
+    `load` holds every forecast hour from `start`; `profile` is the mean load per hour of day
+    and fills hours missing inside the horizon. A slot's load is the mean over the zones of its
+    asset type's layout and the hours the slot covers. Slots outside the horizon are not
+    forecast, so callers fall back to the weekday/prime demand rule for them.
+    """
+
+    def __init__(self, forecast: pd.DataFrame, capacity: pd.DataFrame, version: str = '', cache_size: int = 4096):
+        self.version = version
+        capacity = capacity.drop_duplicates('zone_id').set_index('zone_id')
+        forecast = forecast[forecast['zone_id'].isin(capacity.index)]
+        ts = pd.to_datetime(forecast['ts']).dt.floor('h')
+
+        self.zones = {zone: code for code, zone in enumerate(sorted(forecast['zone_id'].unique()))}
+        self.layouts = {
+            layout: np.array([self.zones[z] for z in group.index if z in self.zones], dtype=np.intp)
+            for layout, group in capacity.groupby('layout')
+        }
+        self.start = ts.min() if len(ts) else pd.Timestamp(0)
+        hours = int((ts.max() - self.start) / pd.Timedelta(hours=1)) + 1 if len(ts) else 0
+
+        zone_codes = forecast['zone_id'].map(self.zones).to_numpy()
+        ratio = (forecast['forecast'].clip(lower=0) / forecast['zone_id'].map(capacity['max_slots_per_hour'])).to_numpy()
+        profile = pd.DataFrame({'zone': zone_codes, 'hour': ts.dt.hour.to_numpy(), 'ratio': ratio}) \
+            .groupby(['zone', 'hour'])['ratio'].mean().unstack().reindex(index=range(len(self.zones)), columns=range(24))
+        self.profile = profile.T.fillna(profile.mean(axis=1)).T.to_numpy()
+
+        # Hours missing from the forecast fall back to the hour-of-day profile
+        self.load = self.profile[:, (self.start.hour + np.arange(hours)) % 24].copy()
+        self.load[zone_codes, ((ts - self.start) / pd.Timedelta(hours=1)).to_numpy(dtype=int)] = ratio
+        self._cached = lru_cache(maxsize=cache_size)(self._slot_load)
+
+    @classmethod
+    def from_files(cls, forecast_path: Path, capacity_path: Path, version: str = '') -> 'DemandIndex':
+        return cls(pd.read_csv(forecast_path), pd.read_csv(capacity_path), version)
+
+    def _offsets(self, days: np.ndarray, hours: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """Hour offsets into `load` for (day offset x slot hour), and whether each row is in range"""
+        offsets = days[:, None] * 24 + (np.array(hours) - self.start.hour)[None, :]
+        # Slots running past midnight continue into the next day
+        offsets += np.where(np.array(hours) < hours[0], 24, 0)[None, :]
+        in_range = ((offsets >= 0) & (offsets < self.load.shape[1])).all(axis=1)
+        return offsets.clip(0, max(self.load.shape[1] - 1, 0)), in_range
+
+    def slot_loads(self, asset_types: pd.Series, booking_dates: pd.Series, time_slots: pd.Series) -> np.ndarray:
+        """Forecast load per request row; NaN where the asset type or slot is not forecast"""
+        out = np.full(len(asset_types), np.nan)
+        days = ((as_datetimes(booking_dates).dt.normalize() - self.start.normalize()) // pd.Timedelta(days=1)).to_numpy()
+        asset_codes, assets = pd.factorize(asset_types)
+        slot_codes, slots = pd.factorize(time_slots)
+        pair_codes = asset_codes * len(slots) + slot_codes
+        for pair in np.unique(pair_codes):
+            rows = np.flatnonzero(pair_codes == pair)
+            asset_type, time_slot = assets[pair // len(slots)], slots[pair % len(slots)]
+            zones = self.layouts.get(ASSET_LAYOUTS.get(asset_type))
+            hours = slot_hours(time_slot)
+            if zones is None or not len(zones) or not hours:
+                continue
+            offsets, in_range = self._offsets(days[rows], hours)
+            if self.load.shape[1]:
+                out[rows] = np.where(in_range, self.load[zones][:, offsets].mean(axis=(0, 2)), np.nan)
+        return out
+
+    def slot_load(self, asset_type: str, booking_date: date, time_slot: str) -> Optional[float]:
+        """Forecast load for one slot, or None when it is not forecast (memoized)"""
+        return self._cached(asset_type, booking_date, time_slot)
+
+    def _slot_load(self, asset_type: str, booking_date: date, time_slot: str) -> Optional[float]:
+        load = self.slot_loads(pd.Series([asset_type]), pd.Series([pd.Timestamp(booking_date)]), pd.Series([time_slot]))[0]
+        return None if np.isnan(load) else float(load)
+
+def load_demand_index(data_dir) -> Optional[DemandIndex]:
+    """Process-wide DemandIndex for a data directory, or None without forecast/capacity files
+
+    Rebuilt when either file changes; the files are checked at most every
+    DEMAND_INDEX_CHECK_SECONDS, so pricing calls do no I/O. A stale forecast (older than
+    DEMAND_FORECAST_MAX_AGE) counts as absent.
+    """
+    key = str(data_dir)
+    now = time.monotonic()
+    entry = _demand_indexes.get(key)
+    if entry is not None and now - entry[0] < DEMAND_INDEX_CHECK_SECONDS:
+        return _current(entry[2])
+    with _demand_indexes_lock:
+        paths = (Path(data_dir) / 'forecast_48h.csv', Path(data_dir) / 'capacity.csv')
+        version = ':'.join(str(p.stat().st_mtime_ns) for p in paths) if all(p.exists() for p in paths) else None
+        if version is None:
+            index = None
+        elif entry is not None and entry[1] == version:
+            index = entry[2]
+        else:
+            index = DemandIndex.from_files(*paths, version=version)
+        _demand_indexes[key] = (now, version, index)
+        return _current(index)
+
+def _current(index: Optional[DemandIndex]) -> Optional[DemandIndex]:
+    if index is None or index.start < pd.Timestamp.now().floor('h') - DEMAND_FORECAST_MAX_AGE:
+        return None
+    return index
+
+class CompiledPricing:
+    """Pricing rules flattened into dense lookup tables
+
+    Assets and segments are integer-encoded in config order, with one extra code for labels
+    the config does not know (default base rate / no segment adjustment). Lead-time code 0
+    means no discount; codes 1.. follow LEAD_TIME_BUCKETS.
+    """
+
+    def __init__(self, pricing_config: Dict, guardrails: Dict, version: str):
+        self.version = version
+        base_rates = pricing_config.get('base_rates', {})
+        demand_multipliers = pricing_config.get('demand_multipliers', {})
+        lead_discounts = pricing_config.get('lead_time_discounts', {})
+        segments = pricing_config.get('segments', {})
+
+        self.assets = {key: code for code, key in enumerate(base_rates)}
+        self.base_rates = np.array(
+            [[rates.get(category, DEFAULT_BASE_RATE) for category in TIME_CATEGORIES] for rates in base_rates.values()]
+            + [[DEFAULT_BASE_RATE] * len(TIME_CATEGORIES)],
+            dtype=float
+        )
+        self.demand_multipliers = np.array([demand_multipliers.get(level, 1.0) for level in DEMAND_LEVELS], dtype=float)
+        self._lead_days = [days for days, _ in LEAD_TIME_BUCKETS]
+        self.lead_thresholds = np.array(self._lead_days)
+        self.lead_multipliers = np.array([1.0] + [lead_discounts.get(key, 1.0) for _, key in LEAD_TIME_BUCKETS], dtype=float)
+        self.segments = {key: code for code, key in enumerate(segments)}
+        self.segment_multipliers = np.array(list(segments.values()) + [1.0], dtype=float)
+        self.max_change = guardrails.get('max_price_change_percent', 25) / 100
+        tiers = {**DEFAULT_DEMAND_TIERS, **pricing_config.get('demand_tiers', {})}
+        self.demand_tiers = (tiers['high'], tiers['medium'])
+
+        # Plain-list mirrors and label memos for the one-quote-at-a-time path
+        self._rows = (self.base_rates.tolist(), self.demand_multipliers.tolist(),
+                      self.lead_multipliers.tolist(), self.segment_multipliers.tolist())
+        self._codes: Dict[tuple, int] = {}
+
+    def _code(self, kind: str, label: str, resolve) -> int:
+        code = self._codes.get((kind, label))
+        if code is None:
+            code = self._codes[(kind, label)] = resolve(label)
+        return code
+
+    def asset_code(self, asset_type: str) -> int:
+        return self._code('asset', asset_type, lambda a: self.assets.get(asset_key(a), len(self.assets)))
+
+    def time_code(self, time_slot: str) -> int:
+        return self._code('time', time_slot, lambda t: TIME_CATEGORIES.index(time_category(t)))
+
+    def segment_code(self, customer_type: str) -> int:
+        return self._code('segment', customer_type, lambda c: self.segments.get(segment_key(c), len(self.segments)))
+
+    def lookup(self, asset_type: str, time_slot: str, demand_level: str, lead_days: int,
+               customer_type: str) -> Tuple[float, float, int, float, float]:
+        """Scalar gather: base rate, demand multiplier, lead bucket and multiplier, segment multiplier"""
+        base_rates, demand, lead, segments = self._rows
+        lead_code = bisect.bisect_right(self._lead_days, lead_days)
+        return (base_rates[self.asset_code(asset_type)][self.time_code(time_slot)],
+                demand[DEMAND_LEVELS.index(demand_level)], lead_code, lead[lead_code],
+                segments[self.segment_code(customer_type)])
+
+    def lead_code(self, lead_days):
+        """Lead-time bucket for an array of day counts"""
+        return np.searchsorted(self.lead_thresholds, lead_days, side='right')
+
+    def encode(self, labels: pd.Series, encoder) -> np.ndarray:
+        """Integer codes for a label column, resolving each distinct label once"""
+        codes, uniques = pd.factorize(labels)
+        return np.array([encoder(label) for label in uniques], dtype=np.intp)[codes]
+
+    def demand_tier(self, load):
+        """Demand level code (index into DEMAND_LEVELS) for a forecast load, scalar or array"""
+        high, medium = self.demand_tiers
+        return (load < high) * 1 + (load < medium) * 1
+
+    def clip(self, price, base_rate):
+        """Apply the max price change guardrail around the base rate"""
+        if isinstance(price, float):
+            return max(base_rate * (1 - self.max_change), min(base_rate * (1 + self.max_change), price))
+        return np.clip(price, base_rate * (1 - self.max_change), base_rate * (1 + self.max_change))
+
+class ElasticityTable:
+    """Fitted price elasticities (see sportai_elasticity) as a dense (asset x time category) array
+
+    Cells without a trusted fit, and assets that were never fitted, are NaN.
+    """
+
+    def __init__(self, fits: pd.DataFrame):
+        keys = fits['asset_type'].map(asset_key)
+        self.assets = {key: code for code, key in enumerate(dict.fromkeys(keys))}
+        self.coefficients = np.full((len(self.assets) + 1, len(TIME_CATEGORIES)), np.nan)
+        for key, category, elasticity in zip(keys, fits['time_category'], fits['elasticity']):
+            if category in TIME_CATEGORIES:
+                self.coefficients[self.assets[key], TIME_CATEGORIES.index(category)] = elasticity
+
+    def asset_code(self, asset_type: str) -> int:
+        return self.assets.get(asset_key(asset_type), len(self.assets))
+
+    def volume_ratio(self, new_price, old_price, elasticity):
+        """Expected demand at new_price relative to old_price (1 where there is no fit)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = (new_price / old_price) ** elasticity
+        return np.where(np.isfinite(ratio), ratio, 1.0)
+
+def compile_pricing(pricing_config: Dict, guardrails: Dict) -> CompiledPricing:
+    """Compiled tables for a configuration, shared process-wide by config version
+
+    Keyed by the content hash, so a config dict edited in place compiles afresh.
+    """
+    version = config_version(pricing_config, guardrails)
+    with _compiled_lock:
+        compiled = _compiled_cache.get(version)
+        if compiled is None:
+            compiled = _compiled_cache[version] = CompiledPricing(pricing_config, guardrails, version)
+            while len(_compiled_cache) > COMPILED_CACHE_SIZE:
+                _compiled_cache.popitem(last=False)
+        else:
+            _compiled_cache.move_to_end(version)
+    return compiled
+
+def price_batch(
+    requests: pd.DataFrame,
+    pricing_config: Dict,
+    guardrails: Dict,
+    today: Optional[date] = None,
+    factors: bool = False,
+    demand_index: Optional[DemandIndex] = None,
+    elasticity: Optional[ElasticityTable] = None
+) -> pd.DataFrame:
+    """Price many slots at once with the same rules as calculate_dynamic_price
+
+    `requests` needs asset_type, booking_date, time_slot, duration and customer_type columns;
+    lead_time_days is derived from `today` when absent. Labels are resolved once per distinct
+    value, so the per-row work is array indexing and arithmetic. With `factors`, the impact of
+    each adjustment is returned alongside the price. With a `demand_index`, demand follows the
+    forecast load wherever the slot is forecast (see `forecast_load` in the result). With an
+    `elasticity` table, each row's fitted elasticity is returned as `elasticity`.
+    """
+    missing = [col for col in REQUEST_COLUMNS if col not in requests.columns]
+    if missing:
+        raise ValueError(f"Pricing requests are missing columns: {missing}")
+
+    pricing = compile_pricing(pricing_config, guardrails)
+    time_codes = pricing.encode(requests['time_slot'], pricing.time_code)
+    base_rate = pricing.base_rates[pricing.encode(requests['asset_type'], pricing.asset_code), time_codes]
+
+    # Demand: weekend -> high, prime slot -> medium, otherwise low
+    booking_dates = as_datetimes(requests['booking_date'])
+    weekend = booking_dates.dt.dayofweek.to_numpy() >= 5
+    prime = pricing.encode(requests['time_slot'], lambda slot: 'Prime' in slot).astype(bool)
+    demand_codes = np.where(weekend, 0, np.where(prime, 1, 2))
+    if demand_index is not None:
+        forecast_load = demand_index.slot_loads(requests['asset_type'], booking_dates, requests['time_slot'])
+        demand_codes = np.where(np.isnan(forecast_load), demand_codes, pricing.demand_tier(np.nan_to_num(forecast_load)))
+    demand_price = base_rate * pricing.demand_multipliers[demand_codes]
+
+    # Lead time discount
+    if 'lead_time_days' in requests.columns:
+        lead_days = requests['lead_time_days'].to_numpy()
+    else:
+        today = pd.Timestamp(today or datetime.now().date())
+        lead_days = (booking_dates.dt.normalize() - today).dt.days.to_numpy()
+    lead_price = demand_price * pricing.lead_multipliers[pricing.lead_code(lead_days)]
+
+    # Segment adjustment is applied to the base rate
+    segment_multiplier = pricing.segment_multipliers[pricing.encode(requests['customer_type'], pricing.segment_code)]
+    segment_impact = base_rate * (segment_multiplier - 1)
+    pre_guardrail = lead_price + segment_impact
+    dynamic_rate = pricing.clip(pre_guardrail, base_rate)
+
+    result = pd.DataFrame({
+        'base_rate': base_rate,
+        'demand_level': pd.Categorical.from_codes(demand_codes, DEMAND_LEVELS),
+        'dynamic_rate': dynamic_rate,
+        'final_price': dynamic_rate * requests['duration'].to_numpy(dtype=float),
+        'adjustment_pct': (dynamic_rate - base_rate) / base_rate * 100
+    }, index=requests.index)
+
+    if demand_index is not None:
+        result['forecast_load'] = forecast_load
+    if elasticity is not None:
+        result['elasticity'] = elasticity.coefficients[pricing.encode(requests['asset_type'], elasticity.asset_code), time_codes]
+
+    if factors:
+        result['demand_impact'] = demand_price - base_rate
+        result['lead_time_impact'] = lead_price - demand_price
+        result['segment_impact'] = segment_impact
+        result['guardrail_impact'] = dynamic_rate - pre_guardrail
+
+    return result
+
+def rate_card(
+    pricing_config: Dict,
+    guardrails: Dict,
+    start: Optional[date] = None,
+    days: int = 90,
+    asset_types: Iterable[str] = ASSET_TYPES,
+    time_slots: Iterable[str] = TIME_SLOTS,
+    customer_types: Iterable[str] = CUSTOMER_TYPES,
+    duration: float = 1.0,
+    today: Optional[date] = None,
+    demand_index: Optional[DemandIndex] = None
+) -> pd.DataFrame:
+    """Price every (date, asset, slot, customer type) for `days` days from `start`"""
+    today = today or datetime.now().date()
+    start = start or today
+    grid = pd.MultiIndex.from_product(
+        [pd.date_range(start, periods=days, freq='D'), list(asset_types), list(time_slots), list(customer_types)],
+        names=['booking_date', 'asset_type', 'time_slot', 'customer_type']
+    ).to_frame(index=False)
+    grid['duration'] = duration
+    return pd.concat([grid, price_batch(grid, pricing_config, guardrails, today=today, demand_index=demand_index)], axis=1)
+
+def price_scenarios(
+    asset_type: str,
+    booking_date: date,
+    time_slot: str,
+    duration: float,
+    customer_type: str,
+    pricing_config: Dict,
+    guardrails: Dict,
+    today: Optional[date] = None,
+    grid: Optional[Dict] = None,
+    demand_index: Optional[DemandIndex] = None
+) -> pd.DataFrame:
+    """Baseline quote plus alternative slots, dates and durations, priced in one batch
+
+    Row 0 is the baseline; `savings` is each option's price minus the baseline. Results are
+    cached per request and config version, so repeated renders of the same quote are free.
+    """
+    today = today or datetime.now().date()
+    grid = {**DEFAULT_SCENARIO_GRID, **(grid or {})}
+    key = (compile_pricing(pricing_config, guardrails).version, demand_index.version if demand_index else None,
+           asset_type, booking_date, time_slot, float(duration), customer_type, today,
+           tuple((k, tuple(v)) for k, v in sorted(grid.items())))
+    with _scenario_lock:
+        cached = _scenario_cache.get(key)
+        if cached is not None:
+            _scenario_cache.move_to_end(key)
+    if cached is not None:
+        return cached.copy()
+
+    rows = [('baseline', 'Current selection', booking_date, time_slot, duration)]
+    rows += [('time_slot', slot, booking_date, slot, duration) for slot in grid['time_slots'] if slot != time_slot]
+    for days_ahead in grid['days_ahead']:
+        alt_date = today + timedelta(days=days_ahead)
+        rows.append(('date', f'{alt_date} ({days_ahead} days out)', alt_date, time_slot, duration))
+    rows += [('duration', f'{hours:g} hours', booking_date, time_slot, hours) for hours in grid['durations'] if hours != duration]
+
+    scenarios = pd.DataFrame(rows, columns=['kind', 'option', 'booking_date', 'time_slot', 'duration'])
+    scenarios['asset_type'] = asset_type
+    scenarios['customer_type'] = customer_type
+    priced = price_batch(scenarios, pricing_config, guardrails, today=today, demand_index=demand_index)
+    scenarios['dynamic_rate'] = priced['dynamic_rate']
+    scenarios['final_price'] = priced['final_price']
+    scenarios['savings'] = scenarios['final_price'] - scenarios['final_price'].iloc[0]
+
+    with _scenario_lock:
+        _scenario_cache[key] = scenarios
+        while len(_scenario_cache) > SCENARIO_CACHE_SIZE:
+            _scenario_cache.popitem(last=False)
+    return scenarios.copy()
+
+if __name__ == "__main__":
+
+    config_path = Path(__file__).parent / 'config'
+    pricing = json.loads((config_path / 'pricing_rules.json').read_text()) if (config_path / 'pricing_rules.json').exists() else {}
+    guard = json.loads((config_path / 'guardrails.json').read_text()) if (config_path / 'guardrails.json').exists() else {}
+
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    today = datetime.now().date()
+    requests = pd.DataFrame({
+        'asset_type': rng.choice(ASSET_TYPES, n),
+        'booking_date': pd.Timestamp(today) + pd.to_timedelta(rng.integers(0, 120, n), unit='D'),
+        'time_slot': rng.choice(TIME_SLOTS, n),
+        'duration': rng.choice([1.0, 1.5, 2.0, 3.0], n),
+        'customer_type': rng.choice(CUSTOMER_TYPES, n)
+    })
+    start = time.perf_counter()
+    priced = price_batch(requests, pricing, guard, today=today, factors=True)
+    print(f"Priced {n:,} slots in {time.perf_counter() - start:.2f}s")
+    print(priced.describe().round(2))
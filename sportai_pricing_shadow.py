@@ -0,0 +1,228 @@
+"""
+SportAI Pricing Shadow Mode
+Replay historical bookings through current and candidate pricing configs
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from revpah_loader import _usd_from_cash_and_credits, load_credit_values
+from sportai_pricing_engine import TIME_SLOTS, DemandIndex, ElasticityTable, price_batch
+
+SHADOW_COLUMNS = ('asset_type', 'booking_date', 'time_slot', 'duration', 'customer_type', 'lead_time_days', 'revenue')
+SHADOW_PARTITION = 'M'
+SHADOW_WORKERS = 4
+# Label columns are stored as categoricals so each partition encodes them without string hashing
+LABEL_COLUMNS = ('asset_type', 'time_slot', 'customer_type')
+
+# Bookings.csv asset names -> pricing asset types (matched on the lowercased name prefix)
+CSV_ASSET_TYPES = (
+    ('halfturf', 'Turf - Half Field'),
+    ('fullturf', 'Turf - Full Field'),
+    ('court', 'Court'),
+    ('golf', 'Golf Bay'),
+    ('sim', 'Golf Bay'),
+    ('suite', 'Suite'),
+)
+CANCELLED_STATUSES = ('cancelled', 'canceled')
+
+# Start hour -> time slot label; hours before 6am price as the late off-peak slot
+HOUR_SLOTS = np.array([TIME_SLOTS[(hour - 6) // 3] if hour >= 6 else TIME_SLOTS[-1] for hour in range(24)], dtype=object)
+
+def _with_categories(bookings: pd.DataFrame) -> pd.DataFrame:
+    return bookings.astype({col: 'category' for col in LABEL_COLUMNS})
+
+def _csv_asset_type(asset: str) -> Optional[str]:
+    name = str(asset).lower()
+    return next((asset_type for prefix, asset_type in CSV_ASSET_TYPES if name.startswith(prefix)), None)
+
+def load_csv_bookings(path, start_date: str = None, end_date: str = None,
+                      credit_value_by_tier: Optional[Dict] = None) -> pd.DataFrame:
+    """Bookings.csv in replay form (segment = member tier, lead time unknown -> 0)
+
+    Revenue values credits per member tier exactly as the RevPAH KPIs do, using the
+    Membership.csv next to the file unless `credit_value_by_tier` is given.
+    """
+    raw = pd.read_csv(path, parse_dates=['start', 'end'])
+    if 'status' in raw:
+        raw = raw[~raw['status'].str.lower().isin(CANCELLED_STATUSES)]
+    if start_date:
+        raw = raw[raw['start'].dt.normalize() >= pd.Timestamp(start_date)]
+    if end_date:
+        raw = raw[raw['start'].dt.normalize() <= pd.Timestamp(end_date)]
+    assets = raw['asset'].drop_duplicates()
+    segment_column = next((col for col in ('customer_type', 'member_tier') if col in raw), None)
+    return _with_categories(pd.DataFrame({
+        'booking_id': raw['booking_id'] if 'booking_id' in raw else raw.index,
+        'asset_type': raw['asset'].map(dict(zip(assets, assets.map(_csv_asset_type)))),
+        'booking_date': raw['start'].dt.normalize(),
+        'time_slot': HOUR_SLOTS[raw['start'].dt.hour.to_numpy()],
+        'duration': (raw['end'] - raw['start']).dt.total_seconds() / 3600.0,
+        'customer_type': raw[segment_column].fillna('Regular') if segment_column else 'Regular',
+        'lead_time_days': 0,
+        'revenue': _usd_from_cash_and_credits(raw, credit_value_by_tier or load_credit_values(Path(path).parent))
+    }).dropna(subset=['asset_type']).reset_index(drop=True))
+
+def load_db_bookings(manager, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+    """DB bookings joined to their asset type, in replay form (lead time from created_at)"""
+    query = """
+        SELECT b.id AS booking_id, a.asset_type, b.booking_date,
+               CAST(substr(b.start_time, 1, 2) AS INTEGER) AS start_hour, b.duration_hours, b.customer_type,
+               CAST(julianday(b.booking_date) - julianday(date(b.created_at)) AS INTEGER) AS lead_time_days,
+               b.total_amount
+        FROM bookings b JOIN assets a ON a.id = b.asset_id
+        WHERE b.status NOT IN ('cancelled', 'canceled')
+    """
+    params = []
+    if start_date:
+        query += " AND b.booking_date >= ?"
+        params.append(start_date)
+    if end_date:
+        query += " AND b.booking_date <= ?"
+        params.append(end_date)
+
+    with manager.connection() as conn:
+        raw = pd.read_sql_query(query, conn, params=params)
+
+    return _with_categories(pd.DataFrame({
+        'booking_id': raw['booking_id'],
+        'asset_type': raw['asset_type'],
+        'booking_date': pd.to_datetime(raw['booking_date']),
+        'time_slot': HOUR_SLOTS[raw['start_hour'].fillna(0).astype(int).clip(0, 23).to_numpy()],
+        'duration': raw['duration_hours'].fillna(1.0).astype(float),
+        'customer_type': raw['customer_type'].fillna('Regular'),
+        'lead_time_days': raw['lead_time_days'].fillna(0).clip(lower=0).astype(int),
+        'revenue': raw['total_amount'].fillna(0.0).astype(float)
+    }))
+
+def _replay_partition(bookings: pd.DataFrame, current: tuple, candidate: tuple,
+                      demand_index: Optional[DemandIndex], elasticity: Optional[ElasticityTable]) -> pd.DataFrame:
+    out = bookings.copy()
+    priced = price_batch(bookings, *current, demand_index=demand_index, elasticity=elasticity)
+    out['current_price'] = priced['final_price']
+    out['candidate_price'] = price_batch(bookings, *candidate, demand_index=demand_index)['final_price']
+    if elasticity is not None:
+        # Fitted demand response to the price change, per booking
+        out['candidate_volume'] = elasticity.volume_ratio(out['candidate_price'], out['current_price'], priced['elasticity'])
+        out['candidate_revenue_elastic'] = out['candidate_price'] * out['candidate_volume']
+    return out
+
+def _impact(priced: pd.DataFrame, by: str) -> pd.DataFrame:
+    columns = {
+        'bookings': ('current_price', 'size'),
+        'actual_revenue': ('revenue', 'sum'),
+        'current_revenue': ('current_price', 'sum'),
+        'candidate_revenue': ('candidate_price', 'sum')
+    }
+    if 'candidate_revenue_elastic' in priced:
+        columns['candidate_revenue_elastic'] = ('candidate_revenue_elastic', 'sum')
+    impact = priced.groupby(by, observed=True).agg(**columns)
+    impact['delta'] = impact['candidate_revenue'] - impact['current_revenue']
+    impact['delta_pct'] = (impact['delta'] / impact['current_revenue'].replace(0, np.nan) * 100).fillna(0.0)
+    return impact.round(2).sort_values('delta')
+
+def shadow_replay(
+    bookings: pd.DataFrame,
+    current_pricing: Dict,
+    current_guardrails: Dict,
+    candidate_pricing: Dict,
+    candidate_guardrails: Optional[Dict] = None,
+    demand_index: Optional[DemandIndex] = None,
+    partition: str = SHADOW_PARTITION,
+    workers: int = SHADOW_WORKERS,
+    elasticity: Optional[ElasticityTable] = None
+) -> Dict:
+    """Price every historical booking under both configs and compare revenue
+
+    Bookings are split into date partitions (pandas period alias, monthly by default) that
+    are priced concurrently; each partition is one vectorized price_batch call per config.
+    Volumes are held at history, so deltas are the price effect only. With an `elasticity`
+    table, `candidate_revenue_elastic` also applies the fitted demand response.
+    """
+    missing = [col for col in SHADOW_COLUMNS if col not in bookings.columns]
+    if missing:
+        raise ValueError(f"Replay bookings are missing columns: {missing}")
+
+    current = (current_pricing, current_guardrails)
+    candidate = (candidate_pricing, current_guardrails if candidate_guardrails is None else candidate_guardrails)
+    partitions = [group for _, group in bookings.groupby(pd.to_datetime(bookings['booking_date']).dt.to_period(partition))]
+
+    if len(partitions) > 1 and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sportai-shadow") as pool:
+            priced = list(pool.map(lambda part: _replay_partition(part, current, candidate, demand_index, elasticity),
+                                   partitions))
+    else:
+        priced = [_replay_partition(part, current, candidate, demand_index, elasticity) for part in partitions]
+    priced = pd.concat(priced) if priced else bookings.assign(current_price=0.0, candidate_price=0.0)
+
+    current_revenue = float(priced['current_price'].sum())
+    candidate_revenue = float(priced['candidate_price'].sum())
+    summary = {
+        'bookings': len(priced),
+        'partitions': len(partitions),
+        'actual_revenue': round(float(priced['revenue'].sum()), 2),
+        'current_revenue': round(current_revenue, 2),
+        'candidate_revenue': round(candidate_revenue, 2),
+        'revenue_delta': round(candidate_revenue - current_revenue, 2),
+        'revenue_delta_pct': round((candidate_revenue - current_revenue) / current_revenue * 100, 2) if current_revenue else 0.0,
+        'bookings_price_up': int((priced['candidate_price'] > priced['current_price']).sum()),
+        'bookings_price_down': int((priced['candidate_price'] < priced['current_price']).sum())
+    }
+    if 'candidate_revenue_elastic' in priced:
+        summary['candidate_revenue_elastic'] = round(float(priced['candidate_revenue_elastic'].sum()), 2)
+        summary['expected_volume_change_pct'] = round((float(priced['candidate_volume'].mean()) - 1) * 100, 2)
+
+    return {
+        'summary': summary,
+        'by_segment': _impact(priced, 'customer_type'),
+        'by_asset_type': _impact(priced, 'asset_type'),
+        'bookings': priced.sort_index()
+    }
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    from sportai_pricing_engine import load_demand_index
+
+    root = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Replay historical bookings through current and candidate pricing")
+    parser.add_argument("--source", default=str(root / "data" / "Bookings.csv"), help="Bookings.csv or a SQLite database")
+    parser.add_argument("--current", default=str(root / "config" / "pricing_rules.json"))
+    parser.add_argument("--guardrails", default=str(root / "config" / "guardrails.json"))
+    parser.add_argument("--candidate", required=True, help="Candidate pricing_rules JSON")
+    parser.add_argument("--candidate-guardrails", help="Candidate guardrails JSON (defaults to the current ones)")
+    parser.add_argument("--start-date")
+    parser.add_argument("--end-date")
+    parser.add_argument("--partition", default=SHADOW_PARTITION)
+    parser.add_argument("--workers", type=int, default=SHADOW_WORKERS)
+    args = parser.parse_args()
+
+    read_json = lambda path: json.loads(Path(path).read_text()) if path and Path(path).exists() else {}
+    elasticity = None
+    if args.source.endswith(".csv"):
+        history = load_csv_bookings(args.source, args.start_date, args.end_date)
+    else:
+        from sportai_database import DatabaseManager
+        from sportai_elasticity import load_elasticity
+        manager = DatabaseManager(args.source)
+        history = load_db_bookings(manager, args.start_date, args.end_date)
+        fits = load_elasticity(manager)
+        elasticity = ElasticityTable(fits) if fits['elasticity'].notna().any() else None
+
+    start = time.perf_counter()
+    report = shadow_replay(
+        history, read_json(args.current), read_json(args.guardrails), read_json(args.candidate),
+        read_json(args.candidate_guardrails) if args.candidate_guardrails else None,
+        demand_index=load_demand_index(root / "data"), partition=args.partition, workers=args.workers,
+        elasticity=elasticity
+    )
+    print(f"Replayed {len(history):,} bookings in {time.perf_counter() - start:.2f}s")
+    print(json.dumps(report['summary'], indent=2))
+    print(report['by_segment'].to_string())
+    print(report['by_asset_type'].to_string())
@@ -0,0 +1,402 @@
+"""
+SportAI Schedule Engine
+Constraint-based assignment of booking requests to assets and time slots
+"""
+
+import math
+import re
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sportai_availability import AvailabilityIndex, load_availability_index
+from sportai_capacity import CapacityGraph, capacity_graph
+
+CELL_MINUTES = 5
+CELLS_PER_DAY = 24 * 60 // CELL_MINUTES
+START_STEP_MINUTES = 30
+DEFAULT_HORIZON_DAYS = 28
+DEFAULT_FLEX_DAYS = 3
+# Requests without a preferred time are placed as close to the start of prime time as possible
+DEFAULT_PREFERRED_TIME = "17:00"
+GOALS = ("Maximize Revenue", "Maximize Utilization", "Balance Both")
+
+# Request asset types -> Ops.csv setup types that can host them
+ASSET_TYPE_SETUPS = {
+    'Turf - Full': ('turf_split', 'turf_full'),
+    'Turf - Half': ('turf_half',),
+    'Court': ('court_single', 'court'),
+    'Golf Bay': ('golf_bay', 'sim_bay'),
+    'Suite': ('suite',),
+}
+
+# Placement cost: any day shift outweighs any time-of-day shift
+DAY_SHIFT_COST = 1000.0
+HOUR_SHIFT_COST = 1.0
+# Starts examined per unscheduled request during local search
+LOCAL_SEARCH_CANDIDATES = 256
+
+def _token(value) -> str:
+    """Lowercase alphanumerics, so "COURT_1" / "Court-1" and "Non-Profit" / "nonprofit" compare equal"""
+    return re.sub(r'[^a-z0-9]', '', str(value).lower())
+
+def _cell(hhmm: str) -> int:
+    hours, minutes = str(hhmm).split(':')[:2]
+    return (int(hours) * 60 + int(minutes)) // CELL_MINUTES
+
+class ScheduleEngine:
+    """Occupancy grid (asset x day x 5-minute cell) for a scheduling horizon
+
+    A booking occupies its duration plus the asset's buffer, marked on every asset the
+    capacity graph says it shares space with: a half field and the full field can never
+    overlap while both halves can run side by side. Protected windows are reserved for
+    the request classes listed in protected_hours.csv (applies_to).
+    """
+
+    def __init__(self, ops: pd.DataFrame, start: date, days: int = DEFAULT_HORIZON_DAYS,
+                 graph: Optional[CapacityGraph] = None, protected: Optional[pd.DataFrame] = None):
+        self.start = pd.Timestamp(start).normalize()
+        self.days = days
+        self.ops = ops.drop_duplicates('asset').reset_index(drop=True)
+        self.assets = self.ops['asset'].tolist()
+        self.asset_index = {asset: code for code, asset in enumerate(self.assets)}
+        self.open_cell = (self.ops['open_hour'].to_numpy() * 60 // CELL_MINUTES).astype(int)
+        self.close_cell = (self.ops['close_hour'].to_numpy() * 60 // CELL_MINUTES).astype(int)
+        self.buffer_cells = np.ceil(self.ops['buffer_min'].fillna(0).to_numpy() / CELL_MINUTES).astype(int)
+        self.setups = self.ops['setup_type'].astype(str).tolist()
+
+        # Rows each asset's bookings mark: itself plus the ancestors and descendants it shares space with
+        graph = graph or capacity_graph(self.ops)
+        self.marks = [
+            np.array(sorted(self.asset_index[a] for a in graph.blocking(asset) if a in self.asset_index), dtype=np.intp)
+            for asset in self.assets
+        ]
+
+        self.occupancy = np.zeros((len(self.assets), days, CELLS_PER_DAY), dtype=np.int16)
+        self.weekdays = (self.start + pd.to_timedelta(np.arange(days), unit='D')).dayofweek.to_numpy()
+        self._starts: Dict[Tuple[int, int], np.ndarray] = {}
+        self._protected = protected if protected is not None else pd.DataFrame(
+            columns=['zone_id', 'dow', 'start_time', 'end_time', 'applies_to'])
+        self._blocked: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_data_dir(cls, data_dir, start: date, days: int = DEFAULT_HORIZON_DAYS) -> 'ScheduleEngine':
+        """Engine for Ops.csv, with splits and existing bookings from Bookings.csv and protected_hours.csv"""
+        data_dir = Path(data_dir)
+        bookings_path = data_dir / 'Bookings.csv'
+        protected_path = data_dir / 'protected_hours.csv'
+        ops = pd.read_csv(data_dir / 'Ops.csv')
+        links = pd.read_csv(bookings_path, usecols=lambda col: col in ('asset', 'asset_parent')) if bookings_path.exists() else None
+        engine = cls(ops, start, days, capacity_graph(ops, links),
+                     pd.read_csv(protected_path) if protected_path.exists() else None)
+        engine.add_existing(load_availability_index(bookings_path))
+        return engine
+
+    def add_existing(self, index: AvailabilityIndex):
+        """Block out the indexed bookings that fall in the horizon"""
+        horizon_end = self.start + pd.Timedelta(days=self.days)
+        for asset, code in self.asset_index.items():
+            for start, end, _ in index.intervals(asset, self.start, horizon_end):
+                day = (start.normalize() - self.start).days
+                if not 0 <= day < self.days:
+                    continue
+                first = (start.hour * 60 + start.minute) // CELL_MINUTES
+                last = min(math.ceil((end - start.normalize()).total_seconds() / 60 / CELL_MINUTES) + self.buffer_cells[code], CELLS_PER_DAY)
+                self.occupancy[self.marks[code], day, first:last] += 1
+
+    def blocked(self, request_class: str) -> np.ndarray:
+        """Protected cells this request class may not use, cumulated per (asset, weekday)
+
+        Entry [a, dow, c] counts blocked cells before cell c, so a window [s, e) is clear
+        when entries e and s are equal.
+        """
+        key = _token(request_class)
+        if key not in self._blocked:
+            mask = np.zeros((len(self.assets), 7, CELLS_PER_DAY), dtype=bool)
+            asset_tokens = [_token(a) for a in self.assets]
+            for row in self._protected.itertuples(index=False):
+                classes = {_token(c) for c in str(row.applies_to).split(',')}
+                if 'all' in classes or key in classes:
+                    continue
+                rows = slice(None) if str(row.zone_id).upper() == 'ALL' else \
+                    [i for i, t in enumerate(asset_tokens) if t == _token(row.zone_id)]
+                mask[rows, int(row.dow), _cell(row.start_time):_cell(row.end_time)] = True
+            self._blocked[key] = np.concatenate((np.zeros(mask.shape[:2] + (1,), dtype=np.int32),
+                                                 np.cumsum(mask, axis=2, dtype=np.int32)), axis=2)
+        return self._blocked[key]
+
+    def hosts(self, asset_type: str) -> List[int]:
+        """Asset codes that can host a request for `asset_type` (a setup family or an asset name)"""
+        if asset_type in self.asset_index:
+            return [self.asset_index[asset_type]]
+        setups = ASSET_TYPE_SETUPS.get(asset_type, (_token(asset_type),))
+        return [code for code, setup in enumerate(self.setups) if setup in setups]
+
+    def feasible_starts(self, code: int, day: int, duration_cells: int, blocked: np.ndarray) -> np.ndarray:
+        """Start cells on the START_STEP grid where the booking (plus buffer) fits"""
+        starts = self.start_grid(code, duration_cells)
+        if not len(starts):
+            return starts
+        busy = np.zeros(CELLS_PER_DAY + 1, dtype=np.int32)
+        np.cumsum(self.occupancy[code, day] > 0, out=busy[1:])
+        reserved = blocked[code, self.weekdays[day]]
+        ends = np.minimum(starts + duration_cells + self.buffer_cells[code], CELLS_PER_DAY)
+        ok = (busy[ends] == busy[starts]) & (reserved[starts + duration_cells] == reserved[starts])
+        return starts[ok]
+
+    def start_grid(self, code: int, duration_cells: int) -> np.ndarray:
+        """Start cells on the START_STEP grid that finish by closing time"""
+        key = (code, duration_cells)
+        if key not in self._starts:
+            step = START_STEP_MINUTES // CELL_MINUTES
+            first = -(-self.open_cell[code] // step) * step
+            self._starts[key] = np.arange(first, self.close_cell[code] - duration_cells + 1, step)
+        return self._starts[key]
+
+    def place(self, code: int, day: int, start: int, duration_cells: int, delta: int = 1):
+        """Mark (delta=1) or release (delta=-1) a booking"""
+        end = min(start + duration_cells + self.buffer_cells[code], CELLS_PER_DAY)
+        self.occupancy[self.marks[code], day, start:end] += delta
+
+    def available_hours(self) -> float:
+        return float(((self.close_cell - self.open_cell) * CELL_MINUTES / 60).sum() * self.days)
+
+class _Request:
+    __slots__ = ('index', 'hosts', 'days', 'duration_cells', 'preferred_day', 'preferred_cell', 'blocked', 'value')
+
+def _normalize_requests(requests: pd.DataFrame) -> pd.DataFrame:
+    """Request frame with the columns the optimizer needs (UI column names or snake_case)"""
+    columns = {
+        'ID': 'id', 'Customer': 'customer', 'Asset Type': 'asset_type', 'Preferred Date': 'preferred_date',
+        'Preferred Time': 'preferred_time', 'Duration': 'duration', 'Type': 'type', 'Budget': 'budget',
+        'Priority': 'priority', 'Flex Days': 'flex_days'
+    }
+    frame = requests.rename(columns=columns)
+    for column, default in (('preferred_time', DEFAULT_PREFERRED_TIME), ('priority', 0), ('flex_days', DEFAULT_FLEX_DAYS), ('type', 'Regular')):
+        if column not in frame:
+            frame[column] = default
+    frame['preferred_time'] = frame['preferred_time'].fillna(DEFAULT_PREFERRED_TIME)
+    frame['priority'] = frame['priority'].fillna(0)
+    frame['flex_days'] = frame['flex_days'].fillna(DEFAULT_FLEX_DAYS).astype(int)
+    return frame
+
+def _values(frame: pd.DataFrame, goal: str, fairness: float) -> np.ndarray:
+    """Objective weight of scheduling each request"""
+    if goal not in GOALS:
+        raise ValueError(f"Unknown goal '{goal}'. Expected one of {GOALS}.")
+    revenue = frame['budget'].astype(float).to_numpy()
+    hours = frame['duration'].astype(float).to_numpy()
+    # Hours are priced at the average rate so both goals are in dollars
+    utilization = hours * (revenue.sum() / hours.sum() if hours.sum() else 0.0)
+    value = {'Maximize Revenue': revenue, 'Maximize Utilization': utilization}.get(goal, (revenue + utilization) / 2)
+    priority = frame['priority'].astype(float).to_numpy()
+    top = priority.max() if len(priority) and priority.max() > 0 else 1.0
+    return value * (1 + fairness * priority / top)
+
+def optimize_schedule(
+    engine: ScheduleEngine,
+    requests: pd.DataFrame,
+    goal: str = "Maximize Revenue",
+    fairness: float = 0.3,
+    max_seconds: float = 30.0
+) -> Dict:
+    """Assign requests to (asset, day, start) maximizing value under the engine's constraints
+
+    Greedy by value per occupied hour, each request taking its closest feasible slot to the
+    preferred date/time; then a local search tries to fit each unscheduled request by moving
+    one conflicting booking elsewhere, or replacing it when that raises the objective.
+    """
+    started = time.perf_counter()
+    frame = _normalize_requests(requests).reset_index(drop=True)
+    values = _values(frame, goal, fairness)
+
+    reqs: List[_Request] = []
+    reasons = [''] * len(frame)
+    preferred = pd.to_datetime(frame['preferred_date'], errors='coerce')
+    for i, row in enumerate(frame.itertuples(index=False)):
+        r = _Request()
+        r.index, r.value = i, values[i]
+        r.hosts = engine.hosts(row.asset_type)
+        r.duration_cells = int(math.ceil(float(row.duration) * 60 / CELL_MINUTES))
+        r.preferred_day = (preferred[i] - engine.start).days if pd.notna(preferred[i]) else 0
+        r.preferred_cell = _cell(row.preferred_time) if isinstance(row.preferred_time, str) and ':' in row.preferred_time else None
+        flex = int(row.flex_days)
+        window = [d for d in range(r.preferred_day - flex, r.preferred_day + flex + 1) if 0 <= d < engine.days]
+        r.days = sorted(window, key=lambda d: (abs(d - r.preferred_day), d))
+        r.blocked = engine.blocked(row.type)
+        reasons[i] = 'no matching asset' if not r.hosts else 'outside horizon' if not r.days else ''
+        reqs.append(r)
+
+    def best_slot(r: _Request) -> Optional[Tuple[int, int, int]]:
+        best, best_cost = None, None
+        for day in r.days:
+            if best is not None and abs(day - r.preferred_day) * DAY_SHIFT_COST > best_cost:
+                break
+            for code in r.hosts:
+                starts = engine.feasible_starts(code, day, r.duration_cells, r.blocked)
+                if not len(starts):
+                    continue
+                shift = np.abs(starts - r.preferred_cell) if r.preferred_cell is not None else starts - starts[0]
+                k = int(np.argmin(shift))
+                cost = abs(day - r.preferred_day) * DAY_SHIFT_COST + shift[k] * CELL_MINUTES / 60 * HOUR_SHIFT_COST
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = (code, day, int(starts[k])), cost
+        return best
+
+    assigned: Dict[int, Tuple[int, int, int]] = {}
+    density = [r.value / max(r.duration_cells, 1) for r in reqs]
+    for i in sorted(range(len(reqs)), key=lambda i: -density[i]):
+        r = reqs[i]
+        if reasons[i]:
+            continue
+        slot = best_slot(r)
+        if slot is None:
+            reasons[i] = 'no capacity in window'
+            continue
+        engine.place(slot[0], slot[1], slot[2], r.duration_cells)
+        assigned[i] = slot
+
+    # Local search: make room for unscheduled requests by moving or replacing one booking
+    by_row: Dict[Tuple[int, int], set] = {}
+    for i, (code, day, _) in assigned.items():
+        for row in engine.marks[code]:
+            by_row.setdefault((int(row), day), set()).add(i)
+
+    def conflicts(code: int, day: int, start: int, r: _Request) -> List[int]:
+        end = start + r.duration_cells + engine.buffer_cells[code]
+        found = []
+        for j in by_row.get((code, day), ()):
+            c_code, _, c_start = assigned[j]
+            c_end = c_start + reqs[j].duration_cells + engine.buffer_cells[c_code]
+            if c_start < end and start < c_end:
+                found.append(j)
+        return found
+
+    def track(i: int, slot: Tuple[int, int, int], add: bool):
+        for row in engine.marks[slot[0]]:
+            rows = by_row.setdefault((int(row), slot[1]), set())
+            rows.add(i) if add else rows.discard(i)
+
+    moves = swaps = 0
+    # Bookings with no alternative slot; occupancy only tightens, so they are not retried
+    stuck = set()
+    unscheduled = sorted((i for i in range(len(reqs)) if i not in assigned and reasons[i] == 'no capacity in window'),
+                         key=lambda i: -values[i])
+    for i in unscheduled:
+        if time.perf_counter() - started > max_seconds:
+            break
+        r = reqs[i]
+        tried = 0
+        for day in r.days:
+            if i in assigned or tried >= LOCAL_SEARCH_CANDIDATES:
+                break
+            for code in r.hosts:
+                if i in assigned or tried >= LOCAL_SEARCH_CANDIDATES:
+                    break
+                reserved = r.blocked[code, engine.weekdays[day]]
+                for start in engine.start_grid(code, r.duration_cells):
+                    if reserved[start + r.duration_cells] != reserved[start]:
+                        continue
+                    tried += 1
+                    if tried > LOCAL_SEARCH_CANDIDATES:
+                        break
+                    blocking = conflicts(code, day, start, r)
+                    if len(blocking) != 1 or (blocking[0] in stuck and values[i] <= values[blocking[0]]):
+                        continue
+                    j = blocking[0]
+                    old = assigned.pop(j)
+                    engine.place(*old, reqs[j].duration_cells, delta=-1)
+                    track(j, old, add=False)
+                    if start not in engine.feasible_starts(code, day, r.duration_cells, r.blocked):
+                        # Something else (a split sibling) still blocks this start
+                        engine.place(*old, reqs[j].duration_cells)
+                        assigned[j] = old
+                        track(j, old, add=True)
+                        continue
+                    engine.place(code, day, start, r.duration_cells)
+                    moved = None if j in stuck else best_slot(reqs[j])
+                    if moved is not None:
+                        engine.place(*moved, reqs[j].duration_cells)
+                        assigned[j] = moved
+                        track(j, moved, add=True)
+                        moves += 1
+                    elif values[i] > values[j]:
+                        reasons[j] = 'replaced by higher-value request'
+                        swaps += 1
+                    else:
+                        stuck.add(j)
+                        engine.place(code, day, start, r.duration_cells, delta=-1)
+                        engine.place(*old, reqs[j].duration_cells)
+                        assigned[j] = old
+                        track(j, old, add=True)
+                        continue
+                    assigned[i] = (code, day, start)
+                    track(i, assigned[i], add=True)
+                    reasons[i] = ''
+                    break
+
+    schedule = requests.reset_index(drop=True).copy()
+    slots = [assigned.get(i) for i in range(len(reqs))]
+    start_ts = [engine.start + pd.Timedelta(days=s[1], minutes=s[2] * CELL_MINUTES) if s else pd.NaT for s in slots]
+    schedule['Assigned Asset'] = [engine.assets[s[0]] if s else None for s in slots]
+    schedule['Assigned Date'] = [ts.strftime('%Y-%m-%d') if s else None for ts, s in zip(start_ts, slots)]
+    schedule['Assigned Time'] = [ts.strftime('%H:%M') if s else None for ts, s in zip(start_ts, slots)]
+    schedule['End Time'] = [(ts + pd.Timedelta(hours=float(d))).strftime('%H:%M') if s else None
+                            for ts, s, d in zip(start_ts, slots, frame['duration'])]
+    schedule['Status'] = ['Optimized' if s else 'Unscheduled' for s in slots]
+    schedule['Reason'] = [reasons[i] if not slots[i] else '' for i in range(len(reqs))]
+
+    scheduled = schedule['Status'] == 'Optimized'
+    booked_hours = float(frame.loc[scheduled, 'duration'].astype(float).sum())
+    return {
+        'scheduled': int(scheduled.sum()),
+        'unscheduled': int((~scheduled).sum()),
+        'revenue': float(frame.loc[scheduled, 'budget'].astype(float).sum()),
+        'objective': float(values[scheduled.to_numpy()].sum()),
+        'util_increase': booked_hours / engine.available_hours() * 100 if engine.available_hours() else 0.0,
+        'moves': moves,
+        'swaps': swaps,
+        'seconds': round(time.perf_counter() - started, 3),
+        'schedule': schedule
+    }
+
+def sample_requests(count: int, start: date, days: int = DEFAULT_HORIZON_DAYS, seed: int = 11) -> pd.DataFrame:
+    """Synthetic pending requests in the UI's column layout (for benchmarks and demos)"""
+    rng = np.random.default_rng(seed)
+    types = np.array(['Youth', 'Non-Profit', 'Regular', 'Corporate', 'Tournament'])
+    kinds = rng.choice(len(types), count, p=[0.25, 0.1, 0.35, 0.2, 0.1])
+    duration = rng.choice([1.0, 1.5, 2.0, 3.0], count, p=[0.4, 0.3, 0.2, 0.1])
+    return pd.DataFrame({
+        'ID': [f"REQ{i:05d}" for i in range(1, count + 1)],
+        'Customer': [f"Customer {i}" for i in rng.integers(1, 2000, count)],
+        'Asset Type': rng.choice(['Turf - Full', 'Turf - Half', 'Court'], count, p=[0.15, 0.35, 0.5]),
+        'Preferred Date': (pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, count), unit='D')).strftime('%Y-%m-%d'),
+        'Preferred Time': [f"{h:02d}:{m:02d}" for h, m in zip(rng.integers(7, 21, count), rng.choice([0, 30], count))],
+        'Duration': duration,
+        'Type': types[kinds],
+        'Budget': np.round(duration * rng.uniform(40, 160, count), 2),
+        'Priority': np.array([3, 2, 1, 0, 2])[kinds]
+    })
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the schedule optimizer on synthetic requests")
+    parser.add_argument("--data_dir", default=str(Path(__file__).resolve().parent / "data"))
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=DEFAULT_HORIZON_DAYS)
+    parser.add_argument("--goal", default=GOALS[0], choices=GOALS)
+    parser.add_argument("--fairness", type=float, default=0.3)
+    parser.add_argument("--max-seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    start = datetime.now().date() + timedelta(days=1)
+    engine = ScheduleEngine.from_data_dir(args.data_dir, start, args.days)
+    result = optimize_schedule(engine, sample_requests(args.requests, start, args.days),
+                               args.goal, args.fairness, args.max_seconds)
+    print({k: v for k, v in result.items() if k != 'schedule'})
+    print(result['schedule']['Reason'].value_counts().to_string())
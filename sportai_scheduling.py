@@ -6,10 +6,26 @@ Intelligent scheduling with constraint satisfaction and optimization
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, Any, List
+from pathlib import Path
 import json
 
+from sportai_availability import CANCELLED_STATUSES, booking_intervals, load_availability_index
+from sportai_schedule_engine import ScheduleEngine, optimize_schedule
+
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+OPEN_HOURS = (6, 24)
+
+BOOKING_TYPE_COLORS = {
+    'Regular': '#3b82f6',
+    'Youth': '#10b981',
+    'Corporate': '#f59e0b',
+    'Tournament': '#8b5cf6'
+}
+# Bars carry customer labels only when there are few enough to read
+GANTT_LABEL_LIMIT = 150
+
 def run(context: Dict[str, Any]):
     """Main scheduling optimizer execution"""
     
@@ -55,6 +71,16 @@ def show_scheduler_view(context: Dict[str, Any]):
     
     # Asset filter
     assets = get_available_assets()
+    if not assets:
+        st.warning("No assets are configured in the asset database, so there is nothing to schedule yet.")
+        if st.button("➕ Add sample assets"):
+            from sportai_database import db
+            
+            db.seed_sample_data()
+            load_availability_index(db).load_assets(db)
+            st.rerun()
+        return
+    
     selected_assets = st.multiselect(
         "Filter by Asset",
         assets,
@@ -69,7 +95,7 @@ def show_scheduler_view(context: Dict[str, Any]):
     schedule_data = get_schedule_data(start_date, end_date, selected_assets)
     
     if not schedule_data.empty:
-        fig = create_schedule_gantt(schedule_data)
+        fig = create_schedule_gantt(schedule_data, window=(start_date, end_date + timedelta(days=1)))
         st.plotly_chart(fig, use_container_width=True)
         
         # Schedule details table
@@ -101,7 +127,7 @@ def show_scheduler_view(context: Dict[str, Any]):
         booking_type = st.selectbox("Type", ["Regular", "Youth", "Tournament", "Corporate"], key="new_booking_type")
     
     if st.button("💾 Create Booking", type="primary"):
-        create_booking(context, {
+        created, message = create_booking(context, {
             'asset': booking_asset,
             'date': booking_date,
             'start_time': booking_start,
@@ -109,12 +135,15 @@ def show_scheduler_view(context: Dict[str, Any]):
             'customer': booking_customer,
             'type': booking_type
         })
-        st.success(f"✅ Booking created for {booking_customer} on {booking_date}")
-        context['audit_log']('booking_created', {
-            'customer': booking_customer,
-            'asset': booking_asset,
-            'date': str(booking_date)
-        })
+        if created:
+            st.success(f"✅ Booking created for {booking_customer} on {booking_date}")
+            context['audit_log']('booking_created', {
+                'customer': booking_customer,
+                'asset': booking_asset,
+                'date': str(booking_date)
+            })
+        else:
+            st.error(message)
 
 def show_optimization_view(context: Dict[str, Any]):
     """AI optimization interface"""
@@ -183,6 +212,9 @@ def show_optimization_view(context: Dict[str, Any]):
                 with col3:
                     st.metric("Utilization Impact", f"+{result['util_increase']:.1f}%")
                 
+                if result['unscheduled']:
+                    st.caption(f"{result['unscheduled']} request(s) could not be placed - see the Reason column.")
+                
                 # Detailed results
                 st.markdown("#### 📊 Optimization Results")
                 st.dataframe(result['schedule'], use_container_width=True)
@@ -345,73 +377,85 @@ def show_analysis_view(context: Dict[str, Any]):
 # Helper functions
 
 def get_available_assets() -> List[str]:
-    """Get list of bookable assets"""
-    return [
-        "Turf Field - Full",
-        "Turf Field - Half A",
-        "Turf Field - Half B",
-        "Court 1",
-        "Court 2",
-        "Court 3",
-        "Court 4",
-        "Golf Bay 1",
-        "Golf Bay 2",
-        "Suite A",
-        "Suite B"
-    ]
+    """Get list of bookable assets (the assets table, in id order; empty until assets are set up)"""
+    from sportai_database import db
+    
+    index = load_availability_index(db)
+    if not index.asset_names:
+        # Assets may have been added since the index was built
+        index.load_assets(db)
+    names = index.asset_names
+    return [names[asset_id] for asset_id in sorted(names)]
 
 def get_schedule_data(start_date, end_date, assets) -> pd.DataFrame:
-    """Get schedule data for date range"""
-    # Sample data - in production, query database
-    data = {
-        'Asset': ['Turf Field - Full', 'Court 1', 'Golf Bay 1'] * 3,
-        'Customer': ['Elite Soccer Club', 'Basketball League', 'Golf Lessons'] * 3,
-        'Start': pd.date_range(start=start_date, periods=9, freq='3H'),
-        'Duration': [2, 1.5, 1, 2, 2, 1, 1.5, 2, 1],
-        'Type': ['Regular', 'Youth', 'Corporate'] * 3,
-        'Status': ['Confirmed'] * 9
-    }
-    
-    df = pd.DataFrame(data)
-    df['End'] = df['Start'] + pd.to_timedelta(df['Duration'], unit='h')
-    
-    return df[df['Asset'].isin(assets)]
+    """Get live bookings on `assets` overlapping the date range from the database"""
+    from sportai_database import db
+    
+    names = load_availability_index(db).asset_names
+    # From the day before, for bookings that run past midnight into the range
+    bookings = db.get_bookings(str(start_date - timedelta(days=1)), str(end_date))
+    bookings = bookings.assign(asset=bookings['asset_id'].map(names))
+    live = ~bookings['status'].astype(str).str.lower().isin(CANCELLED_STATUSES)
+    bookings = bookings[live & bookings['asset'].isin(assets)]
+    spans = booking_intervals(bookings)
+    
+    df = pd.DataFrame({
+        'Asset': spans['asset'],
+        'Customer': bookings['customer_name'].to_numpy(),
+        'Start': pd.to_datetime(spans['start'], unit='m'),
+        'End': pd.to_datetime(spans['end'], unit='m'),
+        'Duration': (spans['end'] - spans['start']) / 60,
+        'Type': bookings['customer_type'].fillna('regular').str.replace('_', ' ').str.title().to_numpy(),
+        'Status': bookings['status'].fillna('confirmed').str.title().to_numpy()
+    })
+    window_start, window_end = pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    return df[(df['End'] > window_start) & (df['Start'] < window_end)].reset_index(drop=True)
 
-def create_schedule_gantt(df: pd.DataFrame):
-    """Create Gantt chart for schedule"""
-    fig = go.Figure()
+def create_schedule_gantt(df: pd.DataFrame, window=None):
+    """Create Gantt chart for schedule (one trace per booking type, bookings inside `window` only)"""
+    if window is not None:
+        window_start, window_end = pd.Timestamp(window[0]), pd.Timestamp(window[1])
+        df = df[(df['End'] > window_start) & (df['Start'] < window_end)]
+    else:
+        window_start, window_end = df['Start'].min(), df['End'].max()
+    
+    # Hover text and bar geometry from whole columns; date bars are a base time plus a length in ms
+    hover = (
+        "<b>" + df['Customer'].astype(str) + "</b><br>"
+        + "Asset: " + df['Asset'].astype(str) + "<br>"
+        + "Time: " + df['Start'].dt.strftime('%a %b %d %I:%M %p') + " - " + df['End'].dt.strftime('%I:%M %p') + "<br>"
+        + "Duration: " + df['Duration'].round(2).astype(str).str.replace(r'\.0$', '', regex=True) + "h<br>"
+        + "Type: " + df['Type'].astype(str)
+    ).to_numpy()
+    length_ms = (df['End'] - df['Start']).dt.total_seconds().to_numpy() * 1000
+    starts = df['Start'].to_numpy()
+    assets = df['Asset'].to_numpy()
+    customers = df['Customer'].to_numpy()
+    show_labels = len(df) <= GANTT_LABEL_LIMIT
     
-    colors = {
-        'Regular': '#3b82f6',
-        'Youth': '#10b981',
-        'Corporate': '#f59e0b',
-        'Tournament': '#8b5cf6'
-    }
+    fig = go.Figure()
     
-    for _, row in df.iterrows():
+    for booking_type, rows in df.groupby('Type', sort=False).indices.items():
         fig.add_trace(go.Bar(
-            x=[row['Duration']],
-            y=[row['Asset']],
-            base=row['Start'].hour + row['Start'].minute/60,
+            x=length_ms[rows],
+            y=assets[rows],
+            base=starts[rows],
             orientation='h',
-            name=row['Customer'],
-            marker_color=colors.get(row['Type'], '#6b7280'),
-            text=row['Customer'],
+            name=booking_type,
+            marker_color=BOOKING_TYPE_COLORS.get(booking_type, '#6b7280'),
+            text=customers[rows] if show_labels else None,
             textposition='inside',
-            hovertemplate=f"<b>{row['Customer']}</b><br>" +
-                         f"Asset: {row['Asset']}<br>" +
-                         f"Time: {row['Start'].strftime('%I:%M %p')} - {row['End'].strftime('%I:%M %p')}<br>" +
-                         f"Duration: {row['Duration']}h<br>" +
-                         f"Type: {row['Type']}<extra></extra>"
+            hovertext=hover[rows],
+            hovertemplate="%{hovertext}<extra></extra>"
         ))
     
     fig.update_layout(
         barmode='overlay',
-        height=400,
-        xaxis_title="Hour of Day",
+        height=max(400, 36 * df['Asset'].nunique()),
+        xaxis_title="Time",
         yaxis_title="Asset",
-        showlegend=False,
-        xaxis=dict(range=[6, 23])
+        showlegend=True,
+        xaxis=dict(type='date', range=[window_start, window_end])
     )
     
     return fig
@@ -422,7 +466,7 @@ def get_pending_requests() -> pd.DataFrame:
         'ID': ['REQ001', 'REQ002', 'REQ003', 'REQ004'],
         'Customer': ['Youth Soccer League', 'Corporate Team Building', 'Elite Basketball', 'Golf Tournament'],
         'Asset Type': ['Turf - Full', 'Court', 'Court', 'Golf Bay'],
-        'Preferred Date': ['2025-10-25', '2025-10-26', '2025-10-25', '2025-10-27'],
+        'Preferred Date': [(datetime.now() + timedelta(days=d)).strftime('%Y-%m-%d') for d in (2, 3, 2, 4)],
         'Duration': [2, 3, 1.5, 4],
         'Type': ['Youth', 'Corporate', 'Regular', 'Tournament'],
         'Budget': [180, 350, 120, 450],
@@ -433,28 +477,48 @@ def get_pending_requests() -> pd.DataFrame:
 
 def run_optimization(requests, goal, fairness, horizon):
     """Run scheduling optimization"""
-    # Simplified optimization simulation
-    scheduled_count = len(requests)
-    estimated_revenue = requests['Budget'].sum() * 1.15  # 15% uplift
-    util_increase = 4.8
-    
-    # Create optimized schedule
-    schedule = requests.copy()
-    schedule['Assigned Date'] = schedule['Preferred Date']
-    schedule['Assigned Time'] = ['17:00', '14:00', '19:00', '10:00']
-    schedule['Status'] = 'Optimized'
-    
-    return {
-        'scheduled': scheduled_count,
-        'revenue': estimated_revenue,
-        'util_increase': util_increase,
-        'schedule': schedule
-    }
+    days = int(''.join(ch for ch in horizon if ch.isdigit()) or 7)
+    start = (datetime.now() + timedelta(days=1)).date()
+    
+    # Operating hours, buffers, turf splits, protected hours and existing bookings
+    engine = ScheduleEngine.from_data_dir(DATA_DIR, start, days)
+    return optimize_schedule(engine, requests, goal, fairness)
 
 def create_booking(context, booking_data):
-    """Create new booking"""
-    # In production, insert into database
-    pass
+    """Create new booking if the asset is free (turnover buffer included); returns (created, message)"""
+    from sportai_database import db
+    
+    index = load_availability_index(db)
+    asset = booking_data['asset']
+    asset_id = next((i for i, name in index.asset_names.items() if name == asset), None)
+    if asset_id is None:
+        return False, f"{asset} is not set up in the asset database."
+    # The index only holds bookings from `since` on, so earlier dates cannot be conflict-checked
+    earliest = max(date.today(), index.since or date.min)
+    if booking_data['date'] < earliest:
+        return False, f"Bookings can only be created from {earliest:%b %d, %Y} on."
+    
+    start = datetime.combine(booking_data['date'], booking_data['start_time'])
+    end = start + timedelta(hours=booking_data['duration'])
+    # Sessions share the index: no other booking can land between the check and the insert,
+    # which notifies the index before the lock is released
+    with index.locked():
+        if not index.is_free(asset, start, end):
+            slot = index.next_free_slot(asset, start, booking_data['duration'], hours=OPEN_HOURS)
+            suggestion = f" Next opening: {slot:%a %b %d, %H:%M}." if slot is not None else ""
+            return False, f"{asset} is already booked at that time.{suggestion}"
+        
+        db.insert_booking({
+            'asset_id': asset_id,
+            'customer_name': booking_data['customer'],
+            'customer_type': booking_data['type'].lower(),
+            'booking_date': start.strftime('%Y-%m-%d'),
+            'start_time': start.strftime('%H:%M'),
+            'end_time': end.strftime('%H:%M'),
+            'duration_hours': booking_data['duration'],
+            'created_by': 'scheduler'
+        })
+    return True, ""
 
 def accept_optimized_schedule(context, schedule):
     """Accept and apply optimized schedule"""
@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+@pytest.fixture
+def db_file(tmp_path):
+    return tmp_path / "sportai.db"
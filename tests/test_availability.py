@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from sportai_availability import AvailabilityIndex, load_availability_index
+from sportai_database import DatabaseManager
+
+DAY = pd.Timestamp("2025-06-02")
+
+def at(hhmm, days=0):
+    return DAY + pd.Timedelta(days=days) + pd.Timedelta(f"{hhmm}:00")
+
+def make_index():
+    bookings = pd.DataFrame([
+        (1, 'Court-1', None, at('18:00'), at('19:00')),
+        (2, 'FullTurf-1', None, at('18:00'), at('19:00')),
+        (3, 'HalfTurf-B', 'FullTurf-1', at('09:00', 1), at('10:00', 1)),
+    ], columns=['booking_id', 'asset', 'asset_parent', 'start', 'end'])
+    return AvailabilityIndex.from_frame(bookings, default_buffer=10)
+
+def test_conflicts_include_the_turnover_buffer():
+    index = make_index()
+    assert index.conflicts('Court-1', at('19:05'), at('20:00')) == [1]
+    assert index.conflicts('Court-1', at('17:00'), at('17:55')) == [1]
+    assert index.is_free('Court-1', at('19:10'), at('20:00'))
+    assert index.is_free('Court-1', at('17:00'), at('17:50'))
+    assert index.is_free('Court-2', at('18:00'), at('19:00'))
+    # The full field's booking blocks its halves
+    assert index.conflicts('HalfTurf-B', at('18:30'), at('19:30')) == [2]
+
+def test_next_free_slot_skips_bookings_and_closed_hours():
+    index = make_index()
+    assert index.next_free_slot('Court-1', at('16:00'), 1.0) == at('16:00')
+    assert index.next_free_slot('Court-1', at('17:30'), 1.0) == at('19:30')
+    assert index.next_free_slot('HalfTurf-B', at('18:00'), 1.0) == at('19:30')
+    assert index.next_free_slot('Court-1', at('17:30'), 1.0, hours=(6, 20)) == at('06:00', 1)
+
+def test_availability_grid_marks_buffered_slots_busy():
+    grid = make_index().availability_grid(['Court-1', 'Court-2', 'HalfTurf-B'], at('17:00'), at('20:00'))
+    assert list(grid.columns) == list(pd.date_range(at('17:00'), at('19:30'), freq='30min'))
+    assert grid.loc['Court-1'].tolist() == [True, False, False, False, False, True]
+    assert grid.loc['Court-2'].all()
+    assert grid.loc['HalfTurf-B'].tolist() == grid.loc['Court-1'].tolist()
+
+def test_database_index_follows_inserts_updates_and_cancels(db_file):
+    manager = DatabaseManager(str(db_file))
+    manager.seed_sample_data()
+    index = load_availability_index(manager)
+    assert set(index.asset_names.values()) >= {'Court 1', 'Court 2'}
+    court = next(asset_id for asset_id, name in index.asset_names.items() if name == 'Court 1')
+
+    day = (date.today() + timedelta(days=7)).isoformat()
+    slot = lambda hhmm: pd.Timestamp(f"{day} {hhmm}")
+    booking_id = manager.insert_booking({
+        'asset_id': court, 'customer_name': 'Test', 'booking_date': day,
+        'start_time': '18:00', 'end_time': '19:00', 'duration_hours': 1.0,
+        'rate_per_hour': 45.0, 'total_amount': 45.0
+    })
+    assert index.conflicts('Court 1', slot('18:30'), slot('19:30')) == [booking_id]
+    assert index.is_free('Court 2', slot('18:30'), slot('19:30'))
+
+    manager.update_booking(booking_id, {'start_time': '20:00', 'end_time': '21:00'})
+    assert index.is_free('Court 1', slot('18:30'), slot('19:30'))
+    assert index.conflicts('Court 1', slot('20:30'), slot('21:30')) == [booking_id]
+
+    manager.cancel_booking(booking_id)
+    assert index.is_free('Court 1', slot('20:30'), slot('21:30'))
+    assert load_availability_index(manager) is index
@@ -0,0 +1,35 @@
+import sqlite3
+
+import pytest
+
+from sportai_migrations import (CORE_MIGRATIONS, ENTERPRISE_MIGRATIONS, SCHEMA_IDS, current_version,
+                                migrate, schema_of)
+
+def test_each_schema_refuses_a_file_holding_the_other(db_file):
+    conn = sqlite3.connect(db_file)
+    assert migrate(conn, CORE_MIGRATIONS, 'core') == [m.version for m in CORE_MIGRATIONS]
+    with pytest.raises(ValueError, match="core schema"):
+        migrate(conn, ENTERPRISE_MIGRATIONS, 'enterprise')
+    assert schema_of(conn) == 'core'
+    assert current_version(conn) == CORE_MIGRATIONS[-1].version
+    assert migrate(conn, CORE_MIGRATIONS, 'core') == []
+    conn.close()
+
+    conn = sqlite3.connect(db_file.with_name("enterprise.db"))
+    assert migrate(conn, ENTERPRISE_MIGRATIONS, 'enterprise') == [m.version for m in ENTERPRISE_MIGRATIONS]
+    with pytest.raises(ValueError, match="enterprise schema"):
+        migrate(conn, CORE_MIGRATIONS, 'core')
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert 'price_elasticity' not in tables
+    conn.close()
+
+def test_unstamped_database_is_claimed_by_its_own_schema(db_file):
+    conn = sqlite3.connect(db_file)
+    migrate(conn, ENTERPRISE_MIGRATIONS, 'enterprise')
+    conn.execute("PRAGMA application_id = 0")
+    assert schema_of(conn) == 'enterprise'
+    with pytest.raises(ValueError):
+        migrate(conn, CORE_MIGRATIONS, 'core')
+    assert migrate(conn, ENTERPRISE_MIGRATIONS, 'enterprise') == []
+    assert conn.execute("PRAGMA application_id").fetchone()[0] == SCHEMA_IDS['enterprise']
+    conn.close()
@@ -0,0 +1,9 @@
+from sportai_database import PLAN_CHECKS, DatabaseManager
+
+def test_hot_queries_use_expected_indexes(db_file):
+    manager = DatabaseManager(str(db_file))
+    manager.init_database()
+    results = manager.check_query_plans()
+    assert set(results) == set(PLAN_CHECKS)
+    for name, result in results.items():
+        assert result['ok'], f"{name} did not use {PLAN_CHECKS[name][2]}: {result['plan']}"
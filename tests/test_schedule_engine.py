@@ -0,0 +1,97 @@
+from datetime import date
+
+import pandas as pd
+
+from sportai_schedule_engine import ScheduleEngine, _cell, optimize_schedule
+
+MONDAY = date(2025, 6, 2)
+
+def make_ops(open_hour=6, close_hour=24, buffer_min=10):
+    return pd.DataFrame({
+        'asset': ['FullTurf-1', 'HalfTurf-A', 'HalfTurf-B', 'Court-1'],
+        'parent': [None, 'FullTurf-1', 'FullTurf-1', None],
+        'setup_type': ['turf_split', 'turf_half', 'turf_half', 'court_single'],
+        'buffer_min': buffer_min,
+        'open_hour': open_hour,
+        'close_hour': close_hour,
+        'capacity_units': [2, 1, 1, 1],
+    })
+
+def make_requests(*rows):
+    columns = ['ID', 'Asset Type', 'Preferred Time', 'Duration', 'Type', 'Budget']
+    frame = pd.DataFrame(rows, columns=columns)
+    frame['Preferred Date'] = MONDAY.isoformat()
+    frame['Flex Days'] = 0
+    return frame
+
+def starts(engine, asset, hours=1.0, request_class='Regular'):
+    code = engine.asset_index[asset]
+    cells = int(hours * 60 // 5)
+    return set(engine.feasible_starts(code, 0, cells, engine.blocked(request_class)).tolist())
+
+def test_full_turf_blocks_both_halves_but_halves_are_independent():
+    six_pm = _cell('18:00')
+
+    engine = ScheduleEngine(make_ops(), MONDAY, days=1)
+    engine.place(engine.asset_index['FullTurf-1'], 0, six_pm, 12)
+    assert six_pm not in starts(engine, 'HalfTurf-A')
+    assert six_pm not in starts(engine, 'HalfTurf-B')
+    assert six_pm in starts(engine, 'Court-1')
+
+    engine = ScheduleEngine(make_ops(), MONDAY, days=1)
+    engine.place(engine.asset_index['HalfTurf-A'], 0, six_pm, 12)
+    assert six_pm in starts(engine, 'HalfTurf-B')
+    assert six_pm not in starts(engine, 'FullTurf-1')
+
+    result = optimize_schedule(ScheduleEngine(make_ops(), MONDAY, days=1), make_requests(
+        ('R1', 'Turf - Half', '18:00', 1.0, 'Regular', 100.0),
+        ('R2', 'Turf - Half', '18:00', 1.0, 'Regular', 100.0),
+    ))
+    schedule = result['schedule']
+    assert set(schedule['Assigned Asset']) == {'HalfTurf-A', 'HalfTurf-B'}
+    assert set(schedule['Assigned Time']) == {'18:00'}
+
+def test_protected_hours_exclude_other_request_classes():
+    protected = pd.DataFrame({
+        'zone_id': ['ALL'], 'dow': [MONDAY.weekday()], 'start_time': ['15:00'], 'end_time': ['21:00'],
+        'applies_to': ['youth,nonprofit'],
+    })
+    engine = ScheduleEngine(make_ops(), MONDAY, days=1, protected=protected)
+    result = optimize_schedule(engine, make_requests(
+        ('R1', 'Court-1', '17:00', 1.0, 'Regular', 100.0),
+        ('R2', 'HalfTurf-A', '17:00', 1.0, 'Youth', 100.0),
+        ('R3', 'HalfTurf-B', '17:00', 1.0, 'Non-Profit', 100.0),
+    ))
+    times = result['schedule'].set_index('ID')['Assigned Time']
+    assert times['R1'] == '14:00'
+    assert times['R2'] == '17:00'
+    assert times['R3'] == '17:00'
+    assert not {_cell('15:00'), _cell('20:30')} & starts(engine, 'Court-1', request_class='Corporate')
+
+def test_buffer_keeps_the_next_start_clear():
+    engine = ScheduleEngine(make_ops(), MONDAY, days=1)
+    engine.place(engine.asset_index['Court-1'], 0, _cell('18:00'), 12)
+    free = starts(engine, 'Court-1')
+    assert _cell('19:00') not in free
+    assert _cell('17:00') not in free
+    assert {_cell('16:30'), _cell('19:30')} <= free
+
+    result = optimize_schedule(engine, make_requests(('R1', 'Court-1', '19:00', 1.0, 'Regular', 100.0)))
+    assert result['schedule'].loc[0, 'Assigned Time'] == '19:30'
+
+    engine = ScheduleEngine(make_ops(buffer_min=0), MONDAY, days=1)
+    engine.place(engine.asset_index['Court-1'], 0, _cell('18:00'), 12)
+    assert {_cell('17:00'), _cell('19:00')} <= starts(engine, 'Court-1')
+
+def test_local_search_replaces_a_lower_value_booking():
+    # The short request wins the greedy pass on value per hour, leaving no room for the long one
+    engine = ScheduleEngine(make_ops(open_hour=18, close_hour=20), MONDAY, days=1)
+    result = optimize_schedule(engine, make_requests(
+        ('SHORT', 'Court-1', '18:00', 1.0, 'Regular', 60.0),
+        ('LONG', 'Court-1', '18:00', 2.0, 'Regular', 100.0),
+    ), fairness=0.0)
+    schedule = result['schedule'].set_index('ID')
+    assert result['swaps'] == 1
+    assert schedule.loc['LONG', 'Assigned Time'] == '18:00'
+    assert schedule.loc['SHORT', 'Status'] == 'Unscheduled'
+    assert schedule.loc['SHORT', 'Reason'] == 'replaced by higher-value request'